@@ -0,0 +1,77 @@
+"""
+EasySwitch - HTTP keep-alive benchmark.
+
+Compares request latency when a new HTTPClient (and so a new TCP
+connection) is opened per request, as adapters used to do with
+`async with self.get_client()`, against one long-lived HTTPClient.
+
+Usage (from the repository root):
+    PYTHONPATH=. python benchmarks/http_keepalive.py [--requests 500]
+"""
+import argparse
+import asyncio
+import statistics
+from time import perf_counter
+from typing import List
+
+from aiohttp import web
+
+from easyswitch.utils.http import ConnectionPoolManager, HTTPClient
+
+
+async def _handler(request: web.Request) -> web.Response:
+    return web.json_response({"status": "SUCCESS"})
+
+
+async def _start_server() -> web.AppRunner:
+    app = web.Application()
+    app.router.add_post("/v2/payment/check", _handler)
+    runner = web.AppRunner(app, access_log = None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+def _report(label: str, samples: List[float]) -> None:
+    samples = sorted(samples)
+    p50 = statistics.median(samples) * 1000
+    p99 = samples[int(len(samples) * 0.99) - 1] * 1000
+    print(f"{label:<24} p50={p50:7.3f}ms  p99={p99:7.3f}ms")
+
+
+async def main(requests: int) -> None:
+    runner = await _start_server()
+    port = runner.addresses[0][1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    # Before: one client (one connection) per request
+    per_request = []
+    for _ in range(requests):
+        start = perf_counter()
+        # A private pool reproduces the old per-client TCPConnector
+        private_pool = ConnectionPoolManager()
+        async with HTTPClient(base_url, pool_manager = private_pool) as client:
+            await client.post("/v2/payment/check", json_data = {})
+        await private_pool.close()
+        per_request.append(perf_counter() - start)
+
+    # After: one long-lived client for every request
+    shared = []
+    client = HTTPClient(base_url)
+    for _ in range(requests):
+        start = perf_counter()
+        await client.post("/v2/payment/check", json_data = {})
+        shared.append(perf_counter() - start)
+    await client.close_session()
+
+    await runner.cleanup()
+
+    _report("client per request", per_request)
+    _report("long-lived client", shared)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--requests", type = int, default = 500)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
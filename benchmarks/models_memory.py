@@ -0,0 +1,80 @@
+"""
+EasySwitch - Memory footprint of the core models.
+
+Builds many PaymentResponse, TransactionDetail, WebhookEvent,
+CustomerInfo and TransactionStatusResponse objects, the way transactions
+pending reconciliation are held in memory, and reports the bytes each
+instance takes (traced with tracemalloc). The provider payload is shared
+by every object, so only the models themselves are measured.
+
+Usage (from the repository root):
+    PYTHONPATH=. python benchmarks/models_memory.py [--count 500000]
+"""
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime
+from typing import Callable
+
+from easyswitch.types import (Currency, CustomerInfo, PaymentResponse,
+                              Provider, TransactionDetail, TransactionStatus,
+                              TransactionStatusResponse, WebhookEvent)
+
+
+CREATED_AT = datetime(2024, 5, 1, 10, 0)
+PAYLOAD = {"id": 1, "status": "pending"}
+
+FACTORIES = {
+    "PaymentResponse": lambda i: PaymentResponse(
+        transaction_id = i, provider = Provider.FEDAPAY,
+        status = TransactionStatus.PENDING, amount = 1000.0,
+        currency = Currency.XOF, created_at = CREATED_AT,
+        raw_response = PAYLOAD
+    ),
+    "TransactionDetail": lambda i: TransactionDetail(
+        transaction_id = i, provider = Provider.FEDAPAY,
+        amount = 1000.0, currency = Currency.XOF, created_at = CREATED_AT
+    ),
+    "WebhookEvent": lambda i: WebhookEvent(
+        event_type = "transaction.approved", provider = Provider.FEDAPAY,
+        transaction_id = i, status = TransactionStatus.SUCCESSFUL,
+        amount = 1000.0, currency = Currency.XOF, created_at = CREATED_AT,
+        raw_data = PAYLOAD
+    ),
+    "CustomerInfo": lambda i: CustomerInfo(phone_number = "+22890000000"),
+    "TransactionStatusResponse": lambda i: TransactionStatusResponse(
+        transaction_id = i, provider = Provider.FEDAPAY,
+        status = TransactionStatus.PENDING, amount = 1000.0
+    ),
+}
+
+
+def _bytes_per_object(factory: Callable[[str], object], count: int) -> float:
+    # Ids are built first, so that only the models are traced
+    ids = [str(i) for i in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    objects = [factory(i) for i in ids]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The list holding the objects is not part of their footprint
+    size -= objects.__sizeof__()
+    del objects
+    return size / count
+
+
+def main(count: int) -> None:
+    print(f"{count} objects of each model")
+    total = 0.0
+    for name, factory in FACTORIES.items():
+        per_object = _bytes_per_object(factory, count)
+        total += per_object
+        print(f"{name:<28} {per_object:8.1f} bytes/object")
+    print(f"{'all five':<28} {total * count / 2 ** 20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--count", type = int, default = 500000)
+    args = parser.parse_args()
+    main(args.count)
@@ -0,0 +1,134 @@
+"""
+EasySwitch - Webhook ingestion load test.
+
+Fires signed FedaPay webhooks at a WebhookApp from concurrent senders
+and reports the sustained acknowledged and processed events/sec, with
+the request latency seen by the providers. Requests are passed to the
+ASGI app in-process, so the figures exclude the HTTP server's own cost.
+With --spool, events are written (and fsynced) to a durable spool before
+being acknowledged.
+
+Usage (from the repository root):
+    PYTHONPATH=. python benchmarks/webhook_ingest.py [--events 20000]
+        [--senders 64] [--queue-size 1000] [--workers 4]
+        [--callback-delay 0.001] [--spool /tmp/spool.sqlite3]
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import statistics
+from time import perf_counter
+from typing import List, Optional, Tuple
+
+from easyswitch import AsyncEasySwitch, WebhookEvent
+from easyswitch.webhooks import WebhookApp, WebhookSpool
+
+
+SECRET = "whsec_bench"
+
+
+def _webhook(index: int) -> Tuple[bytes, List[Tuple[bytes, bytes]]]:
+    body = json.dumps({
+        "name": "transaction.approved",
+        "entity": {
+            "id": index, "amount": 1000, "status": "approved",
+            "currency_id": 1, "created_at": "2024-05-01T10:00:00Z",
+            "description": "x" * 512
+        }
+    }).encode()
+    signature = hmac.new(
+        SECRET.encode(), b"1700000000." + body, hashlib.sha256
+    ).hexdigest()
+    return body, [(b"x-fedapay-signature", f"t=1700000000,s={signature}".encode())]
+
+
+async def _post(app: WebhookApp, body: bytes, headers) -> int:
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app({
+        "type": "http", "method": "POST", "path": "/webhooks/fedapay",
+        "headers": headers
+    }, receive, send)
+    return status[0]
+
+
+async def main(
+    events: int,
+    senders: int,
+    queue_size: int,
+    workers: int,
+    callback_delay: float,
+    spool_path: Optional[str] = None
+) -> None:
+    client = AsyncEasySwitch.from_dict({
+        "providers": {
+            "FEDAPAY": {"api_secret": "bench", "extra": {"webhook_secret": SECRET}}
+        }
+    })
+
+    async def callback(event: WebhookEvent) -> None:
+        await asyncio.sleep(callback_delay)
+
+    spool = WebhookSpool(spool_path) if spool_path else None
+    app = WebhookApp(
+        client, callbacks = [callback], queue_size = queue_size,
+        workers = workers, enqueue_timeout = 0.05, spool = spool
+    )
+    await app.start()
+
+    webhooks = [_webhook(i) for i in range(events)]
+    latencies: List[float] = []
+    statuses: List[int] = []
+    next_index = iter(range(events))
+
+    async def sender() -> None:
+        for index in next_index:
+            start = perf_counter()
+            statuses.append(await _post(app, *webhooks[index]))
+            latencies.append(perf_counter() - start)
+
+    start = perf_counter()
+    await asyncio.gather(*(sender() for _ in range(senders)))
+    acknowledged = perf_counter() - start
+    await app.stop()
+    processed = perf_counter() - start
+
+    latencies.sort()
+    print(f"events              {events} ({senders} senders, {workers} workers)")
+    print(f"accepted            {app.stats.accepted}  throttled (503) {app.stats.throttled}")
+    print(f"acknowledged        {app.stats.accepted / acknowledged:10.0f} events/s")
+    print(f"processed           {app.stats.processed / processed:10.0f} events/s")
+    print(
+        f"ack latency         p50={statistics.median(latencies) * 1000:.3f}ms"
+        f"  p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.3f}ms"
+    )
+    if spool is not None:
+        print(
+            f"spool               {spool.stats.flushes} fsyncs, "
+            f"{spool.stats.appended / max(1, spool.stats.flushes):.1f} events/fsync"
+        )
+        spool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--events", type = int, default = 20000)
+    parser.add_argument("--senders", type = int, default = 64)
+    parser.add_argument("--queue-size", type = int, default = 1000)
+    parser.add_argument("--workers", type = int, default = 4)
+    parser.add_argument("--callback-delay", type = float, default = 0.001)
+    parser.add_argument("--spool", default = None)
+    args = parser.parse_args()
+    asyncio.run(main(
+        args.events, args.senders, args.queue_size, args.workers,
+        args.callback_delay, args.spool
+    ))
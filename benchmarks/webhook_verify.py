@@ -0,0 +1,95 @@
+"""
+EasySwitch - Batch webhook verification benchmark.
+
+Verifies a burst of signed FedaPay webhooks on the event loop, one by
+one, then with ``validate_webhooks``, while a ticker task measures how
+long the loop is kept from running other tasks.
+
+Usage (from the repository root):
+    PYTHONPATH=. python benchmarks/webhook_verify.py [--webhooks 2000]
+        [--body-size 65536] [--chunk-size 64]
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+from time import perf_counter
+from typing import Awaitable, Callable, List
+
+from multidict import CIMultiDict
+
+from easyswitch import AsyncEasySwitch, Provider
+
+
+SECRET = "whsec_bench"
+
+
+def _webhook(index: int, body_size: int):
+    body = b'{"name": "transaction.approved", "entity": {"id": %d, "note": "%s"}}' % (
+        index, b"x" * body_size
+    )
+    signature = hmac.new(
+        SECRET.encode(), b"1700000000." + body, hashlib.sha256
+    ).hexdigest()
+    return body, {"x-fedapay-signature": f"t=1700000000,s={signature}"}
+
+
+async def _measure(name: str, run: Callable[[], Awaitable[List[bool]]], count: int) -> None:
+    stalls: List[float] = []
+    done = False
+
+    async def ticker() -> None:
+        last = perf_counter()
+        while not done:
+            await asyncio.sleep(0)
+            now = perf_counter()
+            stalls.append(now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = perf_counter()
+    results = await run()
+    elapsed = perf_counter() - start
+    done = True
+    await task
+
+    assert all(results) and len(results) == count
+    print(
+        f"{name:<20} {count / elapsed:10.0f} webhooks/s   "
+        f"longest loop stall {max(stalls) * 1000:8.2f}ms"
+    )
+
+
+async def main(webhooks: int, body_size: int, chunk_size: int) -> None:
+    client = AsyncEasySwitch.from_dict({
+        "providers": {
+            "FEDAPAY": {"api_secret": "bench", "extra": {"webhook_secret": SECRET}}
+        }
+    })
+    integrator = client._get_integrator(Provider.FEDAPAY)
+    burst = [_webhook(i, body_size) for i in range(webhooks)]
+
+    async def inline() -> List[bool]:
+        return [
+            integrator.verify_webhook(body, CIMultiDict(headers))
+            for body, headers in burst
+        ]
+
+    async def batched() -> List[bool]:
+        return await client.validate_webhooks(
+            burst, Provider.FEDAPAY, chunk_size = chunk_size
+        )
+
+    print(f"{webhooks} webhooks of {body_size} bytes")
+    await _measure("on the loop", inline, webhooks)
+    await _measure("validate_webhooks", batched, webhooks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument("--webhooks", type = int, default = 2000)
+    parser.add_argument("--body-size", type = int, default = 65536)
+    parser.add_argument("--chunk-size", type = int, default = 64)
+    args = parser.parse_args()
+    asyncio.run(main(args.webhooks, args.body_size, args.chunk_size))
@@ -1,17 +1,20 @@
-from easyswitch.client import EasySwitch
+from easyswitch.client import AsyncEasySwitch, EasySwitch
 from easyswitch.types import (
     TransactionDetail, PaymentResponse,
     Currency, CustomerInfo, Countries,
     Provider, TransactionStatus,
     TransactionStatusResponse,
     TransactionType, WebhookEvent,
-    PaginationMeta,    
+    PaginationMeta, BatchItemResult,
+    BatchSummary, BatchReport,
+    WarmupReport,
 )
 
 __version__ = "0.1.1"
 
 __all__ = [
     'EasySwitch',
+    'AsyncEasySwitch',
     'TransactionDetail',
     'PaymentResponse',
     'Currency',
@@ -23,4 +26,8 @@ __all__ = [
     'Provider',
     'WebhookEvent',
     'PaginationMeta',
+    'BatchItemResult',
+    'BatchSummary',
+    'BatchReport',
+    'WarmupReport',
 ]
\ No newline at end of file
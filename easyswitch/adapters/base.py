@@ -2,14 +2,33 @@
 EasySwitch - Base Adapter for Payment Integrations
 """
 import abc
-from typing import Any, ClassVar, Dict, List, Optional, Type
-
-from easyswitch.conf import ProviderConfig
-from easyswitch.exceptions import InvalidProviderError
+import asyncio
+import hashlib
+import inspect
+import json
+from time import monotonic
+from typing import (Any, Awaitable, Callable, ClassVar, Dict, List, Mapping,
+                    Optional, Sequence, Tuple, Type)
+from urllib.parse import parse_qsl
+
+from multidict import CIMultiDict
+
+from easyswitch.conf import (CircuitBreakerConfig, HedgingConfig,
+                             ProviderConfig, RateLimitConfig, RetryConfig)
+from easyswitch.exceptions import (AuthenticationError, InvalidProviderError,
+                                   UnsupportedOperationError,
+                                   WebhookValidationError)
 from easyswitch.types import (Currency, PaymentResponse, TransactionDetail,
-                              TransactionStatus)
+                              TransactionStatus, WarmupReport, WebhookEvent)
 from easyswitch.utils import USER_AGENT
+from easyswitch.utils.circuit import CircuitBreakerRegistry, CircuitSnapshot
+from easyswitch.utils.hedging import Hedger, default_hedge_budget
 from easyswitch.utils.http import HTTPClient
+from easyswitch.utils.ratelimit import TokenBucket
+from easyswitch.utils.signing import ReplayGuard, SignatureVerifier
+from easyswitch.utils.singleflight import SingleFlight
+from easyswitch.utils.tokens import AccessToken, TokenManager
+from easyswitch.utils.retry import RetryBudget, RetryPolicy
 from easyswitch.utils.validators import (validate_amount, validate_currency,
                                          validate_phone_number)
 
@@ -99,6 +118,9 @@ class BaseAdapter(abc.ABC):
     MAX_AMOUNT: ClassVar[Dict[Currency, float]] = {}
     """Maximum amount for the adapter."""
 
+    SUPPORTED_COUNTRIES: ClassVar[List[str]] = []
+    """ISO alpha-2 codes of the supported countries (empty means any)."""
+
     VERSION: str = "1.0.0"
     """Adapter version"""
 
@@ -107,6 +129,27 @@ class BaseAdapter(abc.ABC):
 
     client: Optional[HTTPClient] = None
     """HTTP client for the adapter."""
+
+    READ_OPERATIONS: ClassVar[Tuple[str, ...]] = (
+        "check_status", "get_transaction_detail"
+    )
+    """Idempotent lookups served through ``lookup``."""
+
+    _hedgers: Optional[Dict[str, Hedger]] = None
+
+    _flights: Optional[SingleFlight] = None
+
+    TOKEN_REFRESH_MARGIN: ClassVar[float] = 60.0
+    """Seconds before expiry when access tokens are refreshed."""
+
+    _token_manager: Optional[TokenManager] = None
+
+    WEBHOOK_DIGEST: ClassVar[Callable[..., Any]] = hashlib.sha256
+    """Hash function of the provider's webhook HMAC signatures."""
+
+    _signature_verifier: Optional[SignatureVerifier] = None
+
+    _replay_guard: Optional[ReplayGuard] = None
     
     def __init__(
         self, 
@@ -148,27 +191,237 @@ class BaseAdapter(abc.ABC):
     def get_client(self) -> HTTPClient:
         """
         Get the HTTP client for the adapter.
-        This method should be implemented by each specific adapter.
-        It should return the HTTP client used for making API requests.
+        The client is created on first use and kept for the adapter's
+        lifetime, so its connections are reused across requests.
         
         Returns:
-            Any: The HTTP client for the adapter
+            HTTPClient: The HTTP client for the adapter
         """
-        if not self.client or self.client.is_closed:
+        if self.client is None:
             # Initialize the HTTP client if not already initialized
-            return HTTPClient(
+            self.client = HTTPClient(
                 base_url = self._get_base_url(),
                 default_headers = {
                     **self.get_headers(),
                     'User-Agent': USER_AGENT
                 },
                 timeout = self.config.timeout,
-                debug = self.context.get('debug_mode') or True
+                debug = self.get_context().get('debug_mode') or True,
+                rate_limiter = self._build_rate_limiter(),
+                retry_policy = self._build_retry_policy(),
+                circuit_breakers = self._build_circuit_breakers()
             )
             
         # Return the HTTP client
         return self.client
 
+    async def fetch_token(self) -> AccessToken:
+        """
+        Request a new access token from the provider.
+        Adapters authenticating with short lived tokens override it, the
+        token manager calls it when the current token needs a refresh.
+
+        Returns:
+            AccessToken: The new token and its expiry
+        """
+        raise UnsupportedOperationError(
+            message = f"{self.provider_name()} does not use access tokens"
+        )
+
+    def get_token_manager(self) -> TokenManager:
+        """
+        Get the token manager of the adapter.
+
+        Returns:
+            TokenManager: Manager caching and refreshing the access token
+        """
+        if self._token_manager is None:
+            self._token_manager = TokenManager(
+                self.fetch_token,
+                refresh_margin = self.TOKEN_REFRESH_MARGIN,
+                name = f"{self.provider_name()} access token",
+                store = self.get_context().get('token_store'),
+                key = self.token_store_key()
+            )
+        return self._token_manager
+
+    def token_store_key(self) -> str:
+        """
+        Key of the adapter's credential set in a shared token store.
+        Credentials are hashed so that no secret is written to the store.
+        """
+        credentials = json.dumps(
+            [
+                self.provider_name(),
+                getattr(self.config, 'environment', None),
+                getattr(self.config, 'api_key', None),
+                self.get_credentials()
+            ],
+            sort_keys = True,
+            default = str
+        )
+        digest = hashlib.sha256(credentials.encode('utf-8')).hexdigest()
+        return f"{self.provider_name()}:{digest}"
+
+    def _build_rate_limiter(self) -> Optional[TokenBucket]:
+        """Build the token bucket shared by every request of the adapter."""
+
+        rate_limit = getattr(self.config, 'rate_limit', None)
+        if not isinstance(rate_limit, RateLimitConfig):
+            return None
+        return TokenBucket(rate_limit.requests_per_second, rate_limit.burst)
+
+    def _build_retry_policy(self) -> Optional[RetryPolicy]:
+        """Build the retry policy (and its budget) of the adapter's client."""
+
+        retry = getattr(self.config, 'retry', None)
+        if not isinstance(retry, RetryConfig):
+            return None     # HTTPClient defaults: network errors only
+        return RetryPolicy(
+            max_retries = retry.max_retries,
+            base_delay = retry.base_delay,
+            max_delay = retry.max_delay,
+            jitter = retry.jitter,
+            retry_statuses = retry.retry_statuses,
+            max_retry_after = retry.max_retry_after,
+            budget = (
+                RetryBudget(retry.budget_ratio, retry.budget_reserve)
+                if retry.budget_ratio is not None else None
+            )
+        )
+
+    def _build_circuit_breakers(self) -> Optional[CircuitBreakerRegistry]:
+        """Build the per endpoint circuit breakers of the adapter."""
+
+        breaker = getattr(self.config, 'circuit_breaker', None)
+        if not isinstance(breaker, CircuitBreakerConfig) or not breaker.enabled:
+            return None
+        return CircuitBreakerRegistry(
+            self.provider_name(),
+            self.ENDPOINTS,
+            **breaker.model_dump(exclude = {'enabled'})
+        )
+
+    def _get_hedger(self, operation: str) -> Optional[Hedger]:
+        """Get (creating it if needed) the hedger of a read operation."""
+
+        hedging = getattr(self.config, 'hedging', None)
+        if not isinstance(hedging, HedgingConfig):
+            return None
+
+        if self._hedgers is None:
+            self._hedgers = {}
+        if operation not in self._hedgers:
+            # The budget is shared by every adapter of the client so that the
+            # hedge rate is capped globally.
+            budget = self.get_context().get('hedge_budget') or default_hedge_budget
+            self._hedgers[operation] = Hedger(budget, **hedging.model_dump())
+        return self._hedgers[operation]
+
+    async def lookup(self, operation: str, transaction_id: str) -> Any:
+        """
+        Run a read operation (status check or transaction detail).
+        Results are served from the client's lookup cache when enabled,
+        concurrent identical reads share a single upstream request, and
+        reads can be hedged when hedging is enabled since they are idempotent.
+
+        Args:
+            operation: Name of the operation, one of ``READ_OPERATIONS``
+            transaction_id: The transaction to look up
+
+        Returns:
+            Any: The operation's result
+        """
+        if operation not in self.READ_OPERATIONS:
+            raise ValueError(f"'{operation}' is not a read operation")
+
+        method = getattr(self, operation)
+        hedger = self._get_hedger(operation)
+
+        cache = self.get_context().get('lookup_cache')
+        if cache is not None:
+            key = cache.key(self.provider_name(), operation, transaction_id)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        async def call():
+            if hedger is None:
+                result = await method(transaction_id)
+            else:
+                result = await hedger.run(lambda: method(transaction_id))
+            if cache is not None:
+                cache.set(key, result)
+            return result
+
+        if not getattr(self.config, 'coalesce_lookups', True):
+            return await call()
+
+        if self._flights is None:
+            self._flights = SingleFlight()
+        return await self._flights.do((operation, transaction_id), call)
+
+    def circuit_states(self) -> Dict[str, CircuitSnapshot]:
+        """
+        Get the state of the adapter's circuit breakers.
+
+        Returns:
+            Dict[str, CircuitSnapshot]: Snapshots by endpoint
+        """
+        if self.client is None or self.client.circuit_breakers is None:
+            return {}
+        return self.client.circuit_breakers.states()
+
+    async def warmup(self, connections: int = 2) -> WarmupReport:
+        """
+        Prepare the adapter so that its first request is as fast as the next.
+        The provider's host is resolved, ``connections`` keep-alive
+        connections are opened to it and, for providers using access
+        tokens, a token is fetched. Failed phases are reported, not raised.
+
+        Args:
+            connections: Number of connections to open (0 to skip)
+
+        Returns:
+            WarmupReport: Time spent in each phase
+        """
+        report = WarmupReport()
+        client = self.get_client()
+
+        start = monotonic()
+        try:
+            await client.resolve()
+        except Exception as e:
+            report.errors['dns'] = str(e)
+        report.dns = monotonic() - start
+
+        if connections > 0 and 'dns' not in report.errors:
+            start = monotonic()
+            try:
+                report.connections = await client.open_connections(connections)
+            except Exception as e:
+                report.errors['connect'] = str(e)
+            report.connect = monotonic() - start
+
+        if type(self).fetch_token is not BaseAdapter.fetch_token:
+            start = monotonic()
+            try:
+                await self.get_token_manager().get_token()
+            except Exception as e:
+                report.errors['token'] = str(e)
+            report.token = monotonic() - start
+
+        return report
+
+    async def aclose(self) -> None:
+        """Close the adapter's HTTP session and release its connections."""
+
+        if self._token_manager is not None:
+            self._token_manager.close()
+
+        if self.client is not None:
+            await self.client.close_session()
+
     @abc.abstractmethod
     def get_headers(self, authorization=False) -> Dict[str, str]:
         """
@@ -341,6 +594,186 @@ class BaseAdapter(abc.ABC):
         """
         pass
     
+    def decode_webhook(
+        self,
+        raw_body: bytes,
+        headers: Mapping[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Decode the body of a webhook (JSON, or form encoded).
+
+        Args:
+            raw_body: The body of the request, as received
+            headers: The request headers
+
+        Returns:
+            Dict[str, Any]: The webhook payload
+        """
+        content_type = headers.get('Content-Type') or ''
+        if 'application/x-www-form-urlencoded' in content_type:
+            return dict(parse_qsl(raw_body.decode('utf-8'), keep_blank_values = True))
+        return json.loads(raw_body)
+
+    def webhook_secrets(self) -> List[str]:
+        """
+        Return the secret the provider signs webhooks with.
+        Adapters of providers signing their webhooks override it.
+
+        Returns:
+            List[str]: The current secret (empty if webhooks are not signed)
+        """
+        return []
+
+    @property
+    def signature_verifier(self) -> SignatureVerifier:
+        """
+        Verifier of the webhook signatures, built on first use.
+        Accepts the current secret and the ``previous_webhook_secrets``
+        of the provider config, which stay valid during a rotation.
+        """
+        if self._signature_verifier is None:
+            previous = getattr(self.config, 'previous_webhook_secrets', None)
+            if not isinstance(previous, (list, tuple)):
+                previous = []
+            self._signature_verifier = SignatureVerifier(
+                [*self.webhook_secrets(), *previous],
+                digestmod = self.WEBHOOK_DIGEST
+            )
+        return self._signature_verifier
+
+    @property
+    def replay_guard(self) -> Optional[ReplayGuard]:
+        """
+        Guard against replayed webhooks, built on first use.
+        None unless ``webhook_tolerance`` is set in the provider config;
+        adapters of providers signing a timestamp use it.
+        """
+        if self._replay_guard is None:
+            tolerance = getattr(self.config, 'webhook_tolerance', None)
+            if not isinstance(tolerance, (int, float)) or isinstance(tolerance, bool):
+                return None
+            self._replay_guard = ReplayGuard(tolerance)
+        return self._replay_guard
+
+    def verify_webhook(
+        self,
+        raw_body: bytes,
+        headers: Mapping[str, str]
+    ) -> bool:
+        """
+        Check the authenticity of a webhook from the exact bytes received.
+        Adapters whose provider signs the raw body override it to compute
+        the signature over ``raw_body``. By default the body is decoded
+        and checked by ``validate_webhook``.
+
+        Args:
+            raw_body: The body of the request, as received
+            headers: The request headers
+
+        Returns:
+            bool: True if the webhook is authentic, False otherwise
+        """
+        return self.validate_webhook(self.decode_webhook(raw_body, headers), headers)
+
+    def verify_webhooks(
+        self,
+        webhooks: Sequence[Tuple[bytes, Mapping[str, str]]]
+    ) -> List[bool]:
+        """
+        Run ``verify_webhook`` over several webhooks, in order.
+        Meant to run in a worker thread: a webhook whose verification
+        raises is reported as not authentic. Adapters verifying
+        asynchronously (e.g. MTN) are awaited on an event loop of the
+        worker thread, so their hashing does not run on the caller's loop.
+
+        Args:
+            webhooks: Raw bodies and headers of the webhooks
+
+        Returns:
+            List[bool]: Whether each webhook is authentic
+        """
+        results: List[Any] = []
+        for raw_body, headers in webhooks:
+            try:
+                results.append(self.verify_webhook(raw_body, CIMultiDict(headers)))
+            except Exception:
+                results.append(False)
+
+        pending = [i for i, valid in enumerate(results) if inspect.isawaitable(valid)]
+        if pending:
+            outcomes = asyncio.run(_gather_verifications(
+                [results[i] for i in pending]
+            ))
+            for i, valid in zip(pending, outcomes):
+                results[i] = valid
+        return [bool(valid) for valid in results]
+
+    def build_webhook_event(
+        self,
+        payload: Dict[str, Any],
+        headers: Mapping[str, str]
+    ) -> WebhookEvent:
+        """
+        Build the event of a webhook whose authenticity was verified.
+        Defaults to ``parse_webhook``, adapters override it to skip the
+        validation ``parse_webhook`` performs.
+
+        Args:
+            payload: The decoded webhook payload
+            headers: The request headers
+
+        Returns:
+            WebhookEvent: The standardized event
+        """
+        return self.parse_webhook(payload, headers)
+
+    async def handle_webhook(
+        self,
+        raw_body: bytes,
+        headers: Mapping[str, str]
+    ) -> WebhookEvent:
+        """
+        Verify a webhook over its raw body, then parse it.
+        The body is only decoded once its signature is known to be valid.
+
+        Args:
+            raw_body: The body of the request, as received
+            headers: The request headers (looked up case-insensitively)
+
+        Returns:
+            WebhookEvent: The standardized event
+
+        Raises:
+            WebhookValidationError: If the webhook is not authentic (its
+                signature header missing included) or its body is malformed
+        """
+        headers = CIMultiDict(headers)
+        try:
+            valid = self.verify_webhook(raw_body, headers)
+            if inspect.isawaitable(valid):
+                valid = await valid
+            if not valid:
+                raise WebhookValidationError(
+                    f"Invalid {self.provider_name()} webhook signature",
+                    code = 'invalid_signature'
+                )
+            payload = self.decode_webhook(raw_body, headers)
+        except AuthenticationError as e:
+            # E.g. a missing signature header
+            raise WebhookValidationError(
+                e.message, code = 'invalid_signature', details = e.details
+            ) from e
+        except (ValueError, UnicodeDecodeError) as e:
+            raise WebhookValidationError(
+                f"Malformed {self.provider_name()} webhook body: {e}",
+                code = 'malformed_body'
+            ) from e
+
+        event = self.build_webhook_event(payload, headers)
+        if inspect.isawaitable(event):
+            event = await event
+        return event
+
     @classmethod
     def provider_name(cls) -> str:
         """
@@ -407,6 +840,34 @@ class BaseAdapter(abc.ABC):
         )
         return True
 
+    def supports(
+        self,
+        transaction: TransactionDetail,
+        country: Optional[str] = None
+    ) -> bool:
+        """
+        Tell whether the adapter can process a transaction.
+        Unlike ``validate_transaction`` this never raises, it is used to
+        pick a provider for a transaction.
+
+        Args:
+            transaction: The transaction to process
+            country: ISO alpha-2 country of the customer, if known
+
+        Returns:
+            bool: True if the currency, amount and country are supported
+        """
+        currency = transaction.currency
+        if currency not in self.SUPPORTED_CURRENCIES:
+            return False
+        if transaction.amount < self.MIN_AMOUNT.get(currency, 0):
+            return False
+        if currency in self.MAX_AMOUNT and transaction.amount > self.MAX_AMOUNT[currency]:
+            return False
+        if country and self.SUPPORTED_COUNTRIES:
+            return country.upper() in self.SUPPORTED_COUNTRIES
+        return True
+
     @abc.abstractmethod
     def format_transaction(self, data: TransactionDetail) -> Dict[str, Any]:
         """
@@ -450,4 +911,14 @@ class BaseAdapter(abc.ABC):
             self.SANDBOX_URL if 
             self.config.environment == "sandbox" else 
             self.PRODUCTION_URL
-        )
\ No newline at end of file
+        )
+
+
+async def _gather_verifications(verifications: List[Awaitable[bool]]) -> List[bool]:
+    """Await webhook verifications, counting those raising as not authentic."""
+
+    outcomes = await asyncio.gather(*verifications, return_exceptions = True)
+    return [
+        False if isinstance(valid, BaseException) else bool(valid)
+        for valid in outcomes
+    ]
@@ -2,58 +2,72 @@
 EasySwitch - Main client for unified mobile money API integration
 """
 import asyncio
+import inspect
+import threading
+from concurrent.futures import Executor
+from dataclasses import replace
 from pathlib import Path
-from typing import Any, ClassVar, Dict, Optional, Union
+from time import monotonic
+from typing import (Any, AsyncIterable, Coroutine, Dict, Iterable, Iterator,
+                    List, Mapping, Optional, Tuple, TypeVar, Union)
 
 from easyswitch.adapters import AdaptersRegistry, BaseAdapter
 from easyswitch.conf import RootConfig
 from easyswitch.conf.manager import ConfigManager
 from easyswitch.exceptions import (
-    AuthenticationError, ConfigurationError,
-    InvalidProviderError
+    ConfigurationError, DuplicateWebhookError,
+    InvalidProviderError, NetworkError, RateLimitError,
+    UnsupportedOperationError
 )
 from easyswitch.types import (
-    Currency, CustomerInfo, PaymentResponse,
+    BatchReport, PaymentResponse,
     Provider, TransactionStatus,TransactionDetail,
-    WebhookEvent
+    WarmupReport, WebhookEvent
 )
 from easyswitch.integrators import load_adapter
+from easyswitch.routing import AUTO_ROUTE, Router
+from easyswitch.utils.batch import BatchResults
+from easyswitch.utils.cache import LookupCache, MemoryCache, SQLiteCache
+from easyswitch.utils.circuit import CircuitSnapshot
+from easyswitch.utils.http import ConnectionPoolManager
+from easyswitch.utils.loop import BackgroundLoop, get_shared_loop
+from easyswitch.utils.retry import RetryBudget
+from easyswitch.utils.tokens import JSONFileTokenStore, SQLiteTokenStore, TokenStore
+from easyswitch.webhooks.dedup import WebhookDeduplicator
+
+
+T = TypeVar("T")
+
+
+async def _maybe_await(value: Any) -> Any:
+    """Await ``value`` if needed (some adapters expose sync methods)."""
+
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+def _paired(provider: Provider, ids: Iterable[str]) -> Iterator[Tuple[Provider, str]]:
+    """Yield the (provider, id) pair of every transaction id."""
+
+    for transaction_id in ids:
+        yield provider, transaction_id
 
 
 ####
-##      EASY SWITCH CLIENT
+##      BASE CLIENT
 #####
-class EasySwitch:
+class BaseEasySwitch:
     """
-    Main client for EasySwitch SDK with flexible configuration options.
-
-    Examples:
-        >>> # From environment variables
-        >>> client = EasySwitch.from_env()
-        
-        >>> # From JSON file
-        >>> client = EasySwitch.from_json("config.json")
-        
-        >>> # From multiple sources
-        >>> client = EasySwitch.from_multi_sources(
-        ...     env_file=".env",
-        ...     json_file="fallback.json"
-        ... )
+    Shared bootstrap for EasySwitch clients.
+    Holds the configuration factories common to the sync and async clients.
     """
-    
+
     def __init__(self, config: RootConfig):
-        """
-        Initialize the EasySwitch client with validated configuration.
-        
-        Args:
-            config: Validated configuration object
-        """
         self.config = config
-        self._integrators: Dict[Provider, BaseAdapter] = {}
-        self._initialize_integrators()
 
     @classmethod
-    def from_config(cls, config: RootConfig) -> 'EasySwitch':
+    def from_config(cls, config: RootConfig) -> 'BaseEasySwitch':
         """Create client from existing RootConfig"""
         return cls(config)
 
@@ -62,7 +76,7 @@ class EasySwitch:
         cls,
         env_file: Optional[Union[str, Path]] = None,
         **kwargs
-    ) -> 'EasySwitch':
+    ) -> 'BaseEasySwitch':
         """
         Create client from environment variables.
         
@@ -78,7 +92,7 @@ class EasySwitch:
         cls,
         config_dict: Dict[str, Any],
         **kwargs
-    ) -> 'EasySwitch':
+    ) -> 'BaseEasySwitch':
         """
         Create client from Python dictionary.
         
@@ -94,7 +108,7 @@ class EasySwitch:
         cls,
         json_file: Union[str, Path],
         **kwargs
-    ) -> 'EasySwitch':
+    ) -> 'BaseEasySwitch':
         """
         Create client from JSON file.
         
@@ -110,7 +124,7 @@ class EasySwitch:
         cls,
         yaml_file: Union[str, Path],
         **kwargs
-    ) -> 'EasySwitch':
+    ) -> 'BaseEasySwitch':
         """
         Create client from YAML file.
         
@@ -129,7 +143,7 @@ class EasySwitch:
         yaml_file: Optional[Union[str, Path]] = None,
         config_dict: Optional[Dict[str, Any]] = None,
         **kwargs
-    ) -> 'EasySwitch':
+    ) -> 'BaseEasySwitch':
         """
         Create client from multiple configuration sources with fallback logic.
         Sources are loaded in this order with later sources overriding earlier ones:
@@ -165,6 +179,67 @@ class EasySwitch:
 
         return cls(manager.load(**kwargs).get_config())
 
+
+
+####
+##      ASYNC EASY SWITCH CLIENT
+#####
+class AsyncEasySwitch(BaseEasySwitch):
+    """
+    Asynchronous EasySwitch client.
+    Every method is awaitable and runs on the caller's event loop, so a
+    single long-lived loop can drive many concurrent payment calls.
+
+    Examples:
+        >>> client = AsyncEasySwitch.from_env()
+        >>> response = await client.send_payment(transaction)
+    """
+
+    def __init__(self, config: RootConfig):
+        """
+        Initialize the async client with validated configuration.
+
+        Args:
+            config: Validated configuration object
+        """
+        super().__init__(config)
+        self._integrators: Dict[Provider, BaseAdapter] = {}
+        self._integrators_lock = threading.Lock()
+        self.lookup_cache = self._build_lookup_cache()
+        self.token_store = self._build_token_store()
+        self.webhook_dedup = self._build_webhook_dedup()
+        self._initialize_integrators()
+        self.router = Router(
+            self._providers,
+            self._get_integrator,
+            weights = {
+                Provider(name): provider_config.weight
+                for name, provider_config in self.config.providers.items()
+            }
+        )
+
+    async def __aenter__(self) -> 'AsyncEasySwitch':
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the HTTP sessions held by every integrator."""
+
+        for integrator in list(self._integrators.values()):
+            await integrator.aclose()
+
+    def _pool_managers(self) -> List[ConnectionPoolManager]:
+        """Return the pool managers providing the integrators' connectors."""
+
+        managers: List[ConnectionPoolManager] = []
+        for integrator in list(self._integrators.values()):
+            client = integrator.client
+            if client is not None and client.pool_manager not in managers:
+                managers.append(client.pool_manager)
+        return managers
+
     def _validate_providers(self):
         """Validate provider configuration."""
 
@@ -184,38 +259,91 @@ class EasySwitch:
             self.config.default_provider = next(iter(self.config.providers.keys()))
     
     def _initialize_integrators(self):
-        """Initialize all configured provider integrators."""
+        """
+        Prepare the configured provider integrators.
+        Adapters are not built here: each one is imported and constructed
+        on first use (see ``_get_integrator`` and ``warmup``), so creating
+        a client never performs any network I/O.
+        """
 
         # Validate providers
         self._validate_providers()
 
-        # Initialize the integrators based on the enabled providers
-        for provider_name, provider_config in self.config.providers.items():
-            # Load the adapter module only if needed
-            if provider_name.upper() not in AdaptersRegistry.list():
-                # Then load it
-                load_adapter(provider_name)
-
+        self._providers: List[Provider] = []
+        for provider_name in self.config.providers:
             try:
-                provider = Provider(provider_name)
-                adapter_class = AdaptersRegistry.get(provider.value)
-                self._integrators[provider] = adapter_class(
-                    provider_config,
-                    context = {
-                        'debug_mode': self.config.debug,
-                        'log_config': self.config.logging,
-                        'defaulf_currency': self.config.default_currency
-                    }
-                )
+                self._providers.append(Provider(provider_name))
             except ValueError as e:
                 raise InvalidProviderError(
                     f"Invalid provider '{provider_name}': {str(e)}"
                 )
-            except Exception as e:
-                raise ConfigurationError(
-                    f"Failed to initialize provider '{provider_name}': {str(e)}"
-                )
-    
+
+        # Hedged lookups of every provider share one budget
+        self._adapter_context = {
+            'debug_mode': self.config.debug,
+            'log_config': self.config.logging,
+            'defaulf_currency': self.config.default_currency,
+            'hedge_budget': RetryBudget(
+                ratio = self.config.max_hedge_rate, reserve = 1
+            ),
+            'lookup_cache': self.lookup_cache,
+            'token_store': self.token_store
+        }
+
+    def _create_integrator(self, provider: Provider) -> BaseAdapter:
+        """Import and build the adapter of a provider."""
+
+        # Load the adapter module only if needed
+        if provider.value not in AdaptersRegistry.list():
+            load_adapter(provider.value)
+
+        try:
+            adapter_class = AdaptersRegistry.get(provider.value)
+            return adapter_class(
+                self.config.providers[provider.value],
+                context = self._adapter_context
+            )
+        except Exception as e:
+            raise ConfigurationError(
+                f"Failed to initialize provider '{provider.value}': {str(e)}"
+            )
+
+    def _build_lookup_cache(self) -> Optional[LookupCache]:
+        """Build the lookup cache shared by every integrator, if enabled."""
+
+        cache = self.config.cache
+        if cache is None:
+            return None
+        backend = (
+            SQLiteCache(cache.path, cache.max_entries)
+            if cache.backend == 'sqlite' else
+            MemoryCache(cache.max_entries)
+        )
+        return LookupCache(backend, cache.ttls, cache.default_ttl)
+
+    def _build_token_store(self) -> Optional[TokenStore]:
+        """Build the token store shared with other processes, if enabled."""
+
+        store = self.config.token_store
+        if store is None:
+            return None
+        if store.backend == 'sqlite':
+            return SQLiteTokenStore(store.path)
+        return JSONFileTokenStore(store.path)
+
+    def _build_webhook_dedup(self) -> Optional[WebhookDeduplicator]:
+        """Build the store of the webhooks already received, if enabled."""
+
+        dedup = self.config.webhook_dedup
+        if dedup is None:
+            return None
+        backend = (
+            SQLiteCache(dedup.path, dedup.max_entries)
+            if dedup.backend == 'sqlite' else
+            MemoryCache(dedup.max_entries)
+        )
+        return WebhookDeduplicator(backend, dedup.ttl)
+
     def _get_integrator(
         self, 
         provider: Optional[Provider] = None
@@ -228,37 +356,657 @@ class EasySwitch:
             raise ConfigurationError(
                 "No provider specified and no default provider set"
             )
-        
-        if provider not in self._integrators:
+
+        integrator = self._integrators.get(provider)
+        if integrator is not None:
+            return integrator
+
+        if provider not in self._providers:
             raise InvalidProviderError(
                 f"The Provider '{provider}' is not supported. "
                 "perhaps you forgot to enable it in the configuration. "
                 f"Available choices are: {self.config.providers}"
             )
+
+        with self._integrators_lock:
+            if provider not in self._integrators:
+                self._integrators[Provider(provider)] = self._create_integrator(
+                    Provider(provider)
+                )
+            return self._integrators[provider]
+
+    async def warmup(
+        self,
+        providers: Optional[Iterable[Provider]] = None,
+        connections: int = 2
+    ) -> Dict[Provider, WarmupReport]:
+        """
+        Prepare the integrators ahead of their first use.
+        Each adapter is built, its provider's host resolved, keep-alive
+        connections opened and, if the provider uses access tokens, a
+        token fetched. Providers are warmed up concurrently.
+
+        Args:
+            providers: Providers to warm up (all configured providers by default)
+            connections: Connections to open to each provider (0 to skip)
+
+        Returns:
+            Dict[Provider, WarmupReport]: Time spent in each phase, by provider
+        """
+        providers = list(providers) if providers else list(self._providers)
+        integrators = [self._get_integrator(provider) for provider in providers]
+        reports = await asyncio.gather(
+            *(integrator.warmup(connections) for integrator in integrators)
+        )
+        return {
+            Provider(provider): report
+            for provider, report in zip(providers, reports)
+        }
+
+    def circuit_states(
+        self,
+        provider: Optional[Provider] = None
+    ) -> Dict[Provider, Dict[str, CircuitSnapshot]]:
+        """
+        Get the state of the circuit breakers.
+
+        Args:
+            provider: Restrict to this provider (all providers by default)
+
+        Returns:
+            Dict[Provider, Dict[str, CircuitSnapshot]]: Snapshots by
+                provider, then by endpoint
+        """
+        if provider:
+            return {provider: self._get_integrator(provider).circuit_states()}
+        # Adapters not built yet have made no call, hence have no circuit
+        return {
+            p: (self._integrators[p].circuit_states() if p in self._integrators else {})
+            for p in self._providers
+        }
+    
+    async def send_payment(
+        self,
+        transaction: TransactionDetail,
+        provider: Optional[Union[Provider, str]] = None,
+    ) -> PaymentResponse:
+        """
+        Sends a payment request to a specific provider.
+
+        When routing is enabled, a payment sent with ``provider="auto"``, or
+        with no provider at all (neither argument nor ``transaction.provider``),
+        goes to the provider chosen by the router, and the next eligible one
+        is tried if it is down.
+
+        Args:
+            transaction: The transaction object containing payment details
+            provider: The payment provider to use, or ``"auto"`` to route it
+
+        Returns:
+            PaymentResponse: Response to the payment request
+
+        Raises:
+            ConfigurationError: If ``"auto"`` is given with routing disabled
+        """
+        if provider == AUTO_ROUTE:
+            if not self.config.routing:
+                raise ConfigurationError(
+                    "Payments can only be routed with routing enabled."
+                )
+            return await self._send_routed_payment(transaction)
+
+        provider = provider or transaction.provider
+        if provider is None and self.config.routing:
+            return await self._send_routed_payment(transaction)
+
+        provider = provider or self.config.default_provider
+        integrator = self._get_integrator(provider)
+        return await self._track(
+            provider, integrator.send_payment(transaction = transaction)
+        )
+
+    async def _send_routed_payment(
+        self,
+        transaction: TransactionDetail
+    ) -> PaymentResponse:
+        """Send a payment to the best provider, failing over if needed."""
+
+        candidates = self.router.route(transaction)
+        if not candidates:
+            raise UnsupportedOperationError(
+                message = (
+                    "No enabled provider supports this transaction "
+                    f"({transaction.amount} {transaction.currency})."
+                )
+            )
+
+        error = None
+        for provider in candidates:
+            try:
+                return await self._track(
+                    provider,
+                    self._get_integrator(provider).send_payment(
+                        transaction = replace(transaction, provider = provider)
+                    )
+                )
+            except Exception as e:
+                if not self.router.can_fail_over(e):
+                    raise
+                error = e
+        raise error
+
+    async def _track(self, provider: Provider, call: Coroutine[Any, Any, T]) -> T:
+        """Await a provider call, recording its outcome in the router's health."""
+
+        start = monotonic()
+        try:
+            result = await call
+        except (NetworkError, RateLimitError, asyncio.TimeoutError):
+            self.router.record(provider, False, monotonic() - start)
+            raise
+        self.router.record(provider, True, monotonic() - start)
+        return result
+
+    def route(self, transaction: TransactionDetail) -> List[Provider]:
+        """
+        Get the providers a transaction would be routed to, best first.
+
+        Args:
+            transaction: The transaction to route
+
+        Returns:
+            List[Provider]: Eligible providers in the order they would be tried
+        """
+        return self.router.route(transaction)
+
+    def send_payments(
+        self,
+        transactions: Union[
+            Iterable[TransactionDetail], AsyncIterable[TransactionDetail]
+        ],
+        concurrency: int = 10,
+        provider: Optional[Union[Provider, str]] = None,
+    ) -> BatchResults:
+        """
+        Sends payment requests for a batch of transactions.
+        Transactions are streamed through at most ``concurrency`` in-flight
+        requests and a failing item never aborts the batch.
+
+        Args:
+            transactions: The transactions to send (sync or async iterable)
+            concurrency: Maximum number of in-flight payment requests
+            provider: The payment provider to use for every transaction,
+                or ``"auto"`` to route each of them
+
+        Returns:
+            BatchResults: Async iterator of results in completion order,
+            with a running ``summary``
+
+        Examples:
+            >>> batch = client.send_payments(transactions, concurrency=50)
+            >>> async for result in batch:
+            ...     if not result.ok:
+            ...         print(result.transaction_id, result.error)
+            >>> print(batch.summary)
+        """
+
+        async def send(transaction: TransactionDetail) -> PaymentResponse:
+            return await self.send_payment(transaction, provider)
+
+        return BatchResults(
+            transactions,
+            send,
+            concurrency = concurrency,
+            # Routed payments only know their provider once sent
+            key = lambda transaction: (
+                transaction.transaction_id,
+                None if provider == AUTO_ROUTE else
+                provider or transaction.provider or self.config.default_provider
+            )
+        )
+
+    async def check_status(
+        self,
+        transaction_id: str,
+        provider: Optional[Provider] = None,
+    ) -> TransactionStatus:
+        """
+        Checks a transaction status.
+
+        Args:
+            provider: The payment provider to use
+            transaction_id: The transaction ID to check
+
+        Returns:
+            TransactionStatus: The current status of the transaction
+        """
+        integrator = self._get_integrator(provider)
+        return await integrator.lookup('check_status', transaction_id)
+
+    def check_statuses(
+        self,
+        ids_by_provider: Mapping[Provider, Iterable[str]],
+        concurrency: int = 10,
+        provider_concurrency: Optional[Mapping[Provider, int]] = None,
+    ) -> BatchResults:
+        """
+        Checks the status of many transactions across providers.
+        Each provider is worked through by its own workers on the running
+        loop, with at most ``concurrency`` requests in flight overall and at
+        most the provider's cap in flight per provider.
+
+        Args:
+            ids_by_provider: Transaction IDs to check, grouped by provider
+            concurrency: Maximum number of in-flight status requests
+            provider_concurrency: Per-provider caps, defaulting to each
+                provider's ``max_concurrency`` setting
+
+        Returns:
+            BatchResults: Async iterator of results in completion order,
+            each holding a ``TransactionStatusResponse`` or the error
+
+        Examples:
+            >>> batch = client.check_statuses({
+            ...     Provider.CINETPAY: cinetpay_ids,
+            ...     Provider.FEDAPAY: fedapay_ids,
+            ... }, concurrency=100)
+            >>> async for result in batch:
+            ...     print(result.transaction_id, result.response.status)
+        """
+        limits = {
+            provider: self.config.providers[provider].max_concurrency
+            for provider in ids_by_provider
+            if provider in self.config.providers
+        }
+        limits.update(provider_concurrency or {})
+
+        async def check(item: Tuple[Provider, str]) -> TransactionStatus:
+            provider, transaction_id = item
+            return await self.check_status(transaction_id, provider)
+
+        # One lane of workers per provider: a provider at its cap only
+        # holds its own workers, not the slots of the other providers
+        return BatchResults(
+            (),
+            check,
+            concurrency = concurrency,
+            key = lambda item: (item[1], item[0]),
+            lanes = [
+                (_paired(provider, ids), limits.get(provider) or concurrency)
+                for provider, ids in ids_by_provider.items()
+            ]
+        )
+
+    async def get_transaction_detail(
+        self,
+        transaction_id: str,
+        provider: Optional[Provider] = None,
+    ) -> TransactionDetail:
+        """
+        Fetch full detail for a transaction if supported.
+
+        Args:
+            provider: The payment provider to use
+            transaction_id: The transaction ID to fetch
+
+        Returns:
+            TransactionDetail: The retrieved transaction details
+        """
+        integrator = self._get_integrator(provider)
+        return await integrator.lookup('get_transaction_detail', transaction_id)
+
+    async def cancel_transaction(
+        self,
+        transaction_id: str,
+        provider: Optional[Provider] = None,
+    ) -> bool:
+        """
+        Cancel a transaction if supported.
+
+        Args:
+            provider: The payment provider to use
+            transaction_id: The transaction ID to cancel
+
+        Returns:
+            bool: True if cancellation succeeded, False otherwise
+        """
+        integrator = self._get_integrator(provider)
+        try:
+            return await integrator.cancel_transaction(transaction_id)
+        finally:
+            self._invalidate_lookups(integrator, transaction_id)
+
+    async def refund(
+        self,
+        transaction_id: str,
+        provider: Optional[Provider] = None,
+        amount: Optional[float] = None,
+        reason: Optional[str] = None
+    ) -> PaymentResponse:
+        """
+        Performs a refund for a transaction.
+        This method allows you to refund a transaction either fully or partially.
+
+        Args:
+            provider: The payment provider to use
+            transaction_id: The transaction ID to check
+            amount: The amount to refund (if None, refund full amount)
+            reason: reason for the refund (optional)
+
+        Returns:
+            PaymentResponse: Response to the refund request
+        """
+        integrator = self._get_integrator(provider)
+        try:
+            return await integrator.refund(
+                transaction_id = transaction_id,
+                amount = amount,
+                reason = reason
+            )
+        finally:
+            self._invalidate_lookups(integrator, transaction_id)
+
+    def _invalidate_lookups(self, integrator: BaseAdapter, transaction_id: str) -> None:
+        """Drop the cached lookups of a transaction whose state changed."""
+
+        if self.lookup_cache is None:
+            return
+        for operation in integrator.READ_OPERATIONS:
+            self.lookup_cache.invalidate(
+                integrator.provider_name(), operation, transaction_id
+            )
+
+    async def validate_webhook(
+        self,
+        payload: Dict[str, Any],
+        headers: Dict[str, Any],
+        provider: Optional[Provider] = None
+    ) -> bool:
+        """
+        Validates a webhook event.
+
+        Args:
+            provider: The payment provider to use
+            payload: The payload of the webhook event
+            headers: The headers of the webhook request
+
+        Returns:
+            bool: True if the webhook is valid, False elsewhere
+        """
+        integrator = self._get_integrator(provider)
+        return await _maybe_await(
+            integrator.validate_webhook(
+                payload = payload,
+                headers = headers
+            )
+        )
+
+    async def validate_webhooks(
+        self,
+        webhooks: Iterable[Tuple[bytes, Mapping[str, str]]],
+        provider: Optional[Provider] = None,
+        chunk_size: int = 64,
+        executor: Optional[Executor] = None
+    ) -> List[bool]:
+        """
+        Verify a burst of webhooks over their raw bodies, off the event loop.
+        Signatures are computed in worker threads (hashlib releases the
+        GIL on large bodies), ``chunk_size`` webhooks per thread job, so
+        the loop keeps serving requests meanwhile. Adapters verifying
+        asynchronously are run on an event loop of the worker thread.
+
+        Args:
+            webhooks: Raw bodies and headers of the webhooks
+            provider: The payment provider that sent the webhooks
+            chunk_size: Number of webhooks verified by each thread job
+            executor: Executor running the jobs (the loop's default one
+                if not given)
+
+        Returns:
+            List[bool]: Whether each webhook is authentic, in order
+        """
+        integrator = self._get_integrator(provider)
+        webhooks = list(webhooks)
+        chunk_size = max(1, chunk_size)
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(
+                executor, integrator.verify_webhooks,
+                webhooks[start:start + chunk_size]
+            )
+            for start in range(0, len(webhooks), chunk_size)
+        ))
+
+        return [valid for chunk in chunks for valid in chunk]
+
+    async def parse_webhook(
+        self,
+        payload: Dict[str, Any],
+        headers: Dict[str, Any],
+        provider: Optional[Provider] = None
+    ) -> WebhookEvent:
+        """
+        Parse a webhook event and return a standardized WebhookEvent object.
+        This method validates and processes the webhook payload and headers 
+        to extract and return a WebhookEvent object.
+
+        Args:
+            provider: The payment provider to use
+            payload: The payload of the webhook event
+            headers: The headers of the webhook request
+
+        Returns:
+            WebhookEvent: Parsed webhook event object
+        """
+        integrator = self._get_integrator(provider)
+        return self._drop_duplicate(await _maybe_await(
+            integrator.parse_webhook(
+                payload = payload,
+                headers = headers
+            )
+        ))
+
+    async def handle_webhook(
+        self,
+        raw_body: bytes,
+        headers: Mapping[str, str],
+        provider: Optional[Provider] = None
+    ) -> WebhookEvent:
+        """
+        Verify and parse a webhook from the exact body received.
+        The signature is checked over ``raw_body`` before it is decoded,
+        so webhooks are never re-serialized and forged ones never parsed.
+
+        Args:
+            raw_body: The body of the webhook request, as received
+            headers: The headers of the webhook request
+            provider: The payment provider that sent the webhook
+
+        Returns:
+            WebhookEvent: Parsed webhook event object
+
+        Raises:
+            WebhookValidationError: If the webhook is not authentic or
+                its body is malformed
+            DuplicateWebhookError: If the webhook was already received
+                (with ``webhook_dedup`` enabled)
+        """
+        integrator = self._get_integrator(provider)
+        return self._drop_duplicate(
+            await integrator.handle_webhook(raw_body, headers)
+        )
+
+    def _drop_duplicate(self, event: WebhookEvent) -> WebhookEvent:
+        """Raise if the webhook was already received (deduplication enabled)."""
+
+        if self.webhook_dedup is not None and self.webhook_dedup.seen(event):
+            raise DuplicateWebhookError(
+                f"Duplicate {event.event_type} webhook for transaction "
+                f"{event.transaction_id}",
+                event = event
+            )
+        return event
+
+    def forget_webhook(self, event: WebhookEvent) -> None:
+        """
+        Forget a received webhook so that its redelivery is not dropped.
+        Call it when processing the event failed.
+
+        Args:
+            event: The event returned by handle_webhook or parse_webhook
+        """
+        if self.webhook_dedup is not None:
+            self.webhook_dedup.forget(event)
+
+
+####
+##      EASY SWITCH CLIENT
+#####
+class EasySwitch(BaseEasySwitch):
+    """
+    Main client for EasySwitch SDK with flexible configuration options.
+    This is a blocking facade over ``AsyncEasySwitch``; use the async
+    client directly from code that already runs an event loop.
+
+    Examples:
+        >>> # From environment variables
+        >>> client = EasySwitch.from_env()
+        
+        >>> # From JSON file
+        >>> client = EasySwitch.from_json("config.json")
+        
+        >>> # From multiple sources
+        >>> client = EasySwitch.from_multi_sources(
+        ...     env_file=".env",
+        ...     json_file="fallback.json"
+        ... )
+    """
+    
+    def __init__(self, config: RootConfig):
+        """
+        Initialize the EasySwitch client with validated configuration.
         
-        return self._integrators[provider]
+        Args:
+            config: Validated configuration object
+        """
+        self.aio = AsyncEasySwitch(config)
+        super().__init__(self.aio.config)
+
+        # With a background loop, every call is a queue hop to the same
+        # loop instead of a fresh `asyncio.run` per call. The loop is shared
+        # by all sync clients of the process, and so are their connections.
+        self._loop: Optional[BackgroundLoop] = (
+            get_shared_loop() if self.config.background_loop else None
+        )
+
+    def __enter__(self) -> 'EasySwitch':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def _integrators(self) -> Dict[Provider, BaseAdapter]:
+        """Integrators owned by the underlying async client."""
+        return self.aio._integrators
+
+    def _get_integrator(
+        self, 
+        provider: Optional[Provider] = None
+    ) -> BaseAdapter:
+        """Get the integrator for specified provider or default."""
+        return self.aio._get_integrator(provider)
+
+    def circuit_states(
+        self,
+        provider: Optional[Provider] = None
+    ) -> Dict[Provider, Dict[str, CircuitSnapshot]]:
+        """Get the state of the circuit breakers, by provider then endpoint."""
+        return self.aio.circuit_states(provider)
+
+    def route(self, transaction: TransactionDetail) -> List[Provider]:
+        """Get the providers a transaction would be routed to, best first."""
+        return self.aio.route(transaction)
+
+    def warmup(
+        self,
+        providers: Optional[Iterable[Provider]] = None,
+        connections: int = 2
+    ) -> Dict[Provider, WarmupReport]:
+        """
+        Prepare the integrators ahead of their first use.
+        Open connections only outlive the call with ``background_loop``
+        enabled, so none are opened otherwise.
+        """
+        if self._loop is None:
+            connections = 0
+        return self._run(self.aio.warmup(providers, connections))
+
+    def _run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a client coroutine to completion and return its result."""
+
+        if self._loop is not None:
+            return self._loop.run(coro)
+        return asyncio.run(self._run_once(coro))
+
+    async def _run_once(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run ``coro`` on a throwaway loop, closing the sessions bound to it."""
+
+        try:
+            return await coro
+        finally:
+            await self.aio.aclose()
+            # The shared connectors (and their sockets) are bound to this loop too
+            for manager in self.aio._pool_managers():
+                await manager.close()
+
+    def close(self) -> None:
+        """Release the resources held by the client."""
+
+        if self._loop is not None:
+            self._loop.run(self.aio.aclose())
     
     def send_payment(
         self,
         transaction: TransactionDetail,
-        provider: Optional[Provider] = None,
+        provider: Optional[Union[Provider, str]] = None,
     ) -> PaymentResponse:
         """
         Sends a payment request to a specific provider.
         
         Args:
             transaction: The transaction object containing payment details
-            provider: The payment provider to use
+            provider: The payment provider to use, or ``"auto"`` to route it
             
         Returns:
             PaymentResponse: Response to the payment request
         """
-        provider =  provider or transaction.provider or self.config.default_provider
-        integrator = self._get_integrator(provider)
-        return asyncio.run(
-                integrator.send_payment(
-                transaction = transaction
-            )
+        return self._run(self.aio.send_payment(transaction, provider))
+
+    def send_payments(
+        self,
+        transactions: Iterable[TransactionDetail],
+        concurrency: int = 10,
+        provider: Optional[Union[Provider, str]] = None,
+    ) -> BatchReport:
+        """
+        Sends payment requests for a batch of transactions.
+        See ``AsyncEasySwitch.send_payments``; this blocks until the whole
+        batch is done.
+
+        Args:
+            transactions: The transactions to send
+            concurrency: Maximum number of in-flight payment requests
+            provider: The payment provider to use for every transaction,
+                or ``"auto"`` to route each of them
+
+        Returns:
+            BatchReport: Results in completion order and the batch summary
+        """
+        batch = self.aio.send_payments(transactions, concurrency, provider)
+        return BatchReport(
+            results = self._run(batch.collect()),
+            summary = batch.summary
         )
     
     def check_status(
@@ -276,10 +1024,52 @@ class EasySwitch:
         Returns:
             TransactionStatus: The current status of the transaction
         """
-        provider =  provider or self.config.default_provider
-        integrator = self._get_integrator(provider)
-        return asyncio.run(
-            integrator.check_status(transaction_id)
+        return self._run(self.aio.check_status(transaction_id, provider))
+
+    def check_statuses(
+        self,
+        ids_by_provider: Mapping[Provider, Iterable[str]],
+        concurrency: int = 10,
+        provider_concurrency: Optional[Mapping[Provider, int]] = None,
+    ) -> BatchReport:
+        """
+        Checks the status of many transactions across providers.
+        See ``AsyncEasySwitch.check_statuses``; this blocks until every
+        status has been fetched.
+
+        Args:
+            ids_by_provider: Transaction IDs to check, grouped by provider
+            concurrency: Maximum number of in-flight status requests
+            provider_concurrency: Per-provider caps
+
+        Returns:
+            BatchReport: Results in completion order and the batch summary
+        """
+        batch = self.aio.check_statuses(
+            ids_by_provider, concurrency, provider_concurrency
+        )
+        return BatchReport(
+            results = self._run(batch.collect()),
+            summary = batch.summary
+        )
+
+    def get_transaction_detail(
+        self,
+        transaction_id: str,
+        provider: Optional[Provider] = None,
+    ) -> TransactionDetail:
+        """
+        Fetch full detail for a transaction if supported.
+
+        Args:
+            provider: The payment provider to use
+            transaction_id: The transaction ID to fetch
+
+        Returns:
+            TransactionDetail: The retrieved transaction details
+        """
+        return self._run(
+            self.aio.get_transaction_detail(transaction_id, provider)
         )
     
     def cancel_transaction(
@@ -297,11 +1087,7 @@ class EasySwitch:
         Returns:
             bool: True if cancellation succeeded, False otherwise
         """
-        provider =  provider or self.config.default_provider
-        integrator = self._get_integrator(provider)
-        return asyncio.run(
-            integrator.cancel_transaction(transaction_id)
-        ) 
+        return self._run(self.aio.cancel_transaction(transaction_id, provider))
     
     def refund(
         self,
@@ -323,13 +1109,12 @@ class EasySwitch:
         Returns:
             PaymentResponse: Response to the refund request
         """
-        provider =  provider or self.config.default_provider
-        integrator = self._get_integrator(provider)
-        return asyncio.run(
-            integrator.refund(
-                transaction_id=transaction_id,
-                amount=amount,
-                reason=reason
+        return self._run(
+            self.aio.refund(
+                transaction_id = transaction_id,
+                provider = provider,
+                amount = amount,
+                reason = reason
             )
         )
     
@@ -350,13 +1135,8 @@ class EasySwitch:
         Returns:
             bool: True if the webhook is valid, False elsewhere
         """
-        provider =  provider or self.config.default_provider
-        integrator = self._get_integrator(provider)
-        return asyncio.run(
-            integrator.validate_webhook(
-                payload = payload,
-                headers = headers
-            )
+        return self._run(
+            self.aio.validate_webhook(payload, headers, provider)
         )
     
     def parse_webhook(
@@ -378,11 +1158,54 @@ class EasySwitch:
         Returns:
             WebhookEvent: Parsed webhook event object
         """
-        provider =  provider or self.config.default_provider
-        integrator = self._get_integrator(provider)
-        return asyncio.run(
-            integrator.parse_webhook(
-                payload = payload,
-                headers = headers
-            )
+        return self._run(
+            self.aio.parse_webhook(payload, headers, provider)
+        )
+
+    def validate_webhooks(
+        self,
+        webhooks: Iterable[Tuple[bytes, Mapping[str, str]]],
+        provider: Optional[Provider] = None,
+        chunk_size: int = 64,
+        executor: Optional[Executor] = None
+    ) -> List[bool]:
+        """
+        Verify a burst of webhooks over their raw bodies, in worker threads.
+
+        Args:
+            webhooks: Raw bodies and headers of the webhooks
+            provider: The payment provider that sent the webhooks
+            chunk_size: Number of webhooks verified by each thread job
+            executor: Executor running the jobs
+
+        Returns:
+            List[bool]: Whether each webhook is authentic, in order
+        """
+        return self._run(
+            self.aio.validate_webhooks(webhooks, provider, chunk_size, executor)
+        )
+
+    def forget_webhook(self, event: WebhookEvent) -> None:
+        """Forget a received webhook so that its redelivery is not dropped."""
+        self.aio.forget_webhook(event)
+
+    def handle_webhook(
+        self,
+        raw_body: bytes,
+        headers: Mapping[str, str],
+        provider: Optional[Provider] = None
+    ) -> WebhookEvent:
+        """
+        Verify and parse a webhook from the exact body received.
+        
+        Args:
+            raw_body: The body of the webhook request, as received
+            headers: The headers of the webhook request
+            provider: The payment provider that sent the webhook
+            
+        Returns:
+            WebhookEvent: Parsed webhook event object
+        """
+        return self._run(
+            self.aio.handle_webhook(raw_body, headers, provider)
         )
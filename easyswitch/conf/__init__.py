@@ -5,9 +5,11 @@ EasySwitch - Conf Module.
 from easyswitch.utils import import_module_from
 from typing import Dict, Type
 
-from easyswitch.conf.base import (BaseConfigModel, BaseConfigSource, LogFormat,
+from easyswitch.conf.base import (BaseConfigModel, BaseConfigSource,
+                                  CacheConfig, CircuitBreakerConfig, HedgingConfig, LogFormat,
                                   LoggingConfig, LogLevel, ProviderConfig,
-                                  RootConfig)
+                                  RateLimitConfig, RetryConfig, RootConfig,
+                                  TokenStoreConfig, WebhookDedupConfig)
 
 # from easyswitch.conf.manager import (
 #     ConfigManager
@@ -15,12 +17,19 @@ from easyswitch.conf.base import (BaseConfigModel, BaseConfigSource, LogFormat,
 
 __all__ = [
     'BaseConfigSource',
+    'CacheConfig',
+    'CircuitBreakerConfig',
+    'HedgingConfig',
     'LogLevel',
     'LogFormat',
     'LoggingConfig',
     'BaseConfigModel',
     'ProviderConfig',
+    'RateLimitConfig',
+    'RetryConfig',
     'RootConfig',
+    'TokenStoreConfig',
+    'WebhookDedupConfig',
     'register_source',
     'get_source'
 ]
@@ -5,12 +5,13 @@ EasySwitch - Configs Base
 from abc import ABC, abstractmethod
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Optional, Type
+from typing import Any, Dict, List, Literal, Optional, Type
 
 from pydantic import BaseModel, Field, field_validator, model_validator, ValidationInfo
 
 from easyswitch.exceptions import ConfigurationError
-from easyswitch.types import Currency, Provider
+from easyswitch.types import Currency, Provider, TransactionStatus
+from easyswitch.utils.retry import RETRYABLE_STATUSES, Jitter
 
 
 ####
@@ -65,6 +66,170 @@ class BaseConfigModel(BaseModel):
         use_enum_values = True
 
 
+####
+##      RATE LIMIT CONFIGURATION CLASS
+#####
+class RateLimitConfig(BaseConfigModel):
+    """Token bucket settings used to pace requests to a provider."""
+
+    requests_per_second: float = Field(gt = 0)
+    """ Sustained number of requests allowed per second. """
+
+    burst: int = Field(default = 1, ge = 1)
+    """ Number of requests allowed back to back. """
+
+
+####
+##      RETRY CONFIGURATION CLASS
+#####
+class RetryConfig(BaseConfigModel):
+    """Retry policy applied to the requests sent to a provider."""
+
+    max_retries: int = Field(default = 3, ge = 0)
+    """ Maximum retries per request. """
+
+    base_delay: float = Field(default = 1.0, ge = 0)
+    """ Backoff delay of the first retry (in seconds). """
+
+    max_delay: float = Field(default = 30.0, ge = 0)
+    """ Upper bound of the backoff delay (in seconds). """
+
+    jitter: Jitter = Jitter.FULL
+    """ Backoff randomization: `none`, `full` or `decorrelated`. """
+
+    retry_statuses: List[int] = Field(
+        default_factory = lambda: sorted(RETRYABLE_STATUSES)
+    )
+    """ Response statuses worth retrying. """
+
+    max_retry_after: float = 60.0
+    """ Longest Retry-After to wait for before giving up. """
+
+    budget_ratio: Optional[float] = Field(default = 0.2, ge = 0)
+    """ Retries allowed as a fraction of the requests, None to disable. """
+
+    budget_reserve: int = Field(default = 10, ge = 0)
+    """ Retries always available on top of the ratio. """
+
+
+####
+##      CIRCUIT BREAKER CONFIGURATION CLASS
+#####
+class CircuitBreakerConfig(BaseConfigModel):
+    """Circuit breaker settings, applied to each endpoint of a provider."""
+
+    enabled: bool = True
+
+    failure_rate_threshold: float = Field(default = 0.5, gt = 0, le = 1)
+    """ Failure rate opening the circuit. """
+
+    slow_call_rate_threshold: float = Field(default = 1.0, gt = 0, le = 1)
+    """ Slow call rate opening the circuit. """
+
+    slow_call_duration: float = Field(default = 10.0, gt = 0)
+    """ Duration (in seconds) above which a call is considered slow. """
+
+    window_size: int = Field(default = 20, ge = 1)
+    """ Number of calls in the sliding window. """
+
+    minimum_calls: int = Field(default = 10, ge = 1)
+    """ Calls required before the rates are evaluated. """
+
+    open_duration: float = Field(default = 30.0, gt = 0)
+    """ Seconds the circuit stays open before trial calls. """
+
+    half_open_calls: int = Field(default = 3, ge = 1)
+    """ Trial calls allowed while half-open. """
+
+
+####
+##      HEDGING CONFIGURATION CLASS
+#####
+class HedgingConfig(BaseConfigModel):
+    """Hedging of the status and transaction detail lookups of a provider."""
+
+    percentile: float = Field(default = 0.95, gt = 0, lt = 1)
+    """ Latency percentile after which a backup request is sent. """
+
+    min_delay: float = Field(default = 0.05, ge = 0)
+    """ Lower bound of the hedging delay (in seconds). """
+
+    max_delay: float = Field(default = 5.0, gt = 0)
+    """ Upper bound of the hedging delay (in seconds). """
+
+    min_samples: int = Field(default = 20, ge = 1)
+    """ Latencies needed before hedging starts. """
+
+
+####
+##      CACHE CONFIGURATION CLASS
+#####
+class CacheConfig(BaseConfigModel):
+    """Cache of the status and transaction detail lookups."""
+
+    backend: Literal['memory', 'sqlite'] = 'memory'
+
+    path: Optional[str] = None
+    """ SQLite file (required by the sqlite backend). """
+
+    max_entries: int = Field(default = 1024, ge = 1)
+    """ Maximum number of cached lookups (least recently used are evicted). """
+
+    ttls: Dict[TransactionStatus, float] = Field(default_factory = dict)
+    """ TTL (in seconds) by status, overriding the defaults. """
+
+    default_ttl: float = Field(default = 0.0, ge = 0)
+    """ TTL of the statuses without one (0 disables caching them). """
+
+    @model_validator(mode = 'after')
+    def check_path(self):
+        """ Ensure the sqlite backend has a file to use. """
+
+        if self.backend == 'sqlite' and not self.path:
+            raise ConfigurationError("The sqlite cache backend requires a path.")
+        return self
+
+
+####
+##      TOKEN STORE CONFIGURATION CLASS
+#####
+class TokenStoreConfig(BaseConfigModel):
+    """Access tokens store shared by the processes of a host."""
+
+    backend: Literal['json', 'sqlite'] = 'json'
+
+    path: str
+    """ File holding the tokens (a `.lock` file is created next to it). """
+
+
+####
+##      WEBHOOK DEDUPLICATION CONFIGURATION CLASS
+#####
+class WebhookDedupConfig(BaseConfigModel):
+    """Store of the webhooks already received, to drop redeliveries."""
+
+    backend: Literal['memory', 'sqlite'] = 'memory'
+
+    path: Optional[str] = None
+    """ SQLite file (required by the sqlite backend). """
+
+    max_entries: int = Field(default = 100_000, ge = 1)
+    """ Maximum number of remembered webhooks (least recently seen are evicted). """
+
+    ttl: float = Field(default = 86400.0, gt = 0)
+    """ Seconds during which a redelivered webhook is dropped. """
+
+    @model_validator(mode = 'after')
+    def check_path(self):
+        """ Ensure the sqlite backend has a file to use. """
+
+        if self.backend == 'sqlite' and not self.path:
+            raise ConfigurationError(
+                "The sqlite webhook deduplication backend requires a path."
+            )
+        return self
+
+
 ####
 ##      PROVIDER CONFIGURATION CLASS
 #####
@@ -78,6 +243,15 @@ class ProviderConfig(BaseConfigModel):
     callback_url: Optional[str] = None
     return_url: Optional[str] = None
     timeout: int = 30
+    max_concurrency: Optional[int] = None   # Max in-flight bulk requests
+    rate_limit: Optional[RateLimitConfig] = None    # Requests pacing
+    retry: Optional[RetryConfig] = None     # Retry policy (network errors only if unset)
+    circuit_breaker: Optional[CircuitBreakerConfig] = None  # Breakers (opt-in)
+    weight: float = Field(default = 1.0, ge = 0)    # Routing weight (0 disables)
+    hedging: Optional[HedgingConfig] = None     # Hedged lookups (opt-in)
+    coalesce_lookups: bool = True   # Share concurrent identical lookups
+    previous_webhook_secrets: List[str] = []    # Still accepted while rotating
+    webhook_tolerance: Optional[int] = Field(default = None, gt = 0)    # Replay window (s)
     environment: str = "sandbox"    # sandbox|production
     extra: Dict[str, Any] = {}      # Extra data (specific for each provider)
 
@@ -116,6 +290,24 @@ class RootConfig(BaseConfigModel):
     debug: bool = False
     """ If True, enable debug mode. """
 
+    background_loop: bool = False
+    """ If True, the sync client runs its calls on one background event loop. """
+
+    routing: bool = False
+    """ If True, payments sent without explicit provider are routed, with failover. """
+
+    max_hedge_rate: float = Field(default = 0.05, ge = 0)
+    """ Hedged lookups allowed as a fraction of the lookups, for all providers. """
+
+    cache: Optional[CacheConfig] = None
+    """ Cache of the status and transaction detail lookups (disabled by default). """
+
+    token_store: Optional[TokenStoreConfig] = None
+    """ Access tokens store shared between processes (disabled by default). """
+
+    webhook_dedup: Optional[WebhookDedupConfig] = None
+    """ Drop redelivered webhooks (disabled by default). """
+
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     """ Logging configurations. """
 
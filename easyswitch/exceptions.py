@@ -139,4 +139,36 @@ class ValidationError(EasySwitchError):
             message = message,
             code = "validation_error",
             details = {"field": field, **kwargs}
-        )
\ No newline at end of file
+        )
+
+class CircuitOpenError(EasySwitchError):
+    """Request rejected without being sent because the circuit is open."""
+
+    def __init__(
+        self,
+        message: str,
+        circuit: Optional[str] = None,
+        retry_after: float = 0.0
+    ):
+        self.circuit = circuit
+        self.retry_after = retry_after
+        super().__init__(
+            message = message,
+            code = "circuit_open",
+            details = {"circuit": circuit, "retry_after": retry_after}
+        )
+
+
+class DuplicateWebhookError(EasySwitchError):
+    """Webhook already received (the provider redelivered it)."""
+
+    def __init__(self, message: str, event: Any = None):
+        self.event = event
+        super().__init__(
+            message = message,
+            code = "duplicate_webhook",
+            details = {
+                "transaction_id": getattr(event, "transaction_id", None),
+                "event_type": getattr(event, "event_type", None)
+            }
+        )
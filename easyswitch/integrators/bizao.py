@@ -5,7 +5,6 @@ import hashlib
 import hmac
 import json
 import base64
-import asyncio
 from typing import Any, ClassVar, Dict, List, Optional
 
 from easyswitch.utils.http import HTTPClient
@@ -19,6 +18,7 @@ from easyswitch.types import (Currency, CustomerInfo, PaymentResponse,
 from easyswitch.utils import (
     dict_to_encoded_query_string, encoded_query_string_to_dict
 )
+from easyswitch.utils.tokens import AccessToken
 
 
 ####
@@ -132,9 +132,10 @@ class BizaoAdapter(BaseAdapter):
         return headers
     
     def get_authrizations(self,auth = False, basic = False) -> dict:
-        ''' Returns authrization informations. '''
+        ''' Returns authrization informations (auth may be the access token). '''
+        token = auth if isinstance(auth, str) else self.config.api_key
         return {
-            'Authorization': f'Bearer {self.config.api_key}',
+            'Authorization': f'Bearer {token}',
         }   if auth else {}
     
     def get_token_url(self) -> str:
@@ -146,8 +147,8 @@ class BizaoAdapter(BaseAdapter):
             self.config.extra.get("prod_token_url",'')
         )
     
-    async def authenticate(self):
-        """Make auth request and get auth token."""
+    async def fetch_token(self) -> AccessToken:
+        """Request a new access token (client credentials grant)."""
 
         # First get client identifiers from config
         creds = self.get_credentials()
@@ -178,9 +179,10 @@ class BizaoAdapter(BaseAdapter):
 
             # Then Check for success
             if response.status in range(200,300):
-                self.config.api_key = response.data.get('access_token')
-                print(self.config.api_key)
-                return
+                return AccessToken.from_lifetime(
+                    response.data.get('access_token'),
+                    response.data.get('expires_in', 3600)
+                )
 
             # Raise AuthenticationError
             raise AuthenticationError(
@@ -191,11 +193,10 @@ class BizaoAdapter(BaseAdapter):
                 code = str(response.status),
                 details = response.data
             )
-        
-    def _initialize_adapter(self):
-        """Override Initialize Adapter method to add authentications."""
-        asyncio.run(self.authenticate())
-        return super()._initialize_adapter()
+
+    async def authenticate(self):
+        """Make auth request and get auth token."""
+        await self.get_token_manager().refresh()
 
     def format_transaction(
         self, 
@@ -264,48 +265,50 @@ class BizaoAdapter(BaseAdapter):
         order = self.format_transaction(transaction)
 
         # Then send the request to provider
-        async with self.get_client() as client:
+        client = self.get_client()
 
-            response = await client.post(
+        response = await self.get_token_manager().call(
+            lambda token: client.post(
                 endpoint = self.ENDPOINTS["payment"],
                 json_data = order,
                 headers = self.get_headers(
-                    authorization = True,
+                    authorization = token,
                     extra = True
                 ),
             )
+        )
 
-            # Check for success
-            if response.status in range(200,300):
-                # Then Process data and return Payment Response.
-                status_atr = (
-                    'message' if 
-                    self.config.extra.get('channel','web') == 'web' 
-                    else 'status'
-                )
-                data = response.data
-                return PaymentResponse(
-                    transaction_id = transaction.transaction_id,
-                    reference = transaction.reference,
-                    provider = self.provider_name(),
-                    status = self.get_normalize_status(data.get(status_atr,'').upper()),
-                    currency = transaction.currency,
-                    amount = data.get('amount') or transaction.amount,      # In case of web channel.
-                    payment_link = data.get('payment_url',''),
-                    transaction_token = data.get('pay_token',''),           # Will be empty in case of tpe and ussd channels
-                    metadata = encoded_query_string_to_dict(data.get('state','')),
-                    raw_response = data
-                )
-
-            # If the response is not successful, raise an API error
-            raise PaymentError(
-                message = (
-                    f"Payment request failed with status {response.status}.\n"
-                    f"url: {response.url}\n {response.data}"
-                ),
-                status_code = response.status,
-                raw_response = response.data
+        # Check for success
+        if response.status in range(200,300):
+            # Then Process data and return Payment Response.
+            status_atr = (
+                'message' if 
+                self.config.extra.get('channel','web') == 'web' 
+                else 'status'
+            )
+            data = response.data
+            return PaymentResponse(
+                transaction_id = transaction.transaction_id,
+                reference = transaction.reference,
+                provider = self.provider_name(),
+                status = self.get_normalize_status(data.get(status_atr,'').upper()),
+                currency = transaction.currency,
+                amount = data.get('amount') or transaction.amount,      # In case of web channel.
+                payment_link = data.get('payment_url',''),
+                transaction_token = data.get('pay_token',''),           # Will be empty in case of tpe and ussd channels
+                metadata = encoded_query_string_to_dict(data.get('state','')),
+                raw_response = data
             )
+
+        # If the response is not successful, raise an API error
+        raise PaymentError(
+            message = (
+                f"Payment request failed with status {response.status}.\n"
+                f"url: {response.url}\n {response.data}"
+            ),
+            status_code = response.status,
+            raw_response = response.data
+        )
         
     async def check_status(self, transaction_id: str) -> TransactionStatusResponse:
         """
@@ -313,28 +316,30 @@ class BizaoAdapter(BaseAdapter):
         """
 
         # Initialize http client
-        async with self.get_client() as client:
-            # Then make the request
-            response = await client.get(
+        client = self.get_client()
+        # Then make the request
+        response = await self.get_token_manager().call(
+            lambda token: client.get(
                 endpoint=self.ENDPOINTS["status"].format(
                     transaction_id = transaction_id
                 ),
                 headers = self.get_headers(
-                    authorization = True,
+                    authorization = token,
                     extra = True
                 ),
             )
+        )
 
-            data = response.data
+        data = response.data
 
-            # Return Transaction status Response
-            return TransactionStatusResponse(
-                transaction_id = transaction_id,
-                provider = self.provider_name(),
-                status = self.get_normalize_status(data.get('status','').upper()),
-                amount = data.get("amount"),
-                data = data
-            )
+        # Return Transaction status Response
+        return TransactionStatusResponse(
+            transaction_id = transaction_id,
+            provider = self.provider_name(),
+            status = self.get_normalize_status(data.get('status','').upper()),
+            amount = data.get("amount"),
+            data = data
+        )
         
     async def cancel_transaction(self, transaction_id):
         """
@@ -1,8 +1,6 @@
 """
 EasySwitch - CinetPay Integrator
 """
-import hashlib
-import hmac
 import json
 from typing import Any, ClassVar, Dict, List, Optional
 
@@ -161,21 +159,15 @@ class CinetpayAdapter(BaseAdapter):
             f"{payload.get('cpm_designation')}{payload.get('cpm_error_message')}"
         ) 
     
+    def webhook_secrets(self) -> List[str]:
+        """ Return the secret CinetPay signs the x-token with. """
+
+        return [self.config.extra.get("secret")]
+
     def compare_tokens(self, payload_str: str, recieved_token: str) -> bool:
         """ Compare the tokens. """
 
-        # First generate the token from the payload string
-        token = hmac.new(
-            key = self.config.extra.get("secret","").encode(),
-            msg = payload_str.encode(),
-            digestmod = hashlib.sha256
-        ).hexdigest()
-
-        # Then compare the tokens
-        return hmac.compare_digest(
-            token,
-            recieved_token
-        )
+        return self.signature_verifier.verify(recieved_token, payload_str)
 
     def validate_webhook(self, payload, headers) -> bool:
         """ Validate the webhook payload. """
@@ -232,81 +224,81 @@ class CinetpayAdapter(BaseAdapter):
         order = self.format_transaction(transaction)
 
         # Then send the payment request
-        async with self.get_client() as client:
-            response = await client.post(
-                endpoint = self.ENDPOINTS["payment"],
-                json_data = order,
-                headers = self.get_headers()
-            )
+        client = self.get_client()
+        response = await client.post(
+            endpoint = self.ENDPOINTS["payment"],
+            json_data = order,
+            headers = self.get_headers()
+        )
 
-            # Check if the response is successful
-            if response.status in range(200, 300):
-                # Extract the payment link from the response
-                payment_link = response.data.get("data",{}).get("payment_url")
+        # Check if the response is successful
+        if response.status in range(200, 300):
+            # Extract the payment link from the response
+            payment_link = response.data.get("data",{}).get("payment_url")
 
-                # Create a PaymentResponse object
-                return PaymentResponse(
-                    transaction_id = order.get("transaction_id"),
-                    provider = self.provider_name(),
-                    status = TransactionStatus.PENDING,
-                    amount = order["amount"],
-                    currency = order["currency"],
-                    reference = order["reference"],
-                    payment_link = payment_link,
-                    transaction_token = response.data.get("data").get("payment_token"),
-                    customer = transaction.customer,
-                    raw_response = response.data,
-                    metadata = transaction.metadata
-                )
-            
-            # If the response is not successful, raise an API error
-            raise PaymentError(
-                message = "Payment request failed",
-                status_code = response.status,
-                raw_response = response.data
+            # Create a PaymentResponse object
+            return PaymentResponse(
+                transaction_id = order.get("transaction_id"),
+                provider = self.provider_name(),
+                status = TransactionStatus.PENDING,
+                amount = order["amount"],
+                currency = order["currency"],
+                reference = order["reference"],
+                payment_link = payment_link,
+                transaction_token = response.data.get("data").get("payment_token"),
+                customer = transaction.customer,
+                raw_response = response.data,
+                metadata = transaction.metadata
             )
+        
+        # If the response is not successful, raise an API error
+        raise PaymentError(
+            message = "Payment request failed",
+            status_code = response.status,
+            raw_response = response.data
+        )
     
     async def check_status(self, transaction_id: str) -> TransactionStatusResponse:
         """
         Check the status of a transaction.
         """
         # Send a GET request to check the status of the transaction
-        async with self.get_client() as client:
-            response = await client.post(
-                endpoint = self.ENDPOINTS["payment_status"],
-                json_data = {
-                    "transaction_id": transaction_id,
-                    **self.get_credentials()
-                },
-                headers = self.get_headers()
-            )
-            print(response.url)
+        client = self.get_client()
+        response = await client.post(
+            endpoint = self.ENDPOINTS["payment_status"],
+            json_data = {
+                "transaction_id": transaction_id,
+                **self.get_credentials()
+            },
+            headers = self.get_headers()
+        )
+        print(response.url)
 
-            # No need to check the status code, cinetpay sends the status in the body
-            # Check if the response is successful
-            if response.status in range(200, 300):
-                data = response.data
-                # check for a success message
-                status = data.get('message')
-                print(data)
+        # No need to check the status code, cinetpay sends the status in the body
+        # Check if the response is successful
+        if response.status in range(200, 300):
+            data = response.data
+            # check for a success message
+            status = data.get('message')
+            print(data)
 
-                return TransactionStatusResponse(
-                    transaction_id = transaction_id,
-                    provider = self.provider_name(),
-                    status = self.get_normalize_status(status),
-                    amount = data.get("data").get("amount"),
-                    data = data
-                )
-            
-            # If the response is not successful, raise an API error
-            raise PaymentError(
-                message = (
-                    f"Payment request failed with status {response.status}."
-                    f"\n url: {response.url}"
-                ),
-                status_code = response.status,
-                raw_response = response.data
+            return TransactionStatusResponse(
+                transaction_id = transaction_id,
+                provider = self.provider_name(),
+                status = self.get_normalize_status(status),
+                amount = data.get("data").get("amount"),
+                data = data
             )
+        
+        # If the response is not successful, raise an API error
+        raise PaymentError(
+            message = (
+                f"Payment request failed with status {response.status}."
+                f"\n url: {response.url}"
+            ),
+            status_code = response.status,
+            raw_response = response.data
+        )
     
     async def cancel_transaction(self, transaction_id):
         """
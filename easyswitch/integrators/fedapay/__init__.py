@@ -1,10 +1,8 @@
 """
 EasySwitch - Fedapay Integrator
 """
-import hashlib
-import hmac
 import json
-from typing import Any, ClassVar, Dict, List, Optional
+from typing import Any, ClassVar, Dict, List, Optional, Tuple
 from dateutil import parser
 
 from easyswitch.adapters.base import AdaptersRegistry, BaseAdapter
@@ -19,7 +17,7 @@ from easyswitch.integrators.fedapay.types import (
     LogsResponse, PaymentLinkResponse, TransactionSearchResponse, 
     WebhookDetail, WebhooksResponse
 )
-from easyswitch.integrators.fedapay.utils import FedapayCurrencyMapper
+from easyswitch.integrators.fedapay.utils import FedapayCurrencyMapper, parse_datetime
 from easyswitch.types import (
     Currency, CustomerInfo, PaginationMeta, PaymentResponse,
     Provider, TransactionDetail, TransactionStatus,
@@ -211,24 +209,24 @@ class FedapayAdapter(BaseAdapter):
         
         customer = self.format_customer(customer)
         
-        async with self.get_client() as client:
-            response = await client.post(
-                endpoint=self.ENDPOINTS["create_customer"],
-                json_data=customer,
-                headers=self.get_headers(authorization=True)
-            )
-                                    
-            if response.status in range(200, 300):
-                customer_data: Dict[str, Any] = response.data.get("v1/customer", {})
-                
-                return self._build_customer_detail(customer_data)
+        client = self.get_client()
+        response = await client.post(
+            endpoint=self.ENDPOINTS["create_customer"],
+            json_data=customer,
+            headers=self.get_headers(authorization=True)
+        )
+                                
+        if response.status in range(200, 300):
+            customer_data: Dict[str, Any] = response.data.get("v1/customer", {})
+            
+            return self._build_customer_detail(customer_data)
         
-            # If the response is not successful, raise a CustomerError
-            raise CustomerError(
-                message="Failed to create customer",
-                status_code=response.status,
-                raw_response=response.data
-            )
+        # If the response is not successful, raise a CustomerError
+        raise CustomerError(
+            message="Failed to create customer",
+            status_code=response.status,
+            raw_response=response.data
+        )
     
     async def update_customer(self, customer_id: int, customer: FedapayCustomerUpdate) -> CustomerInfo:
         """
@@ -243,24 +241,24 @@ class FedapayAdapter(BaseAdapter):
             CustomerError: If the customer update fails or if the data is invalid.
         """
                 
-        async with self.get_client() as client:
-            response = await client.put(
-                endpoint=self.ENDPOINTS["update_customer"].format(id=customer_id),
-                json_data=customer.to_payload(),
-                headers=self.get_headers(authorization=True)
-            )
+        client = self.get_client()
+        response = await client.put(
+            endpoint=self.ENDPOINTS["update_customer"].format(id=customer_id),
+            json_data=customer.to_payload(),
+            headers=self.get_headers(authorization=True)
+        )
+        
+        if response.status in range(200, 300):
+            customer_data: Dict[str, Any] = response.data.get("v1/customer", {})
             
-            if response.status in range(200, 300):
-                customer_data: Dict[str, Any] = response.data.get("v1/customer", {})
-                
-                return self._build_customer_detail(customer_data)
+            return self._build_customer_detail(customer_data)
         
-            # If the response is not successful, raise a CustomerError
-            raise CustomerError(
-                message=f"Failed to update customer with ID {customer_id}",
-                status_code=response.status,
-                raw_response=response.data
-            )
+        # If the response is not successful, raise a CustomerError
+        raise CustomerError(
+            message=f"Failed to update customer with ID {customer_id}",
+            status_code=response.status,
+            raw_response=response.data
+        )
         
     async def delete_customer(self, customer_id: int) -> bool:
         """
@@ -274,21 +272,21 @@ class FedapayAdapter(BaseAdapter):
             CustomerError: If the customer deletion fails or if the ID is invalid.
         """
         
-        async with self.get_client() as client:
-            response = await client.delete(
-                endpoint=self.ENDPOINTS["delete_customer"].format(id=customer_id),
-                headers=self.get_headers(authorization=True)
-            )
-            
-            if response.status in range(200, 300):
-                return True
+        client = self.get_client()
+        response = await client.delete(
+            endpoint=self.ENDPOINTS["delete_customer"].format(id=customer_id),
+            headers=self.get_headers(authorization=True)
+        )
         
-            # If the response is not successful, raise a CustomerError
-            raise CustomerError(
-                message=f"Failed to delete customer with ID {customer_id}",
-                status_code=response.status,
-                raw_response=response.data
-            )
+        if response.status in range(200, 300):
+            return True
+        
+        # If the response is not successful, raise a CustomerError
+        raise CustomerError(
+            message=f"Failed to delete customer with ID {customer_id}",
+            status_code=response.status,
+            raw_response=response.data
+        )
     
     async def search_customers(self) -> CustomerSearchResponse:
         """
@@ -299,49 +297,49 @@ class FedapayAdapter(BaseAdapter):
         Raises:
             CustomerError: If the customer search fails or if there is an error in the request.
         """
-        async with self.get_client() as client:
-            response = await client.get(
-                endpoint=self.ENDPOINTS["search_customers"],
-                headers=self.get_headers(authorization=True)
+        client = self.get_client()
+        response = await client.get(
+            endpoint=self.ENDPOINTS["search_customers"],
+            headers=self.get_headers(authorization=True)
+        )
+        
+        if response.status in range(200, 300):
+            customers_data: List[Dict[str, Any]] = response.data.get("v1/customers", [])
+            meta_data: Dict[str, Any] = response.data.get("meta", {})
+            customers = [
+                CustomerInfo(
+                    id=customer.get("id"),
+                    email=customer.get("email"),
+                    first_name=customer.get("firstname"),
+                    last_name=customer.get("lastname"),
+                    metadata={
+                        "phone_number_id": customer.get("phone_number_id"),
+                        "account_id": customer.get("account_id"),
+                        "full_name": customer.get("full_name"),
+                        "created_at": customer.get("created_at"),
+                        "updated_at": customer.get("updated_at"),
+                        "deleted_at": customer.get("deleted_at"),
+                        "klass": customer.get("klass"),
+                    }
+                ) for customer in customers_data
+            ]
+            meta = PaginationMeta(
+                current_page=meta_data.get("current_page"),
+                next_page=meta_data.get("next_page"),
+                prev_page=meta_data.get("prev_page"),
+                per_page=meta_data.get("per_page"),
+                total_pages=meta_data.get("total_pages"),
+                total_count=meta_data.get("total_count"),
             )
-            
-            if response.status in range(200, 300):
-                customers_data: List[Dict[str, Any]] = response.data.get("v1/customers", [])
-                meta_data: Dict[str, Any] = response.data.get("meta", {})
-                customers = [
-                    CustomerInfo(
-                        id=customer.get("id"),
-                        email=customer.get("email"),
-                        first_name=customer.get("firstname"),
-                        last_name=customer.get("lastname"),
-                        metadata={
-                            "phone_number_id": customer.get("phone_number_id"),
-                            "account_id": customer.get("account_id"),
-                            "full_name": customer.get("full_name"),
-                            "created_at": customer.get("created_at"),
-                            "updated_at": customer.get("updated_at"),
-                            "deleted_at": customer.get("deleted_at"),
-                            "klass": customer.get("klass"),
-                        }
-                    ) for customer in customers_data
-                ]
-                meta = PaginationMeta(
-                    current_page=meta_data.get("current_page"),
-                    next_page=meta_data.get("next_page"),
-                    prev_page=meta_data.get("prev_page"),
-                    per_page=meta_data.get("per_page"),
-                    total_pages=meta_data.get("total_pages"),
-                    total_count=meta_data.get("total_count"),
-                )
-                return CustomerSearchResponse(customers=customers, meta=meta)
+            return CustomerSearchResponse(customers=customers, meta=meta)
 
         
-            # If the response is not successful, raise a CustomerError
-            raise CustomerError(
-                message="Failed to search customers",
-                status_code=response.status,
-                raw_response=response.data
-            )
+        # If the response is not successful, raise a CustomerError
+        raise CustomerError(
+            message="Failed to search customers",
+            status_code=response.status,
+            raw_response=response.data
+        )
     
     async def get_customer_detail(self, customer_id: int) -> Optional[CustomerInfo]:
         """
@@ -353,22 +351,22 @@ class FedapayAdapter(BaseAdapter):
         Raises:
             CustomerError: If the customer cannot be found or if there is an error in the request.
         """
-        async with self.get_client() as client:
-            response = await client.get(
-                endpoint=self.ENDPOINTS["get_customer"].format(id=customer_id),
-                headers=self.get_headers(authorization=True)
-            )
-                        
-            if response.status in range(200, 300):
-                customer_data: Dict[str, Any] = response.data.get("v1/customer", {})
-                
-                return self._build_customer_detail(customer_data)
-                
-            raise CustomerError(
-                message=f"Failed to fetch customer for ID {customer_id}",
-                status_code=response.status,
-                raw_response=response.data
-            )
+        client = self.get_client()
+        response = await client.get(
+            endpoint=self.ENDPOINTS["get_customer"].format(id=customer_id),
+            headers=self.get_headers(authorization=True)
+        )
+                    
+        if response.status in range(200, 300):
+            customer_data: Dict[str, Any] = response.data.get("v1/customer", {})
+            
+            return self._build_customer_detail(customer_data)
+            
+        raise CustomerError(
+            message=f"Failed to fetch customer for ID {customer_id}",
+            status_code=response.status,
+            raw_response=response.data
+        )
     
     ##############################
     ##### Transaction Methods ####
@@ -425,45 +423,45 @@ class FedapayAdapter(BaseAdapter):
         """
         order = self.format_transaction(transaction)
 
-        async with self.get_client() as client:
-            # Send payment request
-            response = await client.post(
-                endpoint=self.ENDPOINTS["create_transaction"],
-                json_data=order,
-                headers=self.get_headers(authorization=True)
+        client = self.get_client()
+        # Send payment request
+        response = await client.post(
+            endpoint=self.ENDPOINTS["create_transaction"],
+            json_data=order,
+            headers=self.get_headers(authorization=True)
+        )
+                    
+        if response.status in range(200, 300):
+            transaction_data: Dict[str, Any] = response.data.get("v1/transaction", {})
+            currency_iso = FedapayCurrencyMapper.get_iso(int(transaction_data.get("currency_id")))
+            customer = CustomerInfo(
+                id=transaction_data.get("customer_id"),
+                email=transaction.customer.email,
+                first_name=transaction.customer.first_name,
+                last_name=transaction.customer.last_name,
+                phone_number=transaction.customer.phone_number,
+                metadata=transaction.customer.metadata,
             )
-                        
-            if response.status in range(200, 300):
-                transaction_data: Dict[str, Any] = response.data.get("v1/transaction", {})
-                currency_iso = FedapayCurrencyMapper.get_iso(int(transaction_data.get("currency_id")))
-                customer = CustomerInfo(
-                    id=transaction_data.get("customer_id"),
-                    email=transaction.customer.email,
-                    first_name=transaction.customer.first_name,
-                    last_name=transaction.customer.last_name,
-                    phone_number=transaction.customer.phone_number,
-                    metadata=transaction.customer.metadata,
-                )
-                
-                return PaymentResponse(
-                    transaction_id=transaction_data.get("id"),
-                    provider=self.provider_name(),
-                    status=TransactionStatus.PENDING,
-                    amount=transaction_data.get("amount"),
-                    currency=Currency(currency_iso),
-                    reference=transaction_data.get("reference"),
-                    payment_link=transaction_data.get("payment_url"),
-                    customer=customer,
-                    created_at=parser.parse(transaction_data.get("created_at")),
-                    raw_response=response.data,
-                    metadata=transaction_data.get("metadata", {})
-                )
-
-            raise PaymentError(
-                message="Payment request to FedaPay failed",
-                status_code=response.status,
-                raw_response=response.data
+            
+            return PaymentResponse(
+                transaction_id=transaction_data.get("id"),
+                provider=self.provider_name(),
+                status=TransactionStatus.PENDING,
+                amount=transaction_data.get("amount"),
+                currency=Currency(currency_iso),
+                reference=transaction_data.get("reference"),
+                payment_link=transaction_data.get("payment_url"),
+                customer=customer,
+                created_at=parser.parse(transaction_data.get("created_at")),
+                raw_response=response.data,
+                metadata=transaction_data.get("metadata", {})
             )
+
+        raise PaymentError(
+            message="Payment request to FedaPay failed",
+            status_code=response.status,
+            raw_response=response.data
+        )
     
     def get_normalize_status(self, status):
         """ Normalize the status of a transaction. """
@@ -573,22 +571,22 @@ class FedapayAdapter(BaseAdapter):
         Raises:
             PaymentError: If the transaction cannot be found or if there is an error in the request.
         """
-        async with self.get_client() as client:
-            response = await client.get(
-                endpoint=self.ENDPOINTS["get_transaction"].format(id=transaction_id),
-                headers=self.get_headers(authorization=True)
-            )
+        client = self.get_client()
+        response = await client.get(
+            endpoint=self.ENDPOINTS["get_transaction"].format(id=transaction_id),
+            headers=self.get_headers(authorization=True)
+        )
 
-            if response.status in range(200, 300):
-                data: Dict[str, Any] = response.data.get("v1/transaction", {})
-                
-                return await self._build_transaction_detail(data, response.data, fetch_customer=True)
-                
-            raise PaymentError(
-                message="Failed to fetch transaction detail", 
-                status_code=response.status, 
-                raw_response=response.data
-            )
+        if response.status in range(200, 300):
+            data: Dict[str, Any] = response.data.get("v1/transaction", {})
+            
+            return await self._build_transaction_detail(data, response.data, fetch_customer=True)
+            
+        raise PaymentError(
+            message="Failed to fetch transaction detail", 
+            status_code=response.status, 
+            raw_response=response.data
+        )
 
     def format_transaction_for_update(self, transaction: FedapayTransactionUpdate) -> Dict[str, Any]:
         """
@@ -629,24 +627,24 @@ class FedapayAdapter(BaseAdapter):
         # Format the transaction data
         formatted_transaction = self.format_transaction_for_update(transaction)
         
-        async with self.get_client() as client:
-            response = await client.put(
-                endpoint=self.ENDPOINTS["update_transaction"].format(id=transaction_id),
-                json_data=formatted_transaction,
-                headers=self.get_headers(authorization=True)
-            )
+        client = self.get_client()
+        response = await client.put(
+            endpoint=self.ENDPOINTS["update_transaction"].format(id=transaction_id),
+            json_data=formatted_transaction,
+            headers=self.get_headers(authorization=True)
+        )
+        
+        if response.status in range(200, 300):
+            data: Dict[str, Any] = response.data.get("v1/transaction", {})
             
-            if response.status in range(200, 300):
-                data: Dict[str, Any] = response.data.get("v1/transaction", {})
-                
-                return await self._build_transaction_detail(data, response.data, fetch_customer=True)
+            return await self._build_transaction_detail(data, response.data, fetch_customer=True)
         
-            # If the response is not successful, raise a PaymentError
-            raise PaymentError(
-                message=f"Failed to update transaction with ID {transaction_id}",
-                status_code=response.status,
-                raw_response=response.data
-            )
+        # If the response is not successful, raise a PaymentError
+        raise PaymentError(
+            message=f"Failed to update transaction with ID {transaction_id}",
+            status_code=response.status,
+            raw_response=response.data
+        )
     
     async def delete_transaction(self, transaction_id: int) -> bool:
         """
@@ -660,21 +658,21 @@ class FedapayAdapter(BaseAdapter):
             PaymentError: If the transaction deletion fails or if the ID is invalid.
         """
         
-        async with self.get_client() as client:
-            response = await client.delete(
-                endpoint=self.ENDPOINTS["delete_transaction"].format(id=transaction_id),
-                headers=self.get_headers(authorization=True)
-            )
-            
-            if response.status in range(200, 300):
-                return True
+        client = self.get_client()
+        response = await client.delete(
+            endpoint=self.ENDPOINTS["delete_transaction"].format(id=transaction_id),
+            headers=self.get_headers(authorization=True)
+        )
         
-            # If the response is not successful, raise a PaymentError
-            raise PaymentError(
-                message=f"Failed to delete transaction with ID {transaction_id}",
-                status_code=response.status,
-                raw_response=response.data
-            )
+        if response.status in range(200, 300):
+            return True
+        
+        # If the response is not successful, raise a PaymentError
+        raise PaymentError(
+            message=f"Failed to delete transaction with ID {transaction_id}",
+            status_code=response.status,
+            raw_response=response.data
+        )
     
     async def search_transactions(self) -> TransactionSearchResponse:
         """
@@ -686,35 +684,35 @@ class FedapayAdapter(BaseAdapter):
             PaymentError: If the transaction search fails or if there is an error in the request.
         """
         
-        async with self.get_client() as client:
-            response = await client.get(
-                endpoint=self.ENDPOINTS["search_transactions"],
-                headers=self.get_headers(authorization=True)
-            )
-            
-            if response.status in range(200, 300):
-                transactions_data: List[Dict[str, Any]] = response.data.get("v1/transactions", [])
-                meta_data: Dict[str, Any] = response.data.get("meta", {})
-                transactions = [
-                    await self._build_transaction_detail(data=transaction, fetch_customer=False)
-                    for transaction in transactions_data
-                ]
-                meta = PaginationMeta(
-                    current_page=meta_data.get("current_page"),
-                    next_page=meta_data.get("next_page"),
-                    prev_page=meta_data.get("prev_page"),
-                    per_page=meta_data.get("per_page"),
-                    total_pages=meta_data.get("total_pages"),
-                    total_count=meta_data.get("total_count"),
-                )
-                return TransactionSearchResponse(transactions=transactions, meta=meta)
+        client = self.get_client()
+        response = await client.get(
+            endpoint=self.ENDPOINTS["search_transactions"],
+            headers=self.get_headers(authorization=True)
+        )
         
-            # If the response is not successful, raise a PaymentError
-            raise PaymentError(
-                message="Failed to search transactions",
-                status_code=response.status,
-                raw_response=response.data
+        if response.status in range(200, 300):
+            transactions_data: List[Dict[str, Any]] = response.data.get("v1/transactions", [])
+            meta_data: Dict[str, Any] = response.data.get("meta", {})
+            transactions = [
+                await self._build_transaction_detail(data=transaction, fetch_customer=False)
+                for transaction in transactions_data
+            ]
+            meta = PaginationMeta(
+                current_page=meta_data.get("current_page"),
+                next_page=meta_data.get("next_page"),
+                prev_page=meta_data.get("prev_page"),
+                per_page=meta_data.get("per_page"),
+                total_pages=meta_data.get("total_pages"),
+                total_count=meta_data.get("total_count"),
             )
+            return TransactionSearchResponse(transactions=transactions, meta=meta)
+        
+        # If the response is not successful, raise a PaymentError
+        raise PaymentError(
+            message="Failed to search transactions",
+            status_code=response.status,
+            raw_response=response.data
+        )
     
     async def get_payment_link_for_transaction(self, transaction_id: str) -> PaymentLinkResponse:
         """
@@ -728,32 +726,32 @@ class FedapayAdapter(BaseAdapter):
             PaymentError: If the transaction cannot be found or if there is an error in the request.
         """
         
-        async with self.get_client() as client:
-            response = await client.post(
-                endpoint=self.ENDPOINTS["get_payment_link_for_transaction"].format(id=transaction_id),
-                headers=self.get_headers(authorization=True)
-            )
-                        
-            if response.status in range(200, 300):
-                data: Dict[str, Any] = response.data or {}
-                payment_link = data.get("url")
-                if not payment_link:
-                    raise PaymentError(
-                        message=f"No payment link found for transaction {transaction_id}",
-                        status_code=response.status,
-                        raw_response=response.data
-                    )
-                return PaymentLinkResponse(
-                    token=data.get("token"),
-                    url=payment_link,
+        client = self.get_client()
+        response = await client.post(
+            endpoint=self.ENDPOINTS["get_payment_link_for_transaction"].format(id=transaction_id),
+            headers=self.get_headers(authorization=True)
+        )
+                    
+        if response.status in range(200, 300):
+            data: Dict[str, Any] = response.data or {}
+            payment_link = data.get("url")
+            if not payment_link:
+                raise PaymentError(
+                    message=f"No payment link found for transaction {transaction_id}",
+                    status_code=response.status,
                     raw_response=response.data
                 )
-        
-            raise PaymentError(
-                message=f"Failed to get payment link for transaction {transaction_id}",
-                status_code=response.status,
+            return PaymentLinkResponse(
+                token=data.get("token"),
+                url=payment_link,
                 raw_response=response.data
             )
+        
+        raise PaymentError(
+            message=f"Failed to get payment link for transaction {transaction_id}",
+            status_code=response.status,
+            raw_response=response.data
+        )
        
     async def refund(
         self, 
@@ -780,30 +778,30 @@ class FedapayAdapter(BaseAdapter):
         Raises:
             PaymentError: If the transaction cannot be found or if there is an error in the request.
         """
-        async with self.get_client() as client:
-            response = await client.get(
-                endpoint=self.ENDPOINTS["get_transaction"].format(id=transaction_id),
-                headers=self.get_headers(authorization=True)
-            )
+        client = self.get_client()
+        response = await client.get(
+            endpoint=self.ENDPOINTS["get_transaction"].format(id=transaction_id),
+            headers=self.get_headers(authorization=True)
+        )
 
-            if response.status in range(200, 300):
-                transaction_data: Dict[str, Any] = response.data.get("v1/transaction", {})
-                status = self.get_normalize_status(transaction_data.get("status"))
+        if response.status in range(200, 300):
+            transaction_data: Dict[str, Any] = response.data.get("v1/transaction", {})
+            status = self.get_normalize_status(transaction_data.get("status"))
 
-                return TransactionStatusResponse(
-                    transaction_id=transaction_id,
-                    provider=self.provider_name(),
-                    status=status,
-                    amount = transaction_data.get("amount"),
-                    data=transaction_data
-                )
-
-            raise PaymentError(
-                message=f"Failed to check status for transaction {transaction_id}",
-                status_code=response.status,
-                raw_response=response.data
+            return TransactionStatusResponse(
+                transaction_id=transaction_id,
+                provider=self.provider_name(),
+                status=status,
+                amount = transaction_data.get("amount"),
+                data=transaction_data
             )
-            
+
+        raise PaymentError(
+            message=f"Failed to check status for transaction {transaction_id}",
+            status_code=response.status,
+            raw_response=response.data
+        )
+        
     async def cancel_transaction(self, transaction_id):
         """
         Cancel a transaction.
@@ -850,27 +848,27 @@ class FedapayAdapter(BaseAdapter):
             BalanceError: If the balance retrieval fails or if there is an error in the request.
         """
         
-        async with self.get_client() as client:
-            response = await client.get(
-                endpoint=self.ENDPOINTS["get_all_balances"],
-                headers=self.get_headers(authorization=True)
-            )
+        client = self.get_client()
+        response = await client.get(
+            endpoint=self.ENDPOINTS["get_all_balances"],
+            headers=self.get_headers(authorization=True)
+        )
+        
+        if response.status in range(200, 300):
+            balances_data: List[Dict[str, Any]] = response.data.get("v1/balances", [])
             
-            if response.status in range(200, 300):
-                balances_data: List[Dict[str, Any]] = response.data.get("v1/balances", [])
-                
-                balances = [
-                    self._build_balance_detail(balance)
-                    for balance in balances_data
-                ]
-                
-                return balances
+            balances = [
+                self._build_balance_detail(balance)
+                for balance in balances_data
+            ]
+            
+            return balances
         
-            raise BalanceError(
-                message="Failed to fetch all balances",
-                status_code=response.status,
-                raw_response=response.data
-            )
+        raise BalanceError(
+            message="Failed to fetch all balances",
+            status_code=response.status,
+            raw_response=response.data
+        )
 
     async def get_balance_detail(self, balance_id: int) -> BalanceDetail:
         """
@@ -883,22 +881,22 @@ class FedapayAdapter(BaseAdapter):
             BalanceError: If the balance cannot be found or if there is an error in the request.
         """
         
-        async with self.get_client() as client:
-            response = await client.get(
-                endpoint=self.ENDPOINTS["get_balance"].format(id=balance_id),
-                headers=self.get_headers(authorization=True)
-            )
+        client = self.get_client()
+        response = await client.get(
+            endpoint=self.ENDPOINTS["get_balance"].format(id=balance_id),
+            headers=self.get_headers(authorization=True)
+        )
+        
+        if response.status in range(200, 300):
+            balance_data: Dict[str, Any] = response.data.get("v1/balance", {})
             
-            if response.status in range(200, 300):
-                balance_data: Dict[str, Any] = response.data.get("v1/balance", {})
-                
-                return self._build_balance_detail(balance_data)
+            return self._build_balance_detail(balance_data)
         
-            raise BalanceError(
-                message=f"Failed to fetch balance for ID {id}",
-                status_code=response.status,
-                raw_response=response.data
-            )
+        raise BalanceError(
+            message=f"Failed to fetch balance for ID {id}",
+            status_code=response.status,
+            raw_response=response.data
+        )
 
     ############################
     ##### Currency Methods #####
@@ -915,31 +913,31 @@ class FedapayAdapter(BaseAdapter):
             CurrencyError: If the currency cannot be found or if there is an error in the request.
         """
         
-        async with self.get_client() as client:
-            response = await client.get(
-                endpoint=self.ENDPOINTS["get_currency"].format(id = currency_id),
-                headers=self.get_headers(authorization=True)
-            )
-            
-            if response.status in range(200, 300):
-                currency_data: Dict[str, Any] = response.data.get("v1/currency", {})
-
-                return CurrencyResponse(
-                    currency_id=currency_data.get("id"),
-                    name=currency_data.get("name"),
-                    provider=self.provider_name(),
-                    iso=currency_data.get("iso"),
-                    created_at=parser.parse(currency_data.get("created_at")),
-                    updated_at=parser.parse(currency_data.get("updated_at")),
-                    modes=currency_data.get("modes", []),
-                    raw_response=response.data,
-                )
+        client = self.get_client()
+        response = await client.get(
+            endpoint=self.ENDPOINTS["get_currency"].format(id = currency_id),
+            headers=self.get_headers(authorization=True)
+        )
         
-            raise CurrencyError(
-                message=f"Failed to fetch currency for ID {id}",
-                status_code=response.status,
-                raw_response=response.data
+        if response.status in range(200, 300):
+            currency_data: Dict[str, Any] = response.data.get("v1/currency", {})
+
+            return CurrencyResponse(
+                currency_id=currency_data.get("id"),
+                name=currency_data.get("name"),
+                provider=self.provider_name(),
+                iso=currency_data.get("iso"),
+                created_at=parser.parse(currency_data.get("created_at")),
+                updated_at=parser.parse(currency_data.get("updated_at")),
+                modes=currency_data.get("modes", []),
+                raw_response=response.data,
             )
+        
+        raise CurrencyError(
+            message=f"Failed to fetch currency for ID {id}",
+            status_code=response.status,
+            raw_response=response.data
+        )
     
     async def get_all_currencies(self) -> List[CurrencyResponse]:
         """
@@ -951,32 +949,32 @@ class FedapayAdapter(BaseAdapter):
             CurrencyError: If the currency retrieval fails or if there is an error in the request.
         """
         
-        async with self.get_client() as client:
-            response = await client.get(
-                endpoint=self.ENDPOINTS["get_all_currencies"],
-                headers=self.get_headers(authorization=True)
-            )
-                        
-            if response.status in range(200, 300):
-                currencies_data: List[Dict[str, Any]] = response.data.get("v1/currencies", [])
-                return [
-                    CurrencyResponse(
-                        currency_id=currency.get("id"),
-                        name=currency.get("name"),
-                        provider=self.provider_name(),
-                        iso=currency.get("iso"),
-                        created_at=parser.parse(currency.get("created_at")),
-                        updated_at=parser.parse(currency.get("updated_at")),
-                        modes=currency.get("modes", []),
-                        raw_response=response.data,
-                    ) for currency in currencies_data
-                ]
-        
-            raise CurrencyError(
-                message="Failed to fetch all currencies",
-                status_code=response.status,
-                raw_response=response.data
-            )
+        client = self.get_client()
+        response = await client.get(
+            endpoint=self.ENDPOINTS["get_all_currencies"],
+            headers=self.get_headers(authorization=True)
+        )
+                    
+        if response.status in range(200, 300):
+            currencies_data: List[Dict[str, Any]] = response.data.get("v1/currencies", [])
+            return [
+                CurrencyResponse(
+                    currency_id=currency.get("id"),
+                    name=currency.get("name"),
+                    provider=self.provider_name(),
+                    iso=currency.get("iso"),
+                    created_at=parser.parse(currency.get("created_at")),
+                    updated_at=parser.parse(currency.get("updated_at")),
+                    modes=currency.get("modes", []),
+                    raw_response=response.data,
+                ) for currency in currencies_data
+            ]
+        
+        raise CurrencyError(
+            message="Failed to fetch all currencies",
+            status_code=response.status,
+            raw_response=response.data
+        )
     
     ############################
     #####    Log Methods    ####
@@ -1029,34 +1027,34 @@ class FedapayAdapter(BaseAdapter):
             LogError: If the log retrieval fails or if there is an error in the request.
         """
         
-        async with self.get_client() as client:
-            response = await client.get(
-                endpoint=self.ENDPOINTS["get_all_logs"],
-                headers=self.get_headers(authorization=True)
-            )
-            
-            if response.status in range(200, 300):
-                logs_data: List[Dict[str, Any]] = response.data.get("v1/logs", [])                
-                meta_data: Dict[str, Any] = response.data.get("meta", {})
-                logs = [
-                    self._build_log_detail(log)
-                    for log in logs_data
-                ]
-                meta = PaginationMeta(
-                    current_page=meta_data.get("current_page"),
-                    next_page=meta_data.get("next_page"),
-                    prev_page=meta_data.get("prev_page"),
-                    per_page=meta_data.get("per_page"),
-                    total_pages=meta_data.get("total_pages"),
-                    total_count=meta_data.get("total_count"),
-                )
-                return LogsResponse(logs=logs, meta=meta)
+        client = self.get_client()
+        response = await client.get(
+            endpoint=self.ENDPOINTS["get_all_logs"],
+            headers=self.get_headers(authorization=True)
+        )
         
-            raise LogError(
-                message="Failed to fetch all logs",
-                status_code=response.status,
-                raw_response=response.data
+        if response.status in range(200, 300):
+            logs_data: List[Dict[str, Any]] = response.data.get("v1/logs", [])                
+            meta_data: Dict[str, Any] = response.data.get("meta", {})
+            logs = [
+                self._build_log_detail(log)
+                for log in logs_data
+            ]
+            meta = PaginationMeta(
+                current_page=meta_data.get("current_page"),
+                next_page=meta_data.get("next_page"),
+                prev_page=meta_data.get("prev_page"),
+                per_page=meta_data.get("per_page"),
+                total_pages=meta_data.get("total_pages"),
+                total_count=meta_data.get("total_count"),
             )
+            return LogsResponse(logs=logs, meta=meta)
+        
+        raise LogError(
+            message="Failed to fetch all logs",
+            status_code=response.status,
+            raw_response=response.data
+        )
     
     ############################
     ##### Webhook Methods   ####
@@ -1068,6 +1066,10 @@ class FedapayAdapter(BaseAdapter):
         if not secret:
             raise WebhookValidationError("Webhook secret is missing in configuration")
         return secret
+
+    def webhook_secrets(self) -> List[str]:
+        """Return the secret FedaPay signs webhooks with."""
+        return [self.get_webhook_secret()]
         
     def compare_signatures(
         self, 
@@ -1085,15 +1087,7 @@ class FedapayAdapter(BaseAdapter):
             AuthenticationError: If the webhook secret is not configured or if the signatures do not match.
         """
         
-        webhook_secret = self.get_webhook_secret()
-
-        computed_signature = hmac.new(
-            key=webhook_secret.encode('utf-8'),
-            msg=payload_str.encode('utf-8'),
-            digestmod=hashlib.sha256
-        ).hexdigest()
-
-        if not hmac.compare_digest(computed_signature, received_signature):
+        if not self.signature_verifier.verify(received_signature, payload_str):
             raise AuthenticationError("Invalid signature")
 
         return True
@@ -1111,6 +1105,26 @@ class FedapayAdapter(BaseAdapter):
             WebhookValidationError: If the payload or headers are invalid.
         """
                
+        timestamp, signature = self._parse_signature_header(headers)
+        guard = self.replay_guard
+        if guard is not None:
+            guard.check_timestamp(timestamp)
+
+        raw_payload_str = json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
+        signed_payload = f"{timestamp}.{raw_payload_str}"
+
+        self.compare_signatures(signed_payload, signature)
+        return True
+
+    def _parse_signature_header(self, headers: Dict[str, str]) -> Tuple[int, str]:
+        """
+        Extract the timestamp and signature of the X-Fedapay-Signature header.
+        Returns:
+            Tuple[int, str]: The timestamp (t) and the signature (s).
+        Raises:
+            AuthenticationError: If the header is missing.
+            WebhookValidationError: If the header is malformed.
+        """
         signature_header = headers.get("X-Fedapay-Signature")
         if not signature_header:
             raise AuthenticationError("Missing signature header")
@@ -1129,12 +1143,30 @@ class FedapayAdapter(BaseAdapter):
                 continue
 
         if timestamp is None or signature is None:
-            raise WebhookValidationError("Invalid signature format")
+            raise WebhookValidationError("Invalid signature format", code="invalid_signature")
 
-        raw_payload_str = json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
-        signed_payload = f"{timestamp}.{raw_payload_str}"
+        return timestamp, signature
+
+    def verify_webhook(self, raw_body: bytes, headers: Dict[str, str]) -> bool:
+        """
+        Check the signature of a FedaPay webhook over the raw body received.
+        Args:
+            raw_body (bytes): The body of the request, as received.
+            headers (Dict[str, str]): The headers received with the webhook.
+        Returns:
+            bool: True if the signature matches, False otherwise.
+        Raises:
+            AuthenticationError: If the signature header is missing.
+            WebhookValidationError: If the signature header is malformed, or
+                the webhook is stale (with webhook_tolerance set).
+        """
+        timestamp, signature = self._parse_signature_header(headers)
+
+        guard = self.replay_guard
+        if guard is not None:
+            guard.check_timestamp(timestamp)
 
-        return self.compare_signatures(signed_payload, signature)
+        return self.signature_verifier.verify(signature, f"{timestamp}.", raw_body)
 
     async def parse_webhook(self, payload: Dict[str, Any], headers: Dict[str, str]) -> WebhookEvent:
         """
@@ -1146,12 +1178,28 @@ class FedapayAdapter(BaseAdapter):
             WebhookEvent: An object representing the parsed webhook event.
         Raises:
             AuthenticationError: If the webhook signature is invalid or if required headers are missing.
+            WebhookValidationError: If the webhook is stale or already accepted
+                (with webhook_tolerance set).
         """        
         if not self.validate_webhook(payload, headers):
             raise AuthenticationError(
                 message="Invalid webhook signature",
             )
-        
+
+        return self.build_webhook_event(payload, headers)
+
+    def build_webhook_event(self, payload: Dict[str, Any], headers: Dict[str, str]) -> WebhookEvent:
+        """
+        Build the WebhookEvent of an authenticated FedaPay webhook.
+        Args:
+            payload (Dict[str, Any]): The webhook payload received from FedaPay.
+            headers (Dict[str, str]): The headers received with the webhook.
+        Returns:
+            WebhookEvent: An object representing the webhook event.
+        Raises:
+            WebhookValidationError: If the webhook was already accepted
+                (with webhook_tolerance set).
+        """
         event_type = payload.get("name")  # e.g. "transaction.created"
         entity: Dict[str, Any] = payload.get("entity", {})
 
@@ -1178,18 +1226,24 @@ class FedapayAdapter(BaseAdapter):
         if entity.get("metadata"):
             metadata["fedapay_metadata"] = entity["metadata"]
 
-        return WebhookEvent(
+        event = WebhookEvent(
             event_type=event_type,
             provider=self.provider_name(),
             transaction_id=str(entity.get("id")),
             status=normalized_status,
             amount=float(entity.get("amount", 0)),
             currency=Currency(currency_iso),
-            created_at=parser.parse(entity.get("created_at")),
+            created_at=parse_datetime(entity.get("created_at")),
             raw_data=payload,
             metadata=metadata,
         )
 
+        # Only accepted deliveries are recorded: validating one has no side effect
+        guard = self.replay_guard
+        if guard is not None:
+            guard.record(*self._parse_signature_header(headers))
+        return event
+
     def _build_webhook_detail(
         self, 
         data: Dict[str, Any], 
@@ -1235,34 +1289,34 @@ class FedapayAdapter(BaseAdapter):
             WebhookError: If the webhook retrieval fails or if there is an error in the request.
         """
         
-        async with self.get_client() as client:
-            response = await client.get(
-                endpoint=self.ENDPOINTS["get_all_webhooks"],
-                headers=self.get_headers(authorization=True)
-            )
-            
-            if response.status in range(200, 300):
-                webhooks_data: Dict[str, Any] = response.data.get("v1/webhooks", {})
-                meta_data: Dict[str, Any] = response.data.get("meta", {})
-                webhooks = [
-                    self._build_webhook_detail(webhook, response.data)
-                    for webhook in webhooks_data
-                ]
-                meta = PaginationMeta(
-                    current_page=meta_data.get("current_page"),
-                    next_page=meta_data.get("next_page"),
-                    prev_page=meta_data.get("prev_page"),
-                    per_page=meta_data.get("per_page"),
-                    total_pages=meta_data.get("total_pages"),
-                    total_count=meta_data.get("total_count"),
-                )
-                return WebhooksResponse(webhooks=webhooks, meta=meta)
+        client = self.get_client()
+        response = await client.get(
+            endpoint=self.ENDPOINTS["get_all_webhooks"],
+            headers=self.get_headers(authorization=True)
+        )
         
-            raise WebhookError(
-                message="Failed to fetch all webhooks",
-                status_code=response.status,
-                raw_response=response.data
+        if response.status in range(200, 300):
+            webhooks_data: Dict[str, Any] = response.data.get("v1/webhooks", {})
+            meta_data: Dict[str, Any] = response.data.get("meta", {})
+            webhooks = [
+                self._build_webhook_detail(webhook, response.data)
+                for webhook in webhooks_data
+            ]
+            meta = PaginationMeta(
+                current_page=meta_data.get("current_page"),
+                next_page=meta_data.get("next_page"),
+                prev_page=meta_data.get("prev_page"),
+                per_page=meta_data.get("per_page"),
+                total_pages=meta_data.get("total_pages"),
+                total_count=meta_data.get("total_count"),
             )
+            return WebhooksResponse(webhooks=webhooks, meta=meta)
+        
+        raise WebhookError(
+            message="Failed to fetch all webhooks",
+            status_code=response.status,
+            raw_response=response.data
+        )
     
     async def get_webhook_detail(self, webhook_id: str) -> WebhookDetail:
         """
@@ -1275,18 +1329,18 @@ class FedapayAdapter(BaseAdapter):
             WebhookError: If the webhook cannot be found or if there is an error in the request.
         """
         
-        async with self.get_client() as client:
-            response = await client.get(
-                endpoint=self.ENDPOINTS["get_webhook"].format(id=webhook_id),
-                headers=self.get_headers(authorization=True)
-            )
-            
-            if response.status in range(200, 300):
-                webhook_data: Dict[str, Any] = response.data.get("v1/webhook", {})
-                return self._build_webhook_detail(webhook_data, response.data)
+        client = self.get_client()
+        response = await client.get(
+            endpoint=self.ENDPOINTS["get_webhook"].format(id=webhook_id),
+            headers=self.get_headers(authorization=True)
+        )
         
-            raise WebhookError(
-                message=f"Failed to fetch webhook with ID {webhook_id}",
-                status_code=response.status,
-                raw_response=response.data
-            )
+        if response.status in range(200, 300):
+            webhook_data: Dict[str, Any] = response.data.get("v1/webhook", {})
+            return self._build_webhook_detail(webhook_data, response.data)
+        
+        raise WebhookError(
+            message=f"Failed to fetch webhook with ID {webhook_id}",
+            status_code=response.status,
+            raw_response=response.data
+        )
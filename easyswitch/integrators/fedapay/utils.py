@@ -1,6 +1,9 @@
 """
 Utility module for mapping FedaPay currency IDs to ISO codes.
 """
+from datetime import datetime
+
+from dateutil import parser
 
 
 class FedapayCurrencyMapper:
@@ -44,5 +47,21 @@ class FedapayCurrencyMapper:
         cls._id_to_iso[currency_id] = iso
 
 
+def parse_datetime(value: str) -> datetime:
+    """
+    Parse a FedaPay timestamp.
+    FedaPay sends ISO 8601 timestamps, which the standard library parses
+    much faster than dateutil; dateutil remains the fallback.
+    Args:
+        value (str): The timestamp to parse.
+    Returns:
+        datetime: The parsed timestamp.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return parser.parse(value)
+
+
 if __name__ == "__main__":
     print(FedapayCurrencyMapper.get_iso(1))
\ No newline at end of file
@@ -18,6 +18,7 @@ from easyswitch.exceptions import (APIError, AuthenticationError,
 from easyswitch.types import (Currency, CustomerInfo, PaymentResponse,
                               Provider, TransactionStatus, TransactionType)
 from easyswitch.utils.http import HTTPClient
+from easyswitch.utils.tokens import AccessToken
 
 
 class MTNIntegrator(BaseAdapter):
@@ -36,10 +37,6 @@ class MTNIntegrator(BaseAdapter):
         self.app_id = config.mtn_app_id
         self.callback_url = config.mtn_callback_url
         
-        # Token d'authentification et sa date d'expiration
-        self._auth_token = None
-        self._token_expires_at = None
-        
         # Initialiser le client HTTP
         self.http_client = HTTPClient(
             base_url=config.get_api_url("mtn"),
@@ -58,37 +55,38 @@ class MTNIntegrator(BaseAdapter):
         Returns:
             str: Token d'authentification valide
         """
-        now = datetime.now()
-        
-        # If token doesn't exist or is expired, request a new one
-        if not self._auth_token or not self._token_expires_at or self._token_expires_at <= now:
-            try:
-                # Generate ephemeral key pair for authentication
-                subscription_key = self.api_key
-                
-                # Obtenir le token d'authentification
-                response = await self.http_client.post(
-                    "collection/token/",
-                    json_data={
-                        "grant_type": "client_credentials"
-                    },
-                    headers={
-                        "Authorization": f"Basic {base64.b64encode(f'{self.app_id}:{self.api_secret}'.encode()).decode()}"
-                    }
-                )
-                
-                if "access_token" not in response:
-                    raise AuthenticationError("MTN authentication token not received")
-                
-                self._auth_token = response["access_token"]
-                # Token valid for 1h (3600 sec)
-                expires_in = int(response.get("expires_in", 3600))
-                self._token_expires_at = now + timedelta(seconds=expires_in - 60)  # 60 sec margin
-                
-            except Exception as e:
-                raise AuthenticationError(f"MTN authentication error: {str(e)}")
-        
-        return self._auth_token
+        return await self.get_token_manager().get_token()
+
+    async def fetch_token(self) -> AccessToken:
+        """
+        Request a new MTN authentication token.
+
+        Returns:
+            AccessToken: The token, valid for 1h unless MTN says otherwise
+        """
+        try:
+            # Obtenir le token d'authentification
+            response = await self.http_client.post(
+                "collection/token/",
+                json_data={
+                    "grant_type": "client_credentials"
+                },
+                headers={
+                    "Authorization": f"Basic {base64.b64encode(f'{self.app_id}:{self.api_secret}'.encode()).decode()}"
+                }
+            )
+            
+            if "access_token" not in response:
+                raise AuthenticationError("MTN authentication token not received")
+            
+            # Token valid for 1h (3600 sec)
+            return AccessToken.from_lifetime(
+                response["access_token"],
+                int(response.get("expires_in", 3600))
+            )
+            
+        except Exception as e:
+            raise AuthenticationError(f"MTN authentication error: {str(e)}")
     
     async def send_payment(
         self,
@@ -2,7 +2,6 @@
 EasySwitch - Paystack Integrator
 """
 
-import hmac
 import hashlib
 import json
 from typing import ClassVar, List, Dict, Optional, Any
@@ -40,6 +39,8 @@ class PaystackAdapter(BaseAdapter):
         Currency.USD: 10_000_000,
     }
 
+    WEBHOOK_DIGEST = hashlib.sha512
+
     def validate_credentials(self) -> bool:
         """Validate the credentials for Paystack."""
         return bool(self.config.api_key)
@@ -66,19 +67,27 @@ class PaystackAdapter(BaseAdapter):
         }
         return mapping.get(status.lower(), TransactionStatus.UNKNOWN)
 
+    def webhook_secrets(self) -> List[str]:
+        """Paystack signs webhooks with the secret key."""
+        return [getattr(self.config, "api_key", None)]
+
         # validate_webhook expects raw_body: bytes
     def validate_webhook(self, raw_body: bytes, headers: Dict[str, str]) -> bool:
         """Validate the authenticity of a Paystack webhook."""
         signature = headers.get("x-paystack-signature")
-        secret_key = getattr(self.config, "api_key", None)
-        if not signature or not secret_key:
-            return False
-
-        computed_sig = hmac.new(secret_key.encode("utf-8"), msg=raw_body, digestmod=hashlib.sha512).hexdigest()
-        return hmac.compare_digest(computed_sig, signature)
+        return self.signature_verifier.verify(signature, raw_body)
     
+    def verify_webhook(self, raw_body: bytes, headers: Dict[str, str]) -> bool:
+        """Paystack signs the raw body, so check it as received."""
+        return self.validate_webhook(raw_body, headers)
+
     def parse_webhook(self, payload: Dict[str, Any], headers: Dict[str, str]) -> WebhookEvent:
-        """Parse and validate a Paystack webhook."""
+        """
+        Parse and validate a Paystack webhook.
+        The signature is checked against a re-serialization of ``payload``,
+        which only matches if Paystack sent it in that exact form: prefer
+        ``handle_webhook`` with the raw body.
+        """
 
         # Convert payload to bytes for validation
         raw_body = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
@@ -86,6 +95,11 @@ class PaystackAdapter(BaseAdapter):
         if not self.validate_webhook(raw_body, headers):
             raise PaymentError("Invalid webhook signature", raw_response=payload)
 
+        return self.build_webhook_event(payload, headers)
+
+    def build_webhook_event(self, payload: Dict[str, Any], headers: Dict[str, str]) -> WebhookEvent:
+        """Build the event of an authenticated Paystack webhook."""
+
         data = payload.get("data", {})
         event_type = payload.get("event", "unknown_event")
         transaction_id = data.get("reference")
@@ -126,59 +140,59 @@ class PaystackAdapter(BaseAdapter):
         """Send a payment initialization request to Paystack."""
         payload = self.format_transaction(transaction)
 
-        async with self.get_client() as client:
-            response = await client.post(
-                "/transaction/initialize",
-                json=payload,
-                headers=self.get_headers()
-            )
-
-            data = response.json() if hasattr(response, "json") else response.data
-            if response.status in range(200, 300) and data.get("status"):
-                init_data = data.get("data", {})
-                return PaymentResponse(
-                    transaction_id=transaction.transaction_id,
-                    reference=init_data.get("reference"),
-                    provider=self.provider_name(),
-                    status="pending",
-                    amount=transaction.amount,
-                    currency=transaction.currency,
-                    payment_link=init_data.get("authorization_url"),
-                    transaction_token=init_data.get("access_code"),
-                    metadata=init_data,
-                    raw_response=data,
-                )
+        client = self.get_client()
+        response = await client.post(
+            "/transaction/initialize",
+            json=payload,
+            headers=self.get_headers()
+        )
 
-            raise PaymentError(
-                message=f"Payment request failed with status {response.status}",
-                status_code=response.status,
+        data = response.json() if hasattr(response, "json") else response.data
+        if response.status in range(200, 300) and data.get("status"):
+            init_data = data.get("data", {})
+            return PaymentResponse(
+                transaction_id=transaction.transaction_id,
+                reference=init_data.get("reference"),
+                provider=self.provider_name(),
+                status="pending",
+                amount=transaction.amount,
+                currency=transaction.currency,
+                payment_link=init_data.get("authorization_url"),
+                transaction_token=init_data.get("access_code"),
+                metadata=init_data,
                 raw_response=data,
             )
 
+        raise PaymentError(
+            message=f"Payment request failed with status {response.status}",
+            status_code=response.status,
+            raw_response=data,
+        )
+
     async def check_status(self, reference: str) -> TransactionStatusResponse:
         """Check the status of a Paystack transaction by reference."""
-        async with self.get_client() as client:
-            response = await client.get(
-                f"/transaction/verify/{reference}",
-                headers=self.get_headers()
-            )
-
-            data = response.json() if hasattr(response, "json") else response.data
-            if not data.get("status"):
-                raise PaymentError(
-                    message="Failed to verify Paystack transaction",
-                    raw_response=data
-                )
+        client = self.get_client()
+        response = await client.get(
+            f"/transaction/verify/{reference}",
+            headers=self.get_headers()
+        )
 
-            tx = data.get("data", {})
-            return TransactionStatusResponse(
-                transaction_id=tx.get("id"),
-                provider=self.provider_name(),
-                status=self.get_normalize_status(tx.get("status")),
-                amount=(tx.get("amount") or 0) / 100,
-                data=tx,
+        data = response.json() if hasattr(response, "json") else response.data
+        if not data.get("status"):
+            raise PaymentError(
+                message="Failed to verify Paystack transaction",
+                raw_response=data
             )
 
+        tx = data.get("data", {})
+        return TransactionStatusResponse(
+            transaction_id=tx.get("id"),
+            provider=self.provider_name(),
+            status=self.get_normalize_status(tx.get("status")),
+            amount=(tx.get("amount") or 0) / 100,
+            data=tx,
+        )
+
     async def cancel_transaction(self, transaction_id: str) -> None:
         """Paystack does not support transaction cancellation.
             Use refund() for post-payment reversals.
@@ -189,68 +203,68 @@ class PaystackAdapter(BaseAdapter):
 
     async def refund(self, transaction_id: str, amount: Optional[float] = None) -> PaymentResponse:
         """Refund a Paystack transaction."""
-        async with self.get_client() as client:
-            payload = {"transaction": transaction_id}
-            if amount:
-                payload["amount"] = int(amount * 100)  
-
-            response = await client.post("/refund", json=payload, headers=self.get_headers())
-
-            data = response.json() if hasattr(response, "json") else response.data
-            if response.status in range(200, 300) and data.get("status"):
-                refund_data = data.get("data", {})
-                return PaymentResponse(
-                    transaction_id=transaction_id,
-                    reference=refund_data.get("transaction", {}).get("reference", f"refund-{transaction_id}"),
-                    provider=self.provider_name(),
-                    status=self.get_normalize_status(refund_data.get("status")),
-                    amount=(refund_data.get("amount") or (amount or 0)) / 100,
-                    currency=refund_data.get("currency", "NGN"),
-                    metadata=refund_data,
-                    raw_response=data,
-                )
+        client = self.get_client()
+        payload = {"transaction": transaction_id}
+        if amount:
+            payload["amount"] = int(amount * 100)  
 
-            raise PaymentError(
-                message=f"Refund failed with status {response.status}",
-                status_code=response.status,
+        response = await client.post("/refund", json=payload, headers=self.get_headers())
+
+        data = response.json() if hasattr(response, "json") else response.data
+        if response.status in range(200, 300) and data.get("status"):
+            refund_data = data.get("data", {})
+            return PaymentResponse(
+                transaction_id=transaction_id,
+                reference=refund_data.get("transaction", {}).get("reference", f"refund-{transaction_id}"),
+                provider=self.provider_name(),
+                status=self.get_normalize_status(refund_data.get("status")),
+                amount=(refund_data.get("amount") or (amount or 0)) / 100,
+                currency=refund_data.get("currency", "NGN"),
+                metadata=refund_data,
                 raw_response=data,
             )
+
+        raise PaymentError(
+            message=f"Refund failed with status {response.status}",
+            status_code=response.status,
+            raw_response=data,
+        )
         
     async def get_transaction_detail(self, transaction_id: str) -> TransactionDetail:
         """Retrieve transaction details from Paystack by transaction ID."""
-        async with self.get_client() as client:
-            response = await client.get(f"/transaction/{transaction_id}", headers=self.get_headers())
-
-            data = response.json() if hasattr(response, "json") else response.data
-            if response.status in range(200, 300) and data.get("status"):
-                tx = data.get("data", {})
-
-                customer = CustomerInfo(
-                    email=tx.get("customer", {}).get("email"),
-                    phone_number=tx.get("customer", {}).get("phone"),
-                    first_name=tx.get("customer", {}).get("first_name"),
-                    last_name=tx.get("customer", {}).get("last_name"),
-                    metadata=tx.get("customer", {}).get("metadata", {}),
-                )
-
-                return TransactionDetail(
-                    transaction_id=str(tx.get("id", transaction_id)),
-                    provider=self.provider_name(),
-                    amount=(tx.get("amount") or 0) / 100,
-                    currency=tx.get("currency", "NGN"),
-                    status=self.get_normalize_status(tx.get("status")),
-                    reference=tx.get("reference"),
-                    callback_url=tx.get("callback_url"),
-                    created_at=datetime.fromtimestamp(tx.get("createdAt") / 1000) if tx.get("createdAt") else datetime.now(),
-                    updated_at=datetime.fromtimestamp(tx.get("updatedAt") / 1000) if tx.get("updatedAt") else None,
-                    completed_at=datetime.fromtimestamp(tx.get("paidAt") / 1000) if tx.get("paidAt") else None,
-                    customer=customer,
-                    metadata=tx.get("metadata", {}),
-                    raw_data=tx
-                )
+        client = self.get_client()
+        response = await client.get(f"/transaction/{transaction_id}", headers=self.get_headers())
 
-            raise PaymentError(
-                message=f"Failed to retrieve transaction {transaction_id}",
-                status_code=response.status,
-                raw_response=data
+        data = response.json() if hasattr(response, "json") else response.data
+        if response.status in range(200, 300) and data.get("status"):
+            tx = data.get("data", {})
+
+            customer = CustomerInfo(
+                email=tx.get("customer", {}).get("email"),
+                phone_number=tx.get("customer", {}).get("phone"),
+                first_name=tx.get("customer", {}).get("first_name"),
+                last_name=tx.get("customer", {}).get("last_name"),
+                metadata=tx.get("customer", {}).get("metadata", {}),
+            )
+
+            return TransactionDetail(
+                transaction_id=str(tx.get("id", transaction_id)),
+                provider=self.provider_name(),
+                amount=(tx.get("amount") or 0) / 100,
+                currency=tx.get("currency", "NGN"),
+                status=self.get_normalize_status(tx.get("status")),
+                reference=tx.get("reference"),
+                callback_url=tx.get("callback_url"),
+                created_at=datetime.fromtimestamp(tx.get("createdAt") / 1000) if tx.get("createdAt") else datetime.now(),
+                updated_at=datetime.fromtimestamp(tx.get("updatedAt") / 1000) if tx.get("updatedAt") else None,
+                completed_at=datetime.fromtimestamp(tx.get("paidAt") / 1000) if tx.get("paidAt") else None,
+                customer=customer,
+                metadata=tx.get("metadata", {}),
+                raw_data=tx
             )
+
+        raise PaymentError(
+            message=f"Failed to retrieve transaction {transaction_id}",
+            status_code=response.status,
+            raw_response=data
+        )
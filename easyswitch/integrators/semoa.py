@@ -14,6 +14,7 @@ from easyswitch.types import (Currency, CustomerInfo, PaymentResponse,
                               Provider, TransactionDetail, TransactionStatus,
                               TransactionType)
 from easyswitch.utils.http import HTTPClient
+from easyswitch.utils.tokens import AccessToken
 
 
 ####
@@ -69,39 +70,61 @@ class SemoaAdapter(BaseAdapter):
         }
     
     def get_headers(self, authorization=False):
-        """Get the headers for Semoa."""
+        """
+        Get the headers for Semoa.
+        ``authorization`` is either the access token to send, or True for
+        the current token of the token manager.
+        """
 
         headers = {
             'Content-Type':'application/json'
         }
         if authorization:
-            headers['Authorization'] = f'Bearer {self.config.token}'
+            token = authorization if isinstance(authorization, str) else self._current_token()
+            headers['Authorization'] = f'Bearer {token}'
         return headers
-    
+
+    def _current_token(self) -> str:
+        """Get the valid access token held by the token manager."""
+
+        token = self.get_token_manager().token
+        if token is None or token.expires_in <= 0:
+            raise AuthenticationError(
+                message = "No valid Semoa access token, call authenticate() first"
+            )
+        return token.value
+
     async def authenticate(self):
         """Authenticate Our App and get Semoa AUTH_TOKEN."""
+        await self.get_token_manager().refresh()
+        return True
+    
+    async def fetch_token(self) -> AccessToken:
+        """Request a new Semoa AUTH_TOKEN."""
 
         # Send Authentication POST request to Semoa API
-        async with self.get_client() as client:
-            response = await client.post(
-                endpoint = "auth",
-                json_data = self.get_credentials(),
-                headers = {
-                    "Content-Type": "application/json"
-                }
+        client = self.get_client()
+        response = await client.post(
+            endpoint = "auth",
+            json_data = self.get_credentials(),
+            headers = {
+                "Content-Type": "application/json"
+            }
+        )
+        # Check if the response is successful
+        if response.status == 200:
+            # Extract the token from the response
+            return AccessToken.from_lifetime(
+                response.data.get("access_token"),
+                response.data.get("expires_in", 3600)
             )
-            # Check if the response is successful
-            if response.status == 200:
-                # Extract the token from the response
-                self.config.token = response.data.get("access_token")
-                return True
-            else:
-                raise AuthenticationError(
-                    message="Authentication failed",
-                    status_code = response.status,
-                    raw_response = response.data
-                )
-            
+        else:
+            raise AuthenticationError(
+                message="Authentication failed",
+                status_code = response.status,
+                raw_response = response.data
+            )
+        
     def format_transaction(self, data):
         """
         Format the standard transaction data to Semoa specific Order format.
@@ -136,13 +159,15 @@ class SemoaAdapter(BaseAdapter):
         order = self.format_transaction(transaction)
 
         # Then send the payment request
-        response = await self.client.post(
-            endpoint = "orders",
-            json_data = order,
-            headers = self.get_headers(authorization=True)
+        response = await self.get_token_manager().call(
+            lambda token: self.client.post(
+                endpoint = "orders",
+                json_data = order,
+                headers = self.get_headers(authorization=token)
+            )
         )
         # Check if the response is successful
-        if response.status_code in range(200, 300):
+        if response.status in range(200, 300):
             # Extract the payment link from the response
             payment_link = response.data.get("bill_url")
             transaction_id = response.data.get("orderNum")
@@ -167,7 +192,7 @@ class SemoaAdapter(BaseAdapter):
         # If the response is not successful, raise an API error
         raise PaymentError(
             message="Payment request failed",
-            status_code = response.status_code,
+            status_code = response.status,
             raw_response = response.data
         )
     
@@ -180,19 +205,21 @@ class SemoaAdapter(BaseAdapter):
             TransactionStatus: The status of the transaction.
         """
         # Send a GET request to check the status of the transaction
-        response = self.client.get(
-            endpoint = f"orders/{transaction_id}",
-            headers = self.get_headers(authorization=True)
+        response = await self.get_token_manager().call(
+            lambda token: self.client.get(
+                endpoint = f"orders/{transaction_id}",
+                headers = self.get_headers(authorization=token)
+            )
         )
         # Check if the response is successful
-        if response.status_code in range(200, 300):
+        if response.status in range(200, 300):
             # Extract the status from the response
             status = response.data.get("status")
             return TransactionStatus(status)
         # If the response is not successful, raise a TransactionNotFoundError
         raise TransactionNotFoundError(
             message="Transaction not found",
-            status_code = response.status_code,
+            status_code = response.status,
             raw_response = response.data
         )
     
@@ -205,9 +232,11 @@ class SemoaAdapter(BaseAdapter):
             bool: True if the transaction was cancelled, False otherwise.
         """
         # Send a DELETE request to cancel the transaction
-        response = self.client.delete(
-            endpoint = f"orders/{transaction_id}",
-            headers = self.get_headers(authorization=True)
+        response = await self.get_token_manager().call(
+            lambda token: self.client.delete(
+                endpoint = f"orders/{transaction_id}",
+                headers = self.get_headers(authorization=token)
+            )
         )
         # Check if the response is successful
-        return super().send_payment(transaction)
\ No newline at end of file
+        return response.status in range(200, 300)
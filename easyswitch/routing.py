@@ -0,0 +1,174 @@
+"""
+EasySwitch - Provider routing and failover
+"""
+import random
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
+
+import aiohttp
+
+from easyswitch.adapters.base import BaseAdapter
+from easyswitch.exceptions import CircuitOpenError, NetworkError, RateLimitError
+from easyswitch.types import Provider, TransactionDetail
+from easyswitch.utils import parse_phone
+from easyswitch.utils.circuit import CircuitState
+
+
+# Provider argument asking the client to route a payment
+AUTO_ROUTE = "auto"
+
+
+####
+##      PROVIDER HEALTH
+#####
+@dataclass
+class ProviderHealth:
+    """
+    Recent health of a provider.
+    Error rate and latency are exponentially weighted moving averages, so
+    recent calls weigh more than old ones.
+    """
+
+    error_rate: float = 0.0
+    latency: float = 0.0
+    """ Average call latency (in seconds). """
+
+    calls: int = 0
+
+    def record(self, success: bool, latency: float, alpha: float) -> None:
+        """Fold the outcome of a call into the averages."""
+
+        if self.calls == 0:
+            self.error_rate = 0.0 if success else 1.0
+            self.latency = latency
+        else:
+            self.error_rate += alpha * ((0.0 if success else 1.0) - self.error_rate)
+            self.latency += alpha * (latency - self.latency)
+        self.calls += 1
+
+
+####
+##      ROUTER
+#####
+class Router:
+    """
+    Picks the providers able to process a transaction, best first.
+
+    A provider is eligible when it supports the transaction currency,
+    amount and customer country (``SUPPORTED_CURRENCIES``, ``MIN_AMOUNT``,
+    ``MAX_AMOUNT`` and ``SUPPORTED_COUNTRIES`` of its adapter). Eligible
+    providers are ordered by a weighted random draw, their configured
+    weight being lowered by their recent error rate and latency.
+    Providers whose payment circuit is open come last.
+
+    Adapters are fetched through ``get_integrator`` so that they are only
+    built once a transaction is actually routed.
+    """
+
+    def __init__(
+        self,
+        providers: Iterable[Provider],
+        get_integrator: Callable[[Provider], BaseAdapter],
+        weights: Optional[Mapping[Provider, float]] = None,
+        alpha: float = 0.2,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            providers: Enabled providers
+            get_integrator: Returns the adapter of a provider
+            weights: Routing weight of each provider (1.0 by default)
+            alpha: Smoothing factor of the health averages
+            rng: Random generator (overridable for tests)
+        """
+        self.providers = list(providers)
+        self.get_integrator = get_integrator
+        self.weights = dict(weights or {})
+        self.alpha = alpha
+        self.health: Dict[Provider, ProviderHealth] = {}
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def transaction_country(transaction: TransactionDetail) -> Optional[str]:
+        """Return the ISO alpha-2 country of the transaction's customer."""
+
+        customer = transaction.customer
+        if customer is None:
+            return None
+        if customer.phone_number:
+            country = parse_phone(customer.phone_number)['country_alpha2']
+            if country and country != 'ZZ':
+                return country
+        return customer.country.upper() if customer.country else None
+
+    def eligible(self, transaction: TransactionDetail) -> List[Provider]:
+        """List the providers supporting the transaction."""
+
+        country = self.transaction_country(transaction)
+        return [
+            provider for provider in self.providers
+            if self.get_integrator(provider).supports(transaction, country)
+        ]
+
+    def score(self, provider: Provider) -> float:
+        """Routing weight of a provider, adjusted by its recent health."""
+
+        weight = self.weights.get(provider, 1.0)
+        health = self.health.get(provider)
+        if health is None or not health.calls:
+            return weight
+        # Never drop to zero so that a recovered provider gets traffic back
+        return weight * max(0.05, 1.0 - health.error_rate) / (1.0 + health.latency)
+
+    def is_tripped(self, provider: Provider) -> bool:
+        """Whether the provider's payment circuit is open."""
+
+        states = self.get_integrator(provider).circuit_states()
+        snapshot = states.get('payment')
+        if snapshot is None:
+            return any(s.state is CircuitState.OPEN for s in states.values())
+        return snapshot.state is CircuitState.OPEN
+
+    def route(self, transaction: TransactionDetail) -> List[Provider]:
+        """
+        Order the eligible providers for a transaction, best first.
+
+        Returns:
+            List[Provider]: Providers to try in order (may be empty)
+        """
+        keyed = []
+        for provider in self.eligible(transaction):
+            score = self.score(provider)
+            if score <= 0:
+                continue        # Disabled by configuration
+            # Weighted sampling without replacement (Efraimidis-Spirakis)
+            key = self._rng.random() ** (1.0 / score)
+            keyed.append((self.is_tripped(provider), -key, provider))
+
+        return [provider for _, _, provider in sorted(keyed, key=lambda k: k[:2])]
+
+    def record(self, provider: Provider, success: bool, latency: float) -> None:
+        """Record the outcome of a call to a provider."""
+
+        with self._lock:
+            self.health.setdefault(provider, ProviderHealth()).record(
+                success, latency, self.alpha
+            )
+
+    @staticmethod
+    def can_fail_over(error: BaseException) -> bool:
+        """
+        Tell whether a failed payment can be sent to another provider.
+        Only errors guaranteeing the provider did not process the payment
+        qualify, otherwise the customer could be charged twice.
+        """
+        if isinstance(error, (CircuitOpenError, RateLimitError)):
+            return True
+        return (
+            isinstance(error, NetworkError) and
+            isinstance(error.__cause__, aiohttp.ClientConnectorError)
+        )
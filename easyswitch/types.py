@@ -2,10 +2,65 @@
 EasySwitch - Shared Types and Data Structures.
 """
 import os
-from dataclasses import dataclass, field
+import sys
+from dataclasses import Field, dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+
+T = TypeVar("T")
+
+
+####
+##      COMPACT DATACLASSES
+#####
+class _LazyDict:
+    """
+    Dict field of a slotted dataclass, allocated on first access.
+    Wraps the slot of the field, which holds None until then.
+    """
+
+    def __init__(self, slot: Any):
+        self.slot = slot
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        value = self.slot.__get__(obj, owner)
+        if value is None:
+            value = {}
+            self.slot.__set__(obj, value)
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        self.slot.__set__(obj, value)
+
+    def __delete__(self, obj: Any) -> None:
+        self.slot.__delete__(obj)
+
+
+def compact_dataclass(cls: Type[T]) -> Type[T]:
+    """
+    Make a dataclass whose instances take little memory, for models held
+    in large numbers. On Python 3.10+ instances have ``__slots__`` instead
+    of a ``__dict__``, and their ``default_factory=dict`` fields are only
+    allocated when first accessed (most stay unused). Older versions get
+    a plain dataclass.
+    """
+    if sys.version_info < (3, 10):
+        return dataclass(cls)
+
+    lazy = [
+        name for name, value in vars(cls).items()
+        if isinstance(value, Field) and value.default_factory is dict
+    ]
+    for name in lazy:
+        setattr(cls, name, field(default = None))
+    cls = dataclass(cls, slots = True)
+    for name in lazy:
+        setattr(cls, name, _LazyDict(vars(cls)[name]))
+    return cls
 
 
 
@@ -20,6 +75,7 @@ class Provider(str, Enum):
     CINETPAY = 'CINETPAY'
     PAYGATE = 'PAYGATE'
     FEDAPAY = 'FEDAPAY'
+    PAYSTACK = 'PAYSTACK'
 
 
 ####
@@ -90,7 +146,7 @@ class TransactionStatus(str, Enum):
 ####
 ##      TRANSACTION STATUS RESPONSE
 #####
-@dataclass
+@compact_dataclass
 class TransactionStatusResponse:
     """Standardized Transaction status response structure."""
 
@@ -104,7 +160,7 @@ class TransactionStatusResponse:
 ####
 ##      CUSTOMER INFORMATION
 #####
-@dataclass
+@compact_dataclass
 class CustomerInfo:
     """Customer informations."""
 
@@ -125,7 +181,7 @@ class CustomerInfo:
 ####
 ##      PAYMENT RESPONSE
 #####
-@dataclass
+@compact_dataclass
 class PaymentResponse:
     """Standardized Payment response structure."""
 
@@ -170,7 +226,7 @@ class PaymentResponse:
 ####
 ##      TRANSACTION DETAIL
 #####
-@dataclass
+@compact_dataclass
 class TransactionDetail:
     """Standardized Transaction detail structure."""
 
@@ -195,7 +251,7 @@ class TransactionDetail:
 ####
 ##      WEBHOOK EVENT
 #####
-@dataclass
+@compact_dataclass
 class WebhookEvent:
     """Standardized webhook event structure."""
 
@@ -211,6 +267,91 @@ class WebhookEvent:
     context: Dict[str,Any] = field(default_factory = dict)
 
 
+####
+##      BATCH ITEM RESULT
+#####
+@dataclass
+class BatchItemResult:
+    """Outcome of one item of a bulk operation."""
+
+    index: int
+    transaction_id: Optional[str] = None
+    provider: Optional[Provider] = None
+    response: Optional[Any] = None
+    error: Optional[Exception] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Check if the item succeeded."""
+        return self.error is None
+
+
+####
+##      BATCH SUMMARY
+#####
+@dataclass
+class BatchSummary:
+    """Aggregated counters of a bulk operation."""
+
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    errors: Dict[str, int] = field(default_factory = dict)
+
+    def add(self, result: BatchItemResult) -> None:
+        """Account for a new item result."""
+
+        self.total += 1
+        if result.ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+            name = type(result.error).__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+
+####
+##      BATCH REPORT
+#####
+@dataclass
+class BatchReport:
+    """Results of a bulk operation run by the sync client."""
+
+    results: List[BatchItemResult] = field(default_factory = list)
+    summary: BatchSummary = field(default_factory = BatchSummary)
+
+
+####
+##      WARMUP REPORT
+#####
+@dataclass
+class WarmupReport:
+    """Time spent (in seconds) warming up a provider, by phase."""
+
+    dns: float = 0.0
+    connect: float = 0.0
+    token: Optional[float] = None
+    """ None when the provider does not use access tokens. """
+
+    connections: int = 0
+    """ Number of keep-alive connections opened. """
+
+    errors: Dict[str, str] = field(default_factory = dict)
+    """ Error message of each failed phase. """
+
+    @property
+    def ok(self) -> bool:
+        """Check if every phase succeeded."""
+        return not self.errors
+
+    @property
+    def elapsed(self) -> float:
+        """Total time spent in all phases."""
+        return self.dns + self.connect + (self.token or 0.0)
+
+
 ####
 ##      API CREDENTIALS
 #####
@@ -0,0 +1,200 @@
+"""
+EasySwitch - Bounded concurrency batch runner
+"""
+import asyncio
+from time import monotonic
+from typing import (Any, AsyncIterable, AsyncIterator, Awaitable, Callable,
+                    Iterable, Iterator, List, Optional, Sequence, Tuple,
+                    TypeVar, Union)
+
+from easyswitch.types import BatchItemResult, BatchSummary
+
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+####
+##      BATCH RESULTS
+#####
+class BatchResults(AsyncIterator[BatchItemResult]):
+    """
+    Stream the results of running ``func`` over ``items`` with bounded concurrency.
+
+    Items are pulled lazily from the (sync or async) iterable by a fixed pool
+    of workers, so memory stays bounded whatever the batch size. Results are
+    yielded in completion order and failures are reported as results instead
+    of aborting the batch. ``summary`` is updated as results are consumed.
+
+    With ``lanes``, each lane of items gets its own workers, and a worker
+    only claims one of the ``concurrency`` slots once it holds an item:
+    a lane at its cap waits on its own workers, never on the others'.
+
+    Examples:
+        >>> results = BatchResults(transactions, client.send_payment, concurrency=20)
+        >>> async for result in results:
+        ...     print(result.index, result.ok)
+        >>> print(results.summary)
+    """
+
+    def __init__(
+        self,
+        items: Union[Iterable[T], AsyncIterable[T]],
+        func: Callable[[T], Awaitable[Any]],
+        concurrency: int = 10,
+        key: Optional[Callable[[T], Tuple[Optional[str], Any]]] = None,
+        lanes: Optional[Sequence[Tuple[Union[Iterable[T], AsyncIterable[T]], int]]] = None
+    ):
+        """
+        Initialize the batch.
+
+        Args:
+            items: Items to process
+            func: Coroutine function called for every item
+            concurrency: Maximum number of items processed at the same time
+            key: Return the (transaction id, provider) identifying an item
+            lanes: (items, workers) pairs processed instead of ``items``,
+                each by its own workers
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.items = items
+        self.func = func
+        self.concurrency = concurrency
+        self.key = key or (lambda item: (None, None))
+        self.lanes = lanes
+        self.summary = BatchSummary()
+        self._stream: Optional[AsyncIterator[BatchItemResult]] = None
+
+    def __aiter__(self) -> 'BatchResults':
+        return self
+
+    async def __anext__(self) -> BatchItemResult:
+        if self._stream is None:
+            self._stream = self._run()
+        return await self._stream.__anext__()
+
+    async def collect(self) -> List[BatchItemResult]:
+        """Consume the whole batch and return its results in completion order."""
+        return [result async for result in self]
+
+    async def aclose(self) -> None:
+        """Stop the batch, cancelling items still in progress."""
+
+        if self._stream is not None:
+            await self._stream.aclose()
+
+    async def _run(self) -> AsyncIterator[BatchItemResult]:
+        """Run the workers and yield their results."""
+
+        results: asyncio.Queue = asyncio.Queue(maxsize = self.concurrency)
+        counter = iter(range(2 ** 63))
+        start = monotonic()
+
+        if self.lanes is None:
+            sources = [(self._item_source(self.items, counter), self.concurrency)]
+            slots = None
+        else:
+            sources = [
+                (self._item_source(items, counter), min(workers, self.concurrency))
+                for items, workers in self.lanes
+            ]
+            slots = asyncio.Semaphore(self.concurrency)
+
+        async def worker(next_item: Callable[[], Awaitable[Tuple[int, T]]]) -> None:
+            while True:
+                try:
+                    index, item = await next_item()
+                except StopAsyncIteration:
+                    return
+                if slots is None:
+                    result = await self._process(index, item)
+                else:
+                    async with slots:
+                        result = await self._process(index, item)
+                await results.put(result)
+
+        async def supervise() -> None:
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                await results.put(_DONE)
+
+        workers = [
+            asyncio.ensure_future(worker(next_item))
+            for next_item, count in sources
+            for _ in range(count)
+        ]
+        supervisor = asyncio.ensure_future(supervise())
+
+        try:
+            while True:
+                result = await results.get()
+                if result is _DONE:
+                    break
+                self.summary.add(result)
+                self.summary.elapsed = monotonic() - start
+                yield result
+
+            # Surface unexpected worker errors (e.g. a failing iterable)
+            await supervisor
+        finally:
+            for task in (*workers, supervisor):
+                task.cancel()
+            await asyncio.gather(*workers, supervisor, return_exceptions = True)
+
+    def _item_source(
+        self,
+        items: Union[Iterable[T], AsyncIterable[T]],
+        counter: Iterator[int]
+    ) -> Callable[[], Awaitable[Tuple[int, T]]]:
+        """Return a coroutine function pulling the next (index, item) pair."""
+
+        if hasattr(items, '__aiter__'):
+            iterator = items.__aiter__()
+            # Async iterators do not support concurrent __anext__ calls
+            lock = asyncio.Lock()
+
+            async def next_item() -> Tuple[int, T]:
+                async with lock:
+                    item = await iterator.__anext__()
+                    return next(counter), item
+        else:
+            iterator = iter(items)
+
+            async def next_item() -> Tuple[int, T]:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    raise StopAsyncIteration
+                return next(counter), item
+
+        return next_item
+
+    async def _process(self, index: int, item: T) -> BatchItemResult:
+        """Run ``func`` on one item and wrap the outcome."""
+
+        transaction_id, provider = self.key(item)
+        start = monotonic()
+        try:
+            response = await self.func(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return BatchItemResult(
+                index = index,
+                transaction_id = transaction_id,
+                provider = provider,
+                error = e,
+                elapsed = monotonic() - start
+            )
+
+        return BatchItemResult(
+            index = index,
+            transaction_id = transaction_id,
+            provider = provider,
+            response = response,
+            elapsed = monotonic() - start
+        )
@@ -0,0 +1,291 @@
+"""
+EasySwitch - Lookup caches
+"""
+import abc
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from time import time
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+from easyswitch.types import TransactionStatus
+
+
+# Terminal statuses never change, in-progress ones do.
+DEFAULT_STATUS_TTLS: Dict[TransactionStatus, float] = {
+    TransactionStatus.SUCCESSFUL: 86400.0,
+    TransactionStatus.COMPLETED: 86400.0,
+    TransactionStatus.TRANSFERRED: 86400.0,
+    TransactionStatus.FAILED: 86400.0,
+    TransactionStatus.CANCELLED: 86400.0,
+    TransactionStatus.REFUSED: 86400.0,
+    TransactionStatus.DECLINED: 86400.0,
+    TransactionStatus.EXPIRED: 86400.0,
+    TransactionStatus.REFUNDED: 86400.0,
+    TransactionStatus.PENDING: 5.0,
+    TransactionStatus.PROCESSING: 5.0,
+    TransactionStatus.INITIATED: 5.0,
+}
+
+
+####
+##      CACHE BACKENDS
+#####
+class CacheBackend(abc.ABC):
+    """Key/value store with per entry expiry and a bounded size."""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value of a key, None if missing or expired."""
+
+    @abc.abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds."""
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """
+        Store a value only if the key is missing or expired.
+        Backends override it to make the check and the write atomic.
+
+        Returns:
+            bool: True if the value was stored
+        """
+        if self.get(key) is not None:
+            return False
+        self.set(key, value, ttl)
+        return True
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a key."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Remove every key."""
+
+    def close(self) -> None:
+        """Release the backend resources."""
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._store(key, value, ttl, time())
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        now = time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return False
+            self._store(key, value, ttl, now)
+            return True
+
+    def _store(self, key: str, value: Any, ttl: float, now: float) -> None:
+        self._entries[key] = (now + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last = False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Cache stored in a local SQLite file, shared by the processes of a host
+    and kept across restarts. Values are pickled, only point it to a file
+    the application owns.
+    """
+
+    def __init__(self, path: Union[str, Path], max_entries: int = 100_000):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread = False, isolation_level = None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS easyswitch_cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS easyswitch_cache_lru "
+            "ON easyswitch_cache (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM easyswitch_cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM easyswitch_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE easyswitch_cache SET accessed_at = ? WHERE key = ?",
+                (now, key)
+            )
+        return pickle.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        now = time()
+        blob = pickle.dumps(value, protocol = pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO easyswitch_cache VALUES (?, ?, ?, ?)",
+                (key, blob, now + ttl, now)
+            )
+            self._evict(now)
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        now = time()
+        blob = pickle.dumps(value, protocol = pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            # Each statement is atomic, so concurrent processes agree on
+            # which one stored the key.
+            stored = self._conn.execute(
+                "INSERT OR IGNORE INTO easyswitch_cache VALUES (?, ?, ?, ?)",
+                (key, blob, now + ttl, now)
+            ).rowcount or self._conn.execute(
+                "UPDATE easyswitch_cache SET value = ?, expires_at = ?, "
+                "accessed_at = ? WHERE key = ? AND expires_at <= ?",
+                (blob, now + ttl, now, key, now)
+            ).rowcount
+            if stored:
+                self._evict(now)
+            return bool(stored)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then the least recently used ones."""
+
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM easyswitch_cache").fetchone()
+        if count <= self.max_entries:
+            return
+        self._conn.execute("DELETE FROM easyswitch_cache WHERE expires_at <= ?", (now,))
+        self._conn.execute(
+            "DELETE FROM easyswitch_cache WHERE key IN ("
+            "SELECT key FROM easyswitch_cache ORDER BY accessed_at "
+            "LIMIT max(0, (SELECT COUNT(*) FROM easyswitch_cache) - ?))",
+            (self.max_entries,)
+        )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM easyswitch_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM easyswitch_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+####
+##      LOOKUP CACHE
+#####
+@dataclass
+class CacheStats:
+    """Counters of a lookup cache."""
+
+    hits: int = 0
+    misses: int = 0
+
+
+class LookupCache:
+    """
+    Caches status and transaction detail lookups.
+    Each result is kept for the TTL of its status: terminal statuses for
+    long, in-progress ones for a few seconds, others (ERROR, UNKNOWN) not
+    at all.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttls: Optional[Mapping[Union[TransactionStatus, str], float]] = None,
+        default_ttl: float = 0.0
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Storage backend (in-memory LRU by default)
+            ttls: TTL (in seconds) by status, overriding the defaults
+            default_ttl: TTL of the statuses without one (0 disables)
+        """
+        self.backend = backend or MemoryCache()
+        self.ttls: Dict[TransactionStatus, float] = dict(DEFAULT_STATUS_TTLS)
+        for status, ttl in (ttls or {}).items():
+            self.ttls[TransactionStatus(status)] = ttl
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+
+    @staticmethod
+    def key(provider: str, operation: str, transaction_id: str) -> str:
+        return f"{provider}:{operation}:{transaction_id}"
+
+    def ttl_for(self, result: Any) -> float:
+        """TTL of a lookup result, from its status."""
+
+        status = getattr(result, 'status', None)
+        try:
+            status = TransactionStatus(status)
+        except ValueError:
+            return self.default_ttl
+        return self.ttls.get(status, self.default_ttl)
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.backend.get(key)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def set(self, key: str, result: Any) -> None:
+        ttl = self.ttl_for(result)
+        if ttl > 0:
+            self.backend.set(key, result, ttl)
+
+    def invalidate(self, provider: str, operation: str, transaction_id: str) -> None:
+        self.backend.delete(self.key(provider, operation, transaction_id))
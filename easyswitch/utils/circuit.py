@@ -0,0 +1,305 @@
+"""
+EasySwitch - Circuit breakers
+"""
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from time import monotonic
+from typing import Callable, Deque, Dict, Mapping, Optional, Pattern, Tuple
+
+from easyswitch.exceptions import CircuitOpenError
+
+
+####
+##      CIRCUIT STATES
+#####
+class CircuitState(str, Enum):
+    """States of a circuit breaker."""
+
+    CLOSED = "closed"           # Calls flow, outcomes are recorded
+    OPEN = "open"               # Calls fail fast
+    HALF_OPEN = "half_open"     # A few trial calls probe the provider
+
+
+####
+##      CIRCUIT SNAPSHOT
+#####
+@dataclass(frozen=True)
+class CircuitSnapshot:
+    """Point in time view of a circuit breaker."""
+
+    name: str
+    state: CircuitState
+    calls: int
+    """ Number of outcomes in the sliding window. """
+
+    failure_rate: float
+    slow_call_rate: float
+    retry_after: float = 0.0
+    """ Seconds before an open circuit lets trial calls through. """
+
+
+####
+##      CIRCUIT BREAKER
+#####
+class CircuitBreaker:
+    """
+    Count based circuit breaker.
+    The outcomes of the last ``window_size`` calls are kept, once at least
+    ``minimum_calls`` were recorded the circuit opens when the failure rate
+    or the slow call rate reaches its threshold. After ``open_duration``
+    seconds, ``half_open_calls`` trial calls are let through: one failure
+    opens the circuit again, all of them succeeding closes it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_rate_threshold: float = 1.0,
+        slow_call_duration: float = 10.0,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_calls: int = 3,
+        clock: Callable[[], float] = monotonic
+    ):
+        """
+        Initialize the breaker, closed.
+
+        Args:
+            name: Breaker name, reported in errors and snapshots
+            failure_rate_threshold: Failure rate (0-1) opening the circuit
+            slow_call_rate_threshold: Slow call rate (0-1) opening the circuit
+            slow_call_duration: Duration (in seconds) above which a call is slow
+            window_size: Number of outcomes kept in the sliding window
+            minimum_calls: Outcomes required before rates are evaluated
+            open_duration: Seconds the circuit stays open
+            half_open_calls: Trial calls allowed while half-open
+            clock: Monotonic clock (overridable for tests)
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.window_size = window_size
+        self.minimum_calls = min(minimum_calls, window_size)
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+
+        self._state = CircuitState.CLOSED
+        self._window: Deque[Tuple[bool, bool]] = deque()
+        self._failures = 0
+        self._slow_calls = 0
+        self._opened_at = 0.0
+        self._trials = 0            # Trial calls handed out while half-open
+        self._trial_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state (an expired open circuit reports half-open)."""
+
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self) -> None:
+        """Move an open circuit to half-open once its delay is over."""
+
+        if (
+            self._state is CircuitState.OPEN and
+            self._clock() - self._opened_at >= self.open_duration
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._trials = 0
+            self._trial_successes = 0
+
+    def _reset_window(self) -> None:
+        self._window.clear()
+        self._failures = 0
+        self._slow_calls = 0
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._reset_window()
+
+    def acquire(self) -> None:
+        """
+        Ask permission to send a call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all
+                its trial calls in flight
+        """
+        with self._lock:
+            self._refresh()
+
+            if self._state is CircuitState.CLOSED:
+                return
+            if (
+                self._state is CircuitState.HALF_OPEN and
+                self._trials < self.half_open_calls
+            ):
+                self._trials += 1
+                return
+
+            retry_after = max(
+                0.0, self.open_duration - (self._clock() - self._opened_at)
+            )
+            raise CircuitOpenError(
+                message = f"Circuit '{self.name}' is {self._state.value}",
+                circuit = self.name,
+                retry_after = retry_after
+            )
+
+    def release(self) -> None:
+        """Give back a permission whose call ended without an outcome."""
+
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN and self._trials:
+                self._trials -= 1
+
+    def record(self, success: bool, duration: float) -> None:
+        """
+        Record the outcome of a call.
+
+        Args:
+            success: Whether the call succeeded
+            duration: Call duration (in seconds)
+        """
+        slow = duration >= self.slow_call_duration
+
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                if not success or slow:
+                    self._open()
+                    return
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_calls:
+                    self._state = CircuitState.CLOSED
+                    self._reset_window()
+                return
+
+            if self._state is CircuitState.OPEN:
+                return      # Late outcome of a call sent before opening
+
+            self._window.append((not success, slow))
+            self._failures += not success
+            self._slow_calls += slow
+            if len(self._window) > self.window_size:
+                failed, was_slow = self._window.popleft()
+                self._failures -= failed
+                self._slow_calls -= was_slow
+
+            calls = len(self._window)
+            if calls >= self.minimum_calls and (
+                self._failures / calls >= self.failure_rate_threshold or
+                self._slow_calls / calls >= self.slow_call_rate_threshold
+            ):
+                self._open()
+
+    def snapshot(self) -> CircuitSnapshot:
+        """Return a point in time view of the breaker."""
+
+        with self._lock:
+            self._refresh()
+            calls = len(self._window)
+            return CircuitSnapshot(
+                name = self.name,
+                state = self._state,
+                calls = calls,
+                failure_rate = self._failures / calls if calls else 0.0,
+                slow_call_rate = self._slow_calls / calls if calls else 0.0,
+                retry_after = (
+                    max(0.0, self.open_duration - (self._clock() - self._opened_at))
+                    if self._state is CircuitState.OPEN else 0.0
+                )
+            )
+
+
+####
+##      CIRCUIT BREAKER REGISTRY
+#####
+class CircuitBreakerRegistry:
+    """
+    Circuit breakers of a provider, one per endpoint.
+    Requested paths are matched against the adapter's ``ENDPOINTS``
+    templates so that ``/v1/getStatus/abc`` and ``/v1/getStatus/xyz``
+    share the ``status`` breaker.
+    """
+
+    # Path segments looking like identifiers (long and containing digits).
+    _ID_SEGMENT = re.compile(r"^(?=.*\d)[^/]{6,}$")
+
+    def __init__(
+        self,
+        provider: str,
+        endpoints: Optional[Mapping[str, str]] = None,
+        **options
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            provider: Provider name, prefixed to breaker names
+            endpoints: Adapter endpoint templates (name -> path)
+            options: ``CircuitBreaker`` settings
+        """
+        self.provider = provider
+        self.options = options
+        self._templates: Tuple[Tuple[str, Pattern[str]], ...] = tuple(
+            (name, self._compile(path))
+            for name, path in (endpoints or {}).items()
+        )
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _compile(template: str) -> Pattern[str]:
+        """Compile an endpoint template into a path regex."""
+
+        parts = re.split(r"\{[^}]*\}", template.split('?')[0].strip('/'))
+        return re.compile("^" + "[^/]+".join(map(re.escape, parts)) + "$")
+
+    def endpoint_key(self, endpoint: str) -> str:
+        """Return the breaker key of a requested endpoint."""
+
+        path = endpoint.split('?')[0].strip('/')
+        for name, pattern in self._templates:
+            if pattern.match(path):
+                return name
+        return "/" + "/".join(
+            ':id' if self._ID_SEGMENT.match(segment) else segment
+            for segment in path.split('/')
+        )
+
+    def for_endpoint(self, endpoint: str) -> CircuitBreaker:
+        """Return (creating it if needed) the breaker of an endpoint."""
+
+        key = self.endpoint_key(endpoint)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    key,
+                    CircuitBreaker(f"{self.provider}:{key}", **self.options)
+                )
+        return breaker
+
+    def states(self) -> Dict[str, CircuitSnapshot]:
+        """Return the snapshot of every breaker, by endpoint key."""
+
+        return {key: b.snapshot() for key, b in list(self._breakers.items())}
+
+    @property
+    def is_open(self) -> bool:
+        """Whether any endpoint of the provider is currently failing fast."""
+
+        return any(
+            s.state is CircuitState.OPEN for s in self.states().values()
+        )
@@ -0,0 +1,157 @@
+"""
+EasySwitch - Hedged requests
+"""
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass
+from time import monotonic
+from typing import Awaitable, Callable, Deque, Optional, TypeVar
+
+from easyswitch.utils.retry import RetryBudget
+
+
+T = TypeVar("T")
+
+# Hedge budget of the adapters created outside of a client.
+default_hedge_budget = RetryBudget(ratio = 0.05, reserve = 1)
+
+
+####
+##      LATENCY TRACKER
+#####
+class LatencyTracker:
+    """Keeps the latencies of the last calls to compute percentiles."""
+
+    def __init__(self, window_size: int = 200):
+        self._samples: Deque[float] = deque(maxlen = window_size)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Return the ``q`` (0-1) percentile of the recorded latencies.
+
+        Returns:
+            Optional[float]: Latency in seconds, None without samples
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+####
+##      HEDGER STATS
+#####
+@dataclass
+class HedgeStats:
+    """Counters of a hedger."""
+
+    requests: int = 0
+    hedges: int = 0
+    """ Number of backup requests sent. """
+
+    hedge_wins: int = 0
+    """ Number of times the backup request answered first. """
+
+
+####
+##      HEDGER
+#####
+class Hedger:
+    """
+    Sends a backup request when the first one is slower than usual.
+    The delay is the ``percentile`` of the recent latencies, so about
+    ``1 - percentile`` of the requests are hedged, and a budget shared by
+    every hedger caps the extra load. The first successful answer wins and
+    the other request is cancelled.
+
+    Only use it for idempotent reads (status checks, transaction details).
+    """
+
+    def __init__(
+        self,
+        budget: RetryBudget,
+        percentile: float = 0.95,
+        min_delay: float = 0.05,
+        max_delay: float = 5.0,
+        min_samples: int = 20,
+        window_size: int = 200
+    ):
+        """
+        Initialize the hedger.
+
+        Args:
+            budget: Hedge budget (possibly shared with other hedgers)
+            percentile: Latency percentile after which a request is hedged
+            min_delay: Lower bound of the hedging delay (in seconds)
+            max_delay: Upper bound of the hedging delay (in seconds)
+            min_samples: Latencies needed before hedging starts
+            window_size: Number of recent latencies kept
+        """
+        self.budget = budget
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker(window_size)
+        self.stats = HedgeStats()
+
+    def delay(self) -> Optional[float]:
+        """Current hedging delay, None while there are too few samples."""
+
+        if len(self.latencies) < self.min_samples:
+            return None
+        return min(
+            self.max_delay,
+            max(self.min_delay, self.latencies.percentile(self.percentile))
+        )
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``call()``, hedging it with a second ``call()`` if it is slow.
+
+        Args:
+            call: Factory returning a new awaitable for each attempt
+
+        Returns:
+            T: Result of the first successful attempt
+        """
+        self.stats.requests += 1
+        self.budget.deposit()
+        start = monotonic()
+        delay = self.delay()
+
+        primary = asyncio.ensure_future(call())
+        tasks = {primary}
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout = delay)
+                if not done and self.budget.withdraw():
+                    self.stats.hedges += 1
+                    tasks.add(asyncio.ensure_future(call()))
+
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when = asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self.latencies.record(monotonic() - start)
+                        if task is not primary:
+                            self.stats.hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
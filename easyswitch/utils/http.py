@@ -4,17 +4,22 @@ EasySwitch - Advanced Async HTTP Client for API requests
 import json
 import asyncio
 import logging
+import threading
 from typing import (
-    Any, Dict, Optional, Union, AsyncIterator, List
+    Any, Dict, Optional, Tuple, Union, AsyncIterator, List
 )
 from dataclasses import dataclass
 from time import monotonic
 import aiohttp
 from aiohttp import ClientTimeout, ClientResponse, ClientSession
+from yarl import URL
 
 from easyswitch.exceptions import (
     NetworkError, RateLimitError, APIError
 )
+from easyswitch.utils.circuit import CircuitBreakerRegistry
+from easyswitch.utils.ratelimit import TokenBucket
+from easyswitch.utils.retry import Jitter, RetryPolicy
 
 
 
@@ -29,6 +34,152 @@ class HTTPResponse:
     elapsed: float
     url: str
 
+
+def _get_header(headers: Dict[str, str], name: str) -> Optional[str]:
+    """Case-insensitive header lookup in a plain dict."""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+PoolKey = Tuple[str, str, Optional[int], Optional[str]]
+
+
+class ConnectionPoolManager:
+    """
+    Process-wide manager of shared TCP connectors.
+
+    Connectors are handed out per event loop and keyed by
+    (scheme, host, port, proxy), so every HTTPClient talking to the same
+    endpoint reuses the same pool of keep-alive sockets.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        ttl_dns_cache: Optional[int] = 300,
+        keepalive_timeout: float = 30.0,
+        enable_cleanup_closed: bool = True
+    ):
+        """
+        Initialize the pool manager.
+
+        Args:
+            limit: Maximum number of concurrent requests across all hosts
+            limit_per_host: Maximum number of connections per endpoint
+            ttl_dns_cache: Seconds to cache DNS resolutions (None to cache forever)
+            keepalive_timeout: Seconds to keep idle connections open
+            enable_cleanup_closed: Abort SSL transports that failed to close
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.ttl_dns_cache = ttl_dns_cache
+        self.keepalive_timeout = keepalive_timeout
+        self.enable_cleanup_closed = enable_cleanup_closed
+        self._connectors: Dict[
+            asyncio.AbstractEventLoop, Dict[PoolKey, aiohttp.TCPConnector]
+        ] = {}
+        self._limiters: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def pool_key(url: str, proxy: Optional[str] = None) -> PoolKey:
+        """Return the key identifying the pool serving ``url``."""
+
+        parsed = URL(url)
+        return (parsed.scheme, parsed.host or '', parsed.port, proxy)
+
+    def _purge_closed_loops(self) -> None:
+        """Close and forget the connectors bound to event loops that are closed."""
+
+        for loop in [loop for loop in self._connectors if loop.is_closed()]:
+            for connector in self._connectors.pop(loop).values():
+                _close_detached(connector)
+            self._limiters.pop(loop, None)
+
+    def get_connector(
+        self,
+        url: str,
+        proxy: Optional[str] = None
+    ) -> aiohttp.TCPConnector:
+        """
+        Get the shared connector for ``url`` on the running event loop.
+
+        Args:
+            url: Any URL served by the endpoint
+            proxy: Proxy server URL
+
+        Returns:
+            aiohttp.TCPConnector: The shared connector
+        """
+        loop = asyncio.get_running_loop()
+        key = self.pool_key(url, proxy)
+
+        with self._lock:
+            self._purge_closed_loops()
+            connectors = self._connectors.setdefault(loop, {})
+            connector = connectors.get(key)
+
+            if connector is None or connector.closed:
+                connector = aiohttp.TCPConnector(
+                    limit = self.limit,
+                    limit_per_host = self.limit_per_host,
+                    use_dns_cache = True,
+                    ttl_dns_cache = self.ttl_dns_cache,
+                    keepalive_timeout = self.keepalive_timeout,
+                    force_close = False,
+                    enable_cleanup_closed = self.enable_cleanup_closed
+                )
+                connectors[key] = connector
+
+            return connector
+
+    def limiter(self) -> asyncio.Semaphore:
+        """Return the semaphore enforcing the global limit on the running loop."""
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            limiter = self._limiters.get(loop)
+            if limiter is None:
+                limiter = self._limiters[loop] = asyncio.Semaphore(self.limit)
+            return limiter
+
+    async def close(self) -> None:
+        """Close every connector bound to the running event loop."""
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            connectors = self._connectors.pop(loop, {})
+            self._limiters.pop(loop, None)
+
+        for connector in connectors.values():
+            await connector.close()
+
+
+def _close_detached(connector: aiohttp.TCPConnector) -> None:
+    """
+    Close a connector whose event loop is closed. Nothing can be awaited
+    on that loop anymore, but closing then completes without suspending.
+    """
+    closing = connector.close()
+    if not asyncio.iscoroutine(closing):
+        # aiohttp < 3.12 closes synchronously
+        return
+    try:
+        closing.send(None)
+    except StopIteration:
+        pass
+    else:
+        closing.close()
+
+
+# Default pool manager shared by every HTTPClient of the process
+default_pool_manager = ConnectionPoolManager()
+
+
 class HTTPClient:
     """Advanced asynchronous HTTP client with retry logic and connection pooling"""
     
@@ -41,7 +192,11 @@ class HTTPClient:
         retry_delay: float = 1.0,
         debug: bool = False,
         proxy: Optional[str] = None,
-        pool_size: int = 100
+        pool_size: int = 100,
+        pool_manager: Optional[ConnectionPoolManager] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None
     ):
         """
         Initialize the HTTP client with advanced configuration.
@@ -54,7 +209,15 @@ class HTTPClient:
             retry_delay: Initial delay between retries in seconds
             debug: Enable debug logging
             proxy: Proxy server URL
-            pool_size: Connection pool size
+            pool_size: Kept for backwards compatibility, connection limits
+                are now set on the pool manager
+            pool_manager: Pool manager providing the shared connectors
+                (defaults to the process-wide one)
+            rate_limiter: Token bucket pacing every request (retries included)
+            retry_policy: Retry policy, overrides max_retries and retry_delay
+                (by default only network errors are retried, without jitter
+                nor budget)
+            circuit_breakers: Per endpoint circuit breakers of the provider
         """
         self.base_url = base_url.rstrip('/')
         self.default_headers = default_headers or {
@@ -62,12 +225,22 @@ class HTTPClient:
             "Content-Type": "application/json"
         }
         self.timeout = ClientTimeout(total=timeout)
-        self.max_retries = max_retries
-        self.retry_delay = retry_delay
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_retries = max_retries,
+            base_delay = retry_delay,
+            jitter = Jitter.NONE,
+            retry_statuses = ()
+        )
+        self.max_retries = self.retry_policy.max_retries
+        self.retry_delay = self.retry_policy.base_delay
         self.debug = debug
         self.proxy = proxy
         self.pool_size = pool_size
+        self.pool_manager = pool_manager or default_pool_manager
+        self.rate_limiter = rate_limiter
+        self.circuit_breakers = circuit_breakers
         self._session: Optional[ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self.connector: Optional[aiohttp.TCPConnector] = None
 
     async def __aenter__(self) -> 'HTTPClient':
@@ -84,15 +257,22 @@ class HTTPClient:
 
     async def start_session(self) -> None:
         """Initialize the client session"""
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._loop is not loop:
+            # The session belongs to another (most likely closed) event loop
+            # and cannot be used from this one, so start a fresh one.
+            self._session = None
+            self.connector = None
+
         if self._session is None or self._session.closed:
-            if self.connector is None:
-                self.connector = aiohttp.TCPConnector(
-                    limit = self.pool_size,
-                    force_close = False,
-                    enable_cleanup_closed = True
-                )
+            self._loop = loop
+            # Connectors are shared process-wide, the session must not close them
+            self.connector = self.pool_manager.get_connector(
+                self.base_url, self.proxy
+            )
             self._session = ClientSession(
                 connector=self.connector,
+                connector_owner=False,
                 timeout=self.timeout,
                 headers=self.default_headers
             )
@@ -101,7 +281,71 @@ class HTTPClient:
         """Close the client session"""
         if self._session and not self._session.closed:
             await self._session.close()
-            self._session = None
+        self._session = None
+        self.connector = None
+
+    async def resolve(self) -> List[str]:
+        """
+        Resolve the host of the base URL into the shared connector's DNS
+        cache, so that the next connections skip the lookup.
+
+        Returns:
+            List[str]: The addresses of the host (none if the connector
+                cannot resolve ahead of time)
+        """
+        await self.start_session()
+        url = URL(self.base_url)
+        # The connector's own resolution path is the one filling its cache,
+        # it is private so an aiohttp upgrade may remove it
+        resolve_host = getattr(self.connector, '_resolve_host', None)
+        if resolve_host is None:
+            logger.warning(
+                "This aiohttp version cannot resolve hosts ahead of time, "
+                "skipping DNS warmup"
+            )
+            return []
+        results = await resolve_host(url.host, url.port)
+        return sorted({result['host'] for result in results})
+
+    async def open_connections(self, count: int) -> int:
+        """
+        Open connections to the base URL and leave them in the pool.
+        Each connection is opened by a concurrent HEAD request whose
+        response is fully read, so the socket is kept alive for reuse.
+        These requests are paced by the rate limiter like any other.
+
+        Args:
+            count: Number of connections to open (capped by the pool's
+                per host limit)
+
+        Returns:
+            int: Number of connections opened
+
+        Raises:
+            NetworkError: If no connection could be opened
+        """
+        await self.start_session()
+        if self.connector.limit_per_host:
+            count = min(count, self.connector.limit_per_host)
+
+        async def _open() -> None:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            async with self.pool_manager.limiter():
+                async with self._session.head(
+                    self.base_url, proxy = self.proxy, allow_redirects = False
+                ) as response:
+                    await response.read()
+
+        results = await asyncio.gather(
+            *(_open() for _ in range(count)), return_exceptions = True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if count and len(errors) == count:
+            raise NetworkError(
+                f"Could not connect to {self.base_url}: {errors[0]}"
+            ) from errors[0]
+        return count - len(errors)
 
     async def _request(
         self,
@@ -132,6 +376,7 @@ class HTTPClient:
             NetworkError: For connection issues
             APIError: For API-level errors
             RateLimitError: For 429 responses
+            CircuitOpenError: When the endpoint's circuit is open
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         merged_headers = {**self.default_headers, **(headers or {})}
@@ -145,89 +390,155 @@ class HTTPClient:
             )
 
         start_time = monotonic()
-        last_exception = None
-        
-        for attempt in range(self.max_retries + 1):
+        policy = self.retry_policy
+        policy.on_request()
+        breaker = (
+            self.circuit_breakers.for_endpoint(endpoint)
+            if self.circuit_breakers is not None else None
+        )
+        attempt = 0
+        delay = None
+
+        while True:
+            # Fail fast (before waiting for a token) when the circuit is open
+            if breaker is not None:
+                breaker.acquire()
+
+            sent_at = monotonic()
             try:
-                if not self._session or self._session.closed:
-                    await self.start_session()
-
-                async with self._session.request(
-                    method=method,
-                    url=url,
-                    headers=merged_headers,
-                    params=params,
-                    data=data,
-                    json=json_data,
-                    proxy=self.proxy,
-                    **kwargs
-                ) as response:
-                    elapsed = monotonic() - start_time
-                    
-                    # Process response content
-                    content_type = response.headers.get('Content-Type', '')
-                    if 'application/json' in content_type:
-                        response_data = await response.json()
-                    else:
-                        response_text = await response.text()
-                        try:
-                            response_data = json.loads(response_text)
-                        except json.JSONDecodeError:
-                            response_data = {"raw_response": response_text}
-
-                    if self.debug:
-                        logger.debug(
-                            f"Response ({response.status}) in {elapsed:.2f}s\n"
-                            f"Data: {response_data}"
-                        )
-
-                    # Handle error responses
-                    if response.status == 429:
-                        raise RateLimitError(
-                            message = "Rate limit exceeded",
-                            status_code=response.status,
-                            raw_response=response_data,
-                            headers=dict(response.headers)
-                        )
-                    
-                    # if not 200 <= response.status < 300:
-                    #     raise APIError(
-                    #         message = f"API request failed with status {response.status}",
-                    #         status_code = response.status,
-                    #         raw_response = response_data,
-                    #         headers = dict(response.headers)
-                    #     )
-
-                    return HTTPResponse(
-                        status = response.status,
-                        headers = dict(response.headers),
-                        data = response_data,
-                        elapsed = elapsed,
-                        url = response.url
-                    )
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire()
+                    sent_at = monotonic()
+
+                response = await self._send(
+                    method, url, merged_headers, params, data, json_data,
+                    start_time, **kwargs
+                )
 
-            except (aiohttp.ClientError, aiohttp.ClientPayloadError) as e:
-                last_exception = e
-                if attempt == self.max_retries:
-                    logger.error(f"Request failed after {self.max_retries} attempts")
+            except (
+                aiohttp.ClientError, aiohttp.ClientPayloadError, asyncio.TimeoutError
+            ) as e:
+                if breaker is not None:
+                    breaker.record(False, monotonic() - sent_at)
+                if not isinstance(e, aiohttp.ClientError):
+                    raise       # Total timeout, the request may have been processed
+
+                connected = not isinstance(e, aiohttp.ClientConnectorError)
+                delay = (
+                    policy.next_delay(attempt, delay)
+                    if policy.should_retry_error(method, connected) else None
+                )
+                if delay is None:
+                    logger.error(f"Request failed after {attempt + 1} attempts")
                     raise NetworkError(
-                        message=f"Network error: {str(e)}",
-                        original_exception=e
+                        message = f"Network error: {str(e)}",
+                        details = {"attempts": attempt + 1}
                     ) from e
-                
-                retry_wait = self.retry_delay * (2 ** attempt)
+
                 logger.warning(
-                    f"Attempt {attempt + 1} failed. Retrying in {retry_wait:.1f}s. Error: {str(e)}"
+                    f"Attempt {attempt + 1} failed. Retrying in {delay:.1f}s. Error: {str(e)}"
                 )
-                await asyncio.sleep(retry_wait)
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
 
             except json.JSONDecodeError as e:
+                if breaker is not None:
+                    breaker.record(False, monotonic() - sent_at)
                 raise APIError(
                     message="Invalid JSON response",
                     status_code=500,
                     raw_response=str(e)
                 ) from e
 
+            except BaseException:
+                # Cancelled (or failed locally): no outcome to record
+                if breaker is not None:
+                    breaker.release()
+                raise
+
+            if breaker is not None:
+                breaker.record(response.status < 500, monotonic() - sent_at)
+
+            if policy.should_retry_status(method, response.status):
+                delay = policy.next_delay(
+                    attempt, delay,
+                    retry_after = policy.parse_retry_after(
+                        _get_header(response.headers, 'Retry-After')
+                    )
+                )
+                if delay is not None:
+                    logger.warning(
+                        f"Attempt {attempt + 1} got status {response.status}. "
+                        f"Retrying in {delay:.1f}s."
+                    )
+                    await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+
+            # Handle error responses
+            if response.status == 429:
+                raise RateLimitError(
+                    message = "Rate limit exceeded",
+                    status_code = response.status,
+                    raw_response = response.data,
+                    headers = response.headers
+                )
+
+            return response
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        params: Optional[Dict[str, Any]],
+        data: Optional[Union[Dict[str, Any], str]],
+        json_data: Optional[Union[Dict[str, Any], List[Any]]],
+        start_time: float,
+        **kwargs
+    ) -> HTTPResponse:
+        """Send a single attempt of a request and read its response."""
+
+        await self.start_session()
+
+        async with self.pool_manager.limiter(), self._session.request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            data=data,
+            json=json_data,
+            proxy=self.proxy,
+            **kwargs
+        ) as response:
+            elapsed = monotonic() - start_time
+
+            # Process response content
+            content_type = response.headers.get('Content-Type', '')
+            if 'application/json' in content_type:
+                response_data = await response.json()
+            else:
+                response_text = await response.text()
+                try:
+                    response_data = json.loads(response_text)
+                except json.JSONDecodeError:
+                    response_data = {"raw_response": response_text}
+
+            if self.debug:
+                logger.debug(
+                    f"Response ({response.status}) in {elapsed:.2f}s\n"
+                    f"Data: {response_data}"
+                )
+
+            return HTTPResponse(
+                status = response.status,
+                headers = dict(response.headers),
+                data = response_data,
+                elapsed = elapsed,
+                url = response.url
+            )
+
     async def stream_response(
         self,
         method: str,
@@ -0,0 +1,140 @@
+"""
+EasySwitch - Background event loop runner
+"""
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+####
+##      BACKGROUND EVENT LOOP
+#####
+class BackgroundLoop:
+    """
+    Event loop running forever in a dedicated daemon thread.
+    Blocking code submits coroutines to it, so objects bound to the loop
+    (HTTP sessions, connection pools, tokens) survive across calls.
+    """
+
+    def __init__(self, name: str = "easyswitch-loop"):
+        """
+        Initialize the runner. The thread is started lazily.
+
+        Args:
+            name: Name of the loop thread
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the loop thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Return the running loop, starting it if needed."""
+        return self.start()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread if not already running."""
+
+        with self._lock:
+            if self.is_running:
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            self._thread = threading.Thread(
+                target = self._serve,
+                args = (loop, ready),
+                name = self.name,
+                daemon = True
+            )
+            self._loop = loop
+            self._thread.start()
+            ready.wait()
+            return loop
+
+    def _serve(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        ready: threading.Event
+    ) -> None:
+        """Thread target: run the loop until stopped, then clean up."""
+
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                # Give pending tasks a chance to finish their cancellation
+                pending = asyncio.all_tasks(loop)
+                for task in pending:
+                    task.cancel()
+                loop.run_until_complete(
+                    asyncio.gather(*pending, return_exceptions = True)
+                )
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+
+    def run(
+        self,
+        coro: Coroutine[Any, Any, T],
+        timeout: Optional[float] = None
+    ) -> T:
+        """
+        Submit a coroutine to the loop and block until it completes.
+
+        Args:
+            coro: The coroutine to run
+            timeout: Maximum time to wait for the result (in seconds)
+
+        Returns:
+            The coroutine's result
+        """
+        loop = self.start()
+
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError(
+                "BackgroundLoop.run() cannot be called from the loop thread."
+            )
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return future.result(timeout)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the loop and wait for its thread to exit."""
+
+        with self._lock:
+            if not self.is_running:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._thread = None
+            self._loop = None
+
+
+_shared_loop: Optional[BackgroundLoop] = None
+_shared_loop_lock = threading.Lock()
+
+
+def get_shared_loop() -> BackgroundLoop:
+    """
+    Return the process-wide background loop.
+    Sync clients share it so that their connection pools are shared too.
+    """
+    global _shared_loop
+
+    with _shared_loop_lock:
+        if _shared_loop is None:
+            _shared_loop = BackgroundLoop()
+        return _shared_loop
@@ -0,0 +1,111 @@
+"""
+EasySwitch - Token bucket rate limiter
+"""
+import asyncio
+import threading
+from dataclasses import dataclass
+from time import monotonic
+
+
+####
+##      RATE LIMITER STATS
+#####
+@dataclass
+class RateLimitStats:
+    """Counters describing how much a rate limiter delayed requests."""
+
+    requests: int = 0
+    """ Number of acquired permits. """
+
+    throttled: int = 0
+    """ Number of requests that had to wait. """
+
+    total_wait: float = 0.0
+    """ Cumulated time spent waiting (in seconds). """
+
+    max_wait: float = 0.0
+    """ Longest single wait (in seconds). """
+
+
+####
+##      TOKEN BUCKET
+#####
+class TokenBucket:
+    """
+    Asynchronous token bucket.
+    Tokens refill continuously at ``rate`` per second up to ``burst``.
+    Callers reserve a token and sleep until it is due, so waiting requests
+    are paced in arrival order instead of retrying in a busy loop.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize the bucket, full.
+
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            burst: Bucket capacity (requests allowed back to back)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self.stats = RateLimitStats()
+        self._tokens = float(burst)
+        self._updated_at = monotonic()
+        # Reservations are plain arithmetic, a thread lock keeps them safe
+        # whatever the event loop (or thread) the caller runs on.
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens accrued since the last update."""
+
+        self._tokens = min(
+            self.burst,
+            self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """
+        Take a token, possibly in advance.
+
+        Returns:
+            float: Seconds to wait before the token is actually available
+        """
+        with self._lock:
+            self._refill(monotonic())
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+            self.stats.requests += 1
+            if wait > 0:
+                self.stats.throttled += 1
+                self.stats.total_wait += wait
+                self.stats.max_wait = max(self.stats.max_wait, wait)
+            return wait
+
+    def cancel(self) -> None:
+        """Give back a reserved token that will not be used."""
+
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    async def acquire(self) -> float:
+        """
+        Wait until a request is allowed.
+
+        Returns:
+            float: Time spent waiting (in seconds)
+        """
+        wait = self.reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.cancel()
+                raise
+        return wait
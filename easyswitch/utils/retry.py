@@ -0,0 +1,239 @@
+"""
+EasySwitch - Retry policies
+"""
+import random
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import FrozenSet, Iterable, Optional
+
+
+####
+##      JITTER MODES
+#####
+class Jitter(str, Enum):
+    """Randomization applied to the exponential backoff."""
+
+    NONE = "none"
+    FULL = "full"
+    DECORRELATED = "decorrelated"
+
+
+# Requests that can safely be sent twice.
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset(
+    {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+)
+
+# Statuses worth retrying: throttling and transient upstream failures.
+RETRYABLE_STATUSES: FrozenSet[int] = frozenset({429, 502, 503, 504})
+
+
+####
+##      RETRY BUDGET
+#####
+@dataclass
+class RetryBudgetStats:
+    """Counters of a retry budget."""
+
+    requests: int = 0
+    """ Number of original requests. """
+
+    retries: int = 0
+    """ Number of retries allowed. """
+
+    rejected: int = 0
+    """ Number of retries refused because the budget was spent. """
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of the traffic.
+    Every request deposits ``ratio`` of a retry, every retry withdraws one.
+    ``reserve`` retries are always available so that low traffic clients
+    can still retry, while a provider outage cannot multiply the load.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: int = 10):
+        """
+        Initialize the budget.
+
+        Args:
+            ratio: Retries allowed per request sent (0.2 means +20% load at most)
+            reserve: Retries available upfront and maximum balance
+        """
+        if ratio < 0:
+            raise ValueError("ratio must not be negative")
+
+        self.ratio = ratio
+        self.reserve = reserve
+        self.stats = RetryBudgetStats()
+        self._balance = float(reserve)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Record an original request."""
+
+        with self._lock:
+            self.stats.requests += 1
+            self._balance = min(
+                max(self.reserve, 1), self._balance + self.ratio
+            )
+
+    def withdraw(self) -> bool:
+        """
+        Try to spend a retry.
+
+        Returns:
+            bool: Whether the retry is allowed
+        """
+        with self._lock:
+            if self._balance >= 1:
+                self._balance -= 1
+                self.stats.retries += 1
+                return True
+            self.stats.rejected += 1
+            return False
+
+
+####
+##      RETRY POLICY
+#####
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is sent again.
+    Backoff is exponential with jitter so that clients failing together do
+    not retry together, ``Retry-After`` headers are honored and retries
+    are bounded by an optional ``RetryBudget``.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        jitter: Jitter = Jitter.FULL,
+        retry_statuses: Iterable[int] = RETRYABLE_STATUSES,
+        max_retry_after: float = 60.0,
+        budget: Optional[RetryBudget] = None
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            max_retries: Maximum retries per request
+            base_delay: Backoff delay of the first retry (in seconds)
+            max_delay: Upper bound of the backoff delay (in seconds)
+            jitter: Jitter mode, see ``Jitter``
+            retry_statuses: Response statuses worth retrying
+            max_retry_after: Longest ``Retry-After`` to wait for, the error
+                is surfaced instead when the provider asks for more
+            budget: Retry budget shared by all the requests of a client
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = Jitter(jitter)
+        self.retry_statuses = frozenset(retry_statuses)
+        self.max_retry_after = max_retry_after
+        self.budget = budget
+
+    def should_retry_status(self, method: str, status: int) -> bool:
+        """
+        Tell whether a response status is worth retrying.
+        A 429 means the request was not processed so it is retried whatever
+        the method, other statuses only for idempotent methods (retrying a
+        payment creation could charge the customer twice).
+        """
+        if status not in self.retry_statuses:
+            return False
+        return status == 429 or method.upper() in IDEMPOTENT_METHODS
+
+    def should_retry_error(self, method: str, connected: bool) -> bool:
+        """
+        Tell whether a request that failed on a network error is worth retrying.
+        A request whose connection could not be established never reached
+        the provider so it is retried whatever the method. Once connected,
+        the provider may have processed it, so only idempotent methods are.
+        """
+        return not connected or method.upper() in IDEMPOTENT_METHODS
+
+    def backoff(self, attempt: int, previous: Optional[float] = None) -> float:
+        """
+        Compute the backoff delay before a retry.
+
+        Args:
+            attempt: Zero based index of the failed attempt
+            previous: Previous delay (used by decorrelated jitter)
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+
+        if self.jitter is Jitter.FULL:
+            return random.uniform(0, ceiling)
+        if self.jitter is Jitter.DECORRELATED:
+            previous = previous or self.base_delay
+            return min(
+                self.max_delay,
+                random.uniform(self.base_delay, previous * 3)
+            )
+        return ceiling
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Parse a ``Retry-After`` header (delay in seconds or HTTP date).
+
+        Returns:
+            Optional[float]: Seconds to wait, None when absent or invalid
+        """
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo = timezone.utc)
+        return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+    def on_request(self) -> None:
+        """Record an original request against the budget."""
+
+        if self.budget is not None:
+            self.budget.deposit()
+
+    def next_delay(
+        self,
+        attempt: int,
+        previous: Optional[float] = None,
+        retry_after: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Decide whether to retry and how long to wait first.
+
+        Args:
+            attempt: Zero based index of the failed attempt
+            previous: Delay waited before the failed attempt, if any
+            retry_after: Delay requested by the provider, if any
+
+        Returns:
+            Optional[float]: Seconds to wait, None if the request must not
+                be retried
+        """
+        if attempt >= self.max_retries:
+            return None
+        if retry_after is not None and retry_after > self.max_retry_after:
+            return None
+        if self.budget is not None and not self.budget.withdraw():
+            return None
+
+        delay = self.backoff(attempt, previous)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
@@ -0,0 +1,79 @@
+"""
+EasySwitch - In-flight request coalescing
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+####
+##      SINGLEFLIGHT STATS
+#####
+@dataclass
+class SingleFlightStats:
+    """Counters of a singleflight group."""
+
+    calls: int = 0
+    """ Number of calls made to the group. """
+
+    shared: int = 0
+    """ Number of calls served by a request already in flight. """
+
+
+####
+##      SINGLEFLIGHT GROUP
+#####
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls.
+    While a call is in flight for a key, other callers with the same key
+    wait for it and receive the same result (or exception) instead of
+    sending their own request. Nothing is kept once the call is done.
+    """
+
+    def __init__(self):
+        # Futures belong to a loop, so keys are scoped by loop.
+        self._flights: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self.stats = SingleFlightStats()
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``call()``, or the identical call already in flight.
+
+        Args:
+            key: Identity of the call
+            call: Factory of the awaitable, only used by the first caller
+
+        Returns:
+            T: The shared result
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        self.stats.calls += 1
+
+        task = self._flights.get(flight_key)
+        if task is not None:
+            self.stats.shared += 1
+        else:
+            task = loop.create_task(call())
+            self._flights[flight_key] = task
+            task.add_done_callback(
+                lambda t: self._landed(flight_key, t)
+            )
+
+        # A cancelled caller must not cancel the request of the others.
+        return await asyncio.shield(task)
+
+    def _landed(self, flight_key: Tuple[Any, Hashable], task: asyncio.Task) -> None:
+        """Forget a finished call."""
+
+        if self._flights.get(flight_key) is task:
+            del self._flights[flight_key]
+        if not task.cancelled():
+            task.exception()    # Retrieved, even if every caller went away
@@ -0,0 +1,391 @@
+"""
+EasySwitch - Access token management
+"""
+import abc
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic, time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set, Union
+
+try:
+    import fcntl
+except ImportError:     # pragma: no cover - Windows
+    fcntl = None
+
+
+logger = logging.getLogger("easyswitch.tokens")
+
+
+####
+##      ACCESS TOKEN
+#####
+@dataclass(frozen=True)
+class AccessToken:
+    """An access token and its expiry."""
+
+    value: str
+    expires_at: float
+    """ Expiry as a UNIX timestamp. """
+
+    @classmethod
+    def from_lifetime(cls, value: str, expires_in: float) -> 'AccessToken':
+        """Build a token valid for ``expires_in`` seconds from now."""
+        return cls(value, time() + float(expires_in))
+
+    @property
+    def expires_in(self) -> float:
+        """Seconds before expiry (negative once expired)."""
+        return self.expires_at - time()
+
+
+####
+##      TOKEN STORES
+#####
+class _FileLock:
+    """Inter-process lock on a file (advisory, POSIX only)."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = str(path)
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+
+class TokenStore(abc.ABC):
+    """
+    Access tokens shared by several processes.
+    Token managers read the store before calling the auth endpoint, and
+    refresh under an inter-process lock so that a fleet of workers using
+    the same credentials fetches one token instead of one per worker.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock_path = Path(f"{self.path}.lock")
+
+    @abc.abstractmethod
+    def load(self, key: str) -> Optional[AccessToken]:
+        """Return the stored token of a credential set, if any."""
+
+    @abc.abstractmethod
+    def save(self, key: str, token: AccessToken) -> None:
+        """Store the token of a credential set."""
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """Forget the token of a credential set."""
+
+    @asynccontextmanager
+    async def lock(self) -> AsyncIterator[None]:
+        """Hold the store's inter-process refresh lock."""
+
+        lock = _FileLock(self._lock_path)
+        # Waiting for another process must not block the event loop
+        acquiring = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            # The thread still waits for the lock, release it once taken
+            acquiring.add_done_callback(
+                lambda t: t.cancelled() or t.exception() or lock.release()
+            )
+            raise
+        try:
+            yield
+        finally:
+            lock.release()
+
+
+class JSONFileTokenStore(TokenStore):
+    """Tokens kept in a JSON file, guarded by a lock file."""
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, encoding = 'utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write(self, tokens: Dict[str, Any]) -> None:
+        # Written aside then renamed, readers never see a partial file
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding = 'utf-8') as f:
+            json.dump(tokens, f)
+        os.replace(tmp, self.path)
+
+    def _update(self, key: str, entry: Optional[Dict[str, Any]]) -> None:
+        lock = _FileLock(f"{self.path}.write.lock")
+        lock.acquire()
+        try:
+            now = time()
+            tokens = {
+                k: v for k, v in self._read().items() if v['expires_at'] > now
+            }
+            if entry is None:
+                tokens.pop(key, None)
+            else:
+                tokens[key] = entry
+            self._write(tokens)
+        finally:
+            lock.release()
+
+    def load(self, key: str) -> Optional[AccessToken]:
+        entry = self._read().get(key)
+        if entry is None:
+            return None
+        return AccessToken(entry['value'], entry['expires_at'])
+
+    def save(self, key: str, token: AccessToken) -> None:
+        self._update(key, {'value': token.value, 'expires_at': token.expires_at})
+
+    def delete(self, key: str) -> None:
+        self._update(key, None)
+
+
+class SQLiteTokenStore(TokenStore):
+    """Tokens kept in a local SQLite file."""
+
+    def __init__(self, path: Union[str, Path]):
+        super().__init__(path)
+        self._conn_lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread = False, isolation_level = None,
+            timeout = 30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS easyswitch_tokens ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def load(self, key: str) -> Optional[AccessToken]:
+        with self._conn_lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM easyswitch_tokens WHERE key = ?",
+                (key,)
+            ).fetchone()
+        return AccessToken(*row) if row else None
+
+    def save(self, key: str, token: AccessToken) -> None:
+        with self._conn_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO easyswitch_tokens VALUES (?, ?, ?)",
+                (key, token.value, token.expires_at)
+            )
+
+    def delete(self, key: str) -> None:
+        with self._conn_lock:
+            self._conn.execute("DELETE FROM easyswitch_tokens WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        with self._conn_lock:
+            self._conn.close()
+
+
+####
+##      TOKEN MANAGER
+#####
+class TokenManager:
+    """
+    Caches an access token and refreshes it before it expires.
+
+    ``fetch`` is only called when needed and concurrent refreshes share a
+    single call. Once a token enters its refresh window (the last
+    ``refresh_margin`` seconds of its life, at most half of it) it is still
+    handed out while a new one is fetched in the background, and a refresh
+    is also scheduled on the event loop, so requests do not wait for the
+    auth endpoint. Refreshes are at least ``MIN_REFRESH_DELAY`` seconds
+    apart, however short lived the tokens.
+    """
+
+    MIN_REFRESH_DELAY: float = 1.0
+    """ Shortest time between two proactive refreshes (in seconds). """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[AccessToken]],
+        refresh_margin: float = 60.0,
+        name: str = "token",
+        store: Optional[TokenStore] = None,
+        key: Optional[str] = None
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            fetch: Coroutine function requesting a new token
+            refresh_margin: Seconds before expiry when the token is refreshed
+            name: Name used in logs
+            store: Store shared with other processes, consulted before ``fetch``
+            key: Key of the credential set in the store (defaults to ``name``)
+        """
+        self.fetch = fetch
+        self.refresh_margin = refresh_margin
+        self.name = name
+        self.store = store
+        self.key = key or name
+        self.token: Optional[AccessToken] = None
+        self._rejected: Optional[str] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._background: Set[asyncio.Task] = set()
+        self._lifetime: Optional[float] = None
+        self._refreshed_at = float('-inf')
+
+    @property
+    def margin(self) -> float:
+        """
+        Refresh window of the tokens, capped to half of their lifetime so
+        that tokens living less than ``refresh_margin`` are not refreshed
+        as soon as they are obtained.
+        """
+        if self._lifetime is None:
+            return self.refresh_margin
+        return min(self.refresh_margin, self._lifetime / 2)
+
+    def _usable(self, token: Optional[AccessToken]) -> bool:
+        return token is not None and token.expires_in > 0
+
+    def _fresh(self, token: Optional[AccessToken]) -> bool:
+        return token is not None and token.expires_in > self.margin
+
+    async def get_token(self) -> str:
+        """
+        Return a valid token, fetching one only if there is none.
+
+        Returns:
+            str: The token value
+        """
+        token = self.token
+        if self._fresh(token):
+            return token.value
+        if self._usable(token):
+            self.refresh_in_background()
+            return token.value
+        return (await self.refresh()).value
+
+    async def refresh(self) -> AccessToken:
+        """Fetch a new token, joining the refresh already in flight if any."""
+
+        loop = asyncio.get_running_loop()
+        task = self._refreshing
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = self._refreshing = loop.create_task(self._refresh())
+        return await asyncio.shield(task)
+
+    async def _refresh(self) -> AccessToken:
+        if self.store is None:
+            token = await self.fetch()
+        else:
+            token = await self._refresh_from_store()
+        self.token = token
+        self._lifetime = max(0.0, token.expires_in)
+        self._refreshed_at = monotonic()
+        self._schedule(token)
+        return token
+
+    def _acceptable(self, token: Optional[AccessToken]) -> bool:
+        """Whether a stored token is fresh and was not rejected."""
+        return self._fresh(token) and token.value != self._rejected
+
+    async def _refresh_from_store(self) -> AccessToken:
+        """Reuse the token of another process, or fetch and share one."""
+
+        token = await asyncio.to_thread(self.store.load, self.key)
+        if self._acceptable(token):
+            return token
+
+        async with self.store.lock():
+            # Another process may have refreshed it while we were waiting
+            token = await asyncio.to_thread(self.store.load, self.key)
+            if self._acceptable(token):
+                return token
+
+            token = await self.fetch()
+            await asyncio.to_thread(self.store.save, self.key, token)
+            return token
+
+    def _schedule(self, token: AccessToken) -> None:
+        """Schedule the proactive refresh of a token on the running loop."""
+
+        if self._timer is not None:
+            self._timer.cancel()
+        delay = max(self.MIN_REFRESH_DELAY, token.expires_in - self.margin)
+        self._timer = asyncio.get_running_loop().call_later(
+            delay, self.refresh_in_background
+        )
+
+    def refresh_in_background(self) -> None:
+        """Start a refresh without waiting for it."""
+
+        if self._refreshing is not None and not self._refreshing.done():
+            return
+        if monotonic() - self._refreshed_at < self.MIN_REFRESH_DELAY:
+            # The token was just obtained: refreshing it again cannot help
+            return
+        task = asyncio.get_running_loop().create_task(self._background_refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            # The current token stays in use until it expires
+            logger.warning(f"Background refresh of {self.name} failed: {e}")
+
+    def invalidate(self, value: Optional[str] = None) -> None:
+        """
+        Forget the current token (only if it is still ``value`` when given),
+        e.g. after the provider rejected it.
+        """
+        if value is None or (self.token is not None and self.token.value == value):
+            self.token = None
+        if value is not None:
+            self._rejected = value      # Do not load it back from the store
+
+    async def call(self, request: Callable[[str], Awaitable[Any]]) -> Any:
+        """
+        Send an authenticated request, retrying it once on 401.
+
+        Args:
+            request: Coroutine function sending the request with a token and
+                returning a response with a ``status`` attribute
+
+        Returns:
+            Any: The response
+        """
+        token = await self.get_token()
+        response = await request(token)
+        if getattr(response, 'status', None) != 401:
+            return response
+
+        # Expired or revoked ahead of time, get a new one and try again
+        self.invalidate(token)
+        return await request(await self.get_token())
+
+    def close(self) -> None:
+        """Cancel the scheduled refresh."""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,16 @@
+"""
+EasySwitch - Webhook ingestion
+"""
+from easyswitch.webhooks.app import WebhookApp, WebhookCallback, WebhookStats
+from easyswitch.webhooks.dedup import DedupStats, WebhookDeduplicator
+from easyswitch.webhooks.spool import SpoolStats, WebhookSpool
+
+__all__ = [
+    'DedupStats',
+    'SpoolStats',
+    'WebhookApp',
+    'WebhookCallback',
+    'WebhookDeduplicator',
+    'WebhookSpool',
+    'WebhookStats',
+]
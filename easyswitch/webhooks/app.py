@@ -0,0 +1,447 @@
+"""
+EasySwitch - ASGI webhook ingestion application
+"""
+import asyncio
+import inspect
+import json
+import logging
+from dataclasses import dataclass
+from typing import (TYPE_CHECKING, Any, Awaitable, Callable, Dict, List,
+                    Optional, Tuple, Union)
+
+from multidict import CIMultiDict
+
+from easyswitch.exceptions import (AuthenticationError, DuplicateWebhookError,
+                                   EasySwitchError, WebhookValidationError)
+from easyswitch.types import Provider, WebhookEvent
+from easyswitch.webhooks.spool import WebhookSpool
+
+if TYPE_CHECKING:
+    from easyswitch.client import AsyncEasySwitch
+
+
+logger = logging.getLogger("easyswitch.webhooks")
+
+WebhookCallback = Callable[[WebhookEvent], Union[None, Awaitable[None]]]
+
+
+####
+##      WEBHOOK STATS
+#####
+@dataclass
+class WebhookStats:
+    """Counters of a webhook application."""
+
+    received: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    """ Requests refused as not authentic or malformed. """
+
+    throttled: int = 0
+    """ Authentic webhooks refused because the queue was full. """
+
+    duplicates: int = 0
+    """ Redelivered webhooks acknowledged without being queued. """
+
+    processed: int = 0
+    failed: int = 0
+    """ Event deliveries for which a callback raised. """
+
+    dead_lettered: int = 0
+    """ Spooled events moved to the dead letters after their last attempt. """
+
+
+####
+##      WEBHOOK APPLICATION
+#####
+class WebhookApp:
+    """
+    ASGI application receiving provider webhooks.
+
+    ``POST {prefix}/{provider}`` requests are verified and parsed by the
+    provider's adapter (see ``AsyncEasySwitch.handle_webhook``), then
+    acknowledged right away: events are put on a bounded queue that
+    ``workers`` tasks drain by calling the registered callbacks in order.
+
+    When the queue is full the request waits up to ``enqueue_timeout``
+    seconds for room, then is answered ``503`` with a ``Retry-After``
+    header, so that providers redeliver the webhook later instead of it
+    being lost. With the client's ``webhook_dedup`` enabled, redelivered
+    webhooks are acknowledged without reaching the callbacks.
+
+    With a ``spool``, events are written to disk before the webhook is
+    acknowledged and fed to the workers from there. A batch is marked
+    consumed once its callbacks have run, so events acknowledged but not
+    processed when the process stopped are delivered again on restart.
+    An event whose callbacks raise is delivered again, up to
+    ``max_attempts`` times with an exponential backoff, then moved to
+    the spool's dead letters (see ``WebhookSpool.dead_letters``).
+    ``queue_size`` then bounds the events spooled but not yet processed.
+
+    Examples:
+        >>> app = WebhookApp(client)
+        >>> @app.on_event
+        ... async def handle(event: WebhookEvent):
+        ...     ...
+        >>> # uvicorn module:app
+    """
+
+    def __init__(
+        self,
+        client: 'AsyncEasySwitch',
+        callbacks: Optional[List[WebhookCallback]] = None,
+        prefix: str = '/webhooks',
+        queue_size: int = 1000,
+        workers: int = 4,
+        enqueue_timeout: float = 0.5,
+        retry_after: int = 5,
+        max_body_size: int = 1024 * 1024,
+        spool: Optional[WebhookSpool] = None,
+        consumer: str = 'webhook-app',
+        max_attempts: int = 3,
+        retry_delay: float = 1.0
+    ):
+        """
+        Initialize the application.
+
+        Args:
+            client: Client used to verify and parse webhooks
+            callbacks: Functions (sync or async) called with each event
+            prefix: Path under which webhooks are received
+            queue_size: Maximum number of events waiting for the callbacks
+            workers: Number of tasks running the callbacks
+            enqueue_timeout: Seconds to wait for room in a full queue
+            retry_after: Seconds advertised to providers when throttled
+            max_body_size: Largest accepted request body (in bytes)
+            spool: Durable log events go through (in memory only by default)
+            consumer: Name of the app's offset in the spool
+            max_attempts: Deliveries of a spooled event before it is
+                moved to the dead letters
+            retry_delay: Seconds before the first redelivery (doubled
+                for each of the next ones)
+        """
+        self.client = client
+        self.callbacks: List[WebhookCallback] = list(callbacks or [])
+        self.prefix = ('/' + prefix.strip('/')).rstrip('/')
+        self.queue_size = queue_size
+        self.workers = workers
+        self.enqueue_timeout = enqueue_timeout
+        self.retry_after = retry_after
+        self.max_body_size = max_body_size
+        self.spool = spool
+        self.consumer = consumer
+        self.max_attempts = max(1, max_attempts)
+        self.retry_delay = retry_delay
+        self.stats = WebhookStats()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._backlog = 0
+        self._room: Optional[asyncio.Condition] = None
+
+    def on_event(self, callback: WebhookCallback) -> WebhookCallback:
+        """Register a callback (usable as a decorator)."""
+
+        self.callbacks.append(callback)
+        return callback
+
+    ####
+    ##      LIFECYCLE
+    #####
+    async def start(self) -> None:
+        """Create the queue and start the workers on the running loop."""
+
+        if self._tasks:
+            return
+        backlog = 0
+        if self.spool is not None:
+            # Keep the events of this consumer even while it is stopped
+            await asyncio.to_thread(self.spool.register, self.consumer)
+            backlog = await asyncio.to_thread(self.spool.lag, self.consumer)
+            if self._tasks:
+                return      # Started by a concurrent call meanwhile
+
+        # Nothing can be queued before the workers exist: no await from here
+        self._queue = asyncio.Queue(maxsize = self.queue_size)
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+        if self.spool is not None:
+            self._room = asyncio.Condition()
+            self._backlog = backlog
+            self._tasks.append(asyncio.create_task(self._dispatch()))
+
+    async def join(self) -> None:
+        """Wait until every queued (or spooled) event has been processed."""
+
+        if self._room is not None:
+            async with self._room:
+                await self._room.wait_for(lambda: self._backlog == 0)
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        """Process the queued events, then stop the workers."""
+
+        await self.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions = True)
+        self._tasks = []
+        self._queue = None
+        self._room = None
+
+    async def _dispatch(self) -> None:
+        """Feed the workers from the spool, committing each processed batch."""
+
+        while True:
+            changed = self.spool.changed
+            changed.clear()
+            batch = await asyncio.to_thread(
+                self.spool.read, self.consumer, self.queue_size
+            )
+            if not batch:
+                # The timeout covers events appended by other processes
+                try:
+                    await asyncio.wait_for(changed.wait(), 1.0)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            failed = await self._deliver(batch)
+            if failed:
+                self.stats.dead_lettered += len(failed)
+                logger.error(
+                    "%d webhook events moved to the dead letters of %s",
+                    len(failed), self.consumer
+                )
+            await asyncio.to_thread(
+                self.spool.commit, self.consumer, batch[-1][0], failed
+            )
+            async with self._room:
+                self._backlog = max(0, self._backlog - len(batch))
+                self._room.notify_all()
+
+    async def _deliver(
+        self,
+        batch: List[Tuple[int, WebhookEvent]]
+    ) -> List[Tuple[int, WebhookEvent]]:
+        """
+        Run the callbacks on a batch of spooled events, delivering the
+        failed ones again with backoff.
+
+        Returns:
+            List[Tuple[int, WebhookEvent]]: The events still failing
+        """
+        loop = asyncio.get_running_loop()
+        pending = batch
+        for attempt in range(self.max_attempts):
+            if attempt:
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+            outcomes = []
+            for _, event in pending:
+                outcome = loop.create_future()
+                await self._queue.put((event, outcome))
+                outcomes.append(outcome)
+            succeeded = await asyncio.gather(*outcomes)
+            pending = [entry for entry, ok in zip(pending, succeeded) if not ok]
+            if not pending:
+                break
+        return pending
+
+    async def _worker(self) -> None:
+        while True:
+            event, outcome = await self._queue.get()
+            succeeded = False
+            try:
+                for callback in self.callbacks:
+                    result = callback(event)
+                    if inspect.isawaitable(result):
+                        await result
+                self.stats.processed += 1
+                succeeded = True
+            except Exception:
+                self.stats.failed += 1
+                # Let a redelivery of the event through
+                self.client.forget_webhook(event)
+                logger.exception(
+                    "Webhook callback failed for %s event %s",
+                    event.provider, event.transaction_id
+                )
+            finally:
+                if outcome is not None and not outcome.done():
+                    outcome.set_result(succeeded)
+                self._queue.task_done()
+
+    async def _enqueue(self, event: WebhookEvent) -> bool:
+        """Queue an event, waiting at most ``enqueue_timeout`` for room."""
+
+        if self.spool is not None:
+            return await self._spool(event)
+        try:
+            self._queue.put_nowait((event, None))
+            return True
+        except asyncio.QueueFull:
+            pass
+        if self.enqueue_timeout <= 0:
+            return False
+        try:
+            await asyncio.wait_for(
+                self._queue.put((event, None)), self.enqueue_timeout
+            )
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _spool(self, event: WebhookEvent) -> bool:
+        """Write an event to the spool if the backlog has room for it."""
+
+        async with self._room:
+            try:
+                await asyncio.wait_for(
+                    self._room.wait_for(lambda: self._backlog < self.queue_size),
+                    self.enqueue_timeout
+                )
+            except asyncio.TimeoutError:
+                return False
+            self._backlog += 1
+        try:
+            await self.spool.append(event)
+        except BaseException:
+            async with self._room:
+                self._backlog -= 1
+            raise
+        return True
+
+    ####
+    ##      ASGI
+    #####
+    async def __call__(
+        self,
+        scope: Dict[str, Any],
+        receive: Callable[[], Awaitable[Dict[str, Any]]],
+        send: Callable[[Dict[str, Any]], Awaitable[None]]
+    ) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        # Servers without lifespan support: start on the first request
+        if not self._tasks:
+            await self.start()
+
+        status, body, headers = await self._handle(scope, receive)
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode()),
+                *headers
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await self.start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.stop()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _provider(self, path: str) -> Optional[Provider]:
+        """Return the configured provider a path is addressed to."""
+
+        head, _, name = path.rstrip('/').rpartition('/')
+        if head != self.prefix:
+            return None
+        try:
+            provider = Provider(name.upper())
+        except ValueError:
+            return None
+        return provider if provider.value in self.client.config.providers else None
+
+    async def _read_body(self, receive) -> Optional[bytes]:
+        """Read the request body, or None if it exceeds ``max_body_size``."""
+
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > self.max_body_size:
+                return None
+            chunks.append(chunk)
+            if not message.get('more_body', False):
+                break
+        return b''.join(chunks)
+
+    async def _handle(
+        self,
+        scope: Dict[str, Any],
+        receive
+    ) -> Tuple[int, bytes, List[Tuple[bytes, bytes]]]:
+        """Process a request, returning its status, body and extra headers."""
+
+        provider = self._provider(scope['path'])
+        if provider is None:
+            return _response(404, 'Unknown webhook endpoint')
+        if scope['method'] != 'POST':
+            return _response(405, 'Method not allowed', [(b'allow', b'POST')])
+
+        self.stats.received += 1
+        raw_body = await self._read_body(receive)
+        if raw_body is None:
+            self.stats.rejected += 1
+            return _response(413, 'Request body too large')
+
+        headers = CIMultiDict(
+            (key.decode('latin-1'), value.decode('latin-1'))
+            for key, value in scope['headers']
+        )
+        try:
+            event = await self.client.handle_webhook(raw_body, headers, provider)
+        except DuplicateWebhookError:
+            # Acknowledged so that the provider stops redelivering it
+            self.stats.duplicates += 1
+            return _response(200, 'duplicate')
+        except (WebhookValidationError, AuthenticationError) as e:
+            self.stats.rejected += 1
+            return _response(401 if e.code != 'malformed_body' else 400, e.message)
+        except (EasySwitchError, ValueError, KeyError, TypeError) as e:
+            self.stats.rejected += 1
+            logger.warning("Unprocessable %s webhook: %s", provider.value, e)
+            return _response(400, 'Unprocessable webhook')
+
+        try:
+            queued = await self._enqueue(event)
+        except Exception:
+            logger.exception("Could not spool %s webhook", provider.value)
+            queued = False
+        if not queued:
+            self.stats.throttled += 1
+            self.client.forget_webhook(event)
+            return _response(
+                503, 'Too many webhooks, retry later',
+                [(b'retry-after', str(self.retry_after).encode())]
+            )
+
+        self.stats.accepted += 1
+        return _response(200, 'accepted')
+
+
+def _response(
+    status: int,
+    message: str,
+    headers: Optional[List[Tuple[bytes, bytes]]] = None
+) -> Tuple[int, bytes, List[Tuple[bytes, bytes]]]:
+    body = json.dumps({'status': status, 'message': message}).encode()
+    return status, body, headers or []
@@ -0,0 +1,80 @@
+"""
+EasySwitch - Webhook deduplication
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+from easyswitch.types import WebhookEvent
+from easyswitch.utils.cache import CacheBackend, MemoryCache
+
+
+####
+##      DEDUPLICATION STATS
+#####
+@dataclass
+class DedupStats:
+    """Counters of a webhook deduplicator."""
+
+    unique: int = 0
+    duplicates: int = 0
+
+
+####
+##      WEBHOOK DEDUPLICATOR
+#####
+class WebhookDeduplicator:
+    """
+    Remembers the webhooks already received to drop redeliveries.
+
+    Providers redeliver a webhook until it is acknowledged, and often a
+    few more times. A webhook is identified by its provider, transaction,
+    event type and status, so a later status change of the same
+    transaction is still delivered. Entries expire after ``ttl`` seconds
+    and the backend bounds their number (least recently seen go first).
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttl: float = 86400.0
+    ):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            backend: Storage backend (in-memory LRU by default). A
+                SQLiteCache deduplicates across processes and restarts.
+            ttl: Seconds during which a redelivered webhook is dropped
+        """
+        self.backend = backend or MemoryCache(max_entries = 100_000)
+        self.ttl = ttl
+        self.stats = DedupStats()
+
+    @staticmethod
+    def key(event: WebhookEvent) -> str:
+        status = getattr(event.status, 'value', event.status)
+        provider = getattr(event.provider, 'value', event.provider)
+        return (
+            f"webhook:{str(provider).upper()}:{event.transaction_id}:"
+            f"{event.event_type}:{status}"
+        )
+
+    def seen(self, event: WebhookEvent) -> bool:
+        """
+        Record a webhook, telling whether it was already received.
+        Checking and recording is a single atomic operation of the
+        backend, so concurrent deliveries of a webhook let only one through.
+
+        Returns:
+            bool: True if the webhook is a duplicate
+        """
+        if self.backend.add(self.key(event), True, self.ttl):
+            self.stats.unique += 1
+            return False
+        self.stats.duplicates += 1
+        return True
+
+    def forget(self, event: WebhookEvent) -> None:
+        """Forget a webhook, e.g. when it could not be processed."""
+
+        self.backend.delete(self.key(event))
@@ -0,0 +1,314 @@
+"""
+EasySwitch - Durable webhook spool
+"""
+import asyncio
+import pickle
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from time import time
+from typing import List, Optional, Sequence, Tuple, Union
+
+from easyswitch.types import WebhookEvent
+
+
+####
+##      SPOOL STATS
+#####
+@dataclass
+class SpoolStats:
+    """Counters of a webhook spool."""
+
+    appended: int = 0
+    flushes: int = 0
+    """ Committed (fsynced) write batches. """
+
+    largest_batch: int = 0
+
+
+####
+##      WEBHOOK SPOOL
+#####
+class WebhookSpool:
+    """
+    Append-only log of webhook events in a SQLite file (WAL mode).
+
+    ``append`` returns once the event is on disk, so a webhook can be
+    acknowledged without risking its loss. Appends are group-committed:
+    while a batch is being written and fsynced, the next appends wait
+    and are all written by the next commit, so the fsync cost is shared
+    by every webhook received in the meantime.
+
+    Each consumer has an offset, the last event it processed. Events
+    after it are read again after a crash (at-least-once delivery), and
+    ``replay`` moves it back. Events a consumer could not process are
+    moved to its dead letters when it commits past them. Events every
+    known consumer is done with are deleted once older than ``retention``
+    seconds. A consumer is known once it has been ``register``-ed (or has
+    committed): events purged before that are not delivered to it, so
+    register every consumer before the events it needs are consumed.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_batch: int = 512,
+        retention: float = 86400.0
+    ):
+        """
+        Initialize the spool.
+
+        Args:
+            path: SQLite file of the spool
+            max_batch: Maximum events written by one commit
+            retention: Seconds consumed events are kept for replays
+                (one day by default, 0 deletes them on commit)
+        """
+        self.path = str(path)
+        self.max_batch = max_batch
+        self.retention = retention
+        self.stats = SpoolStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread = False, isolation_level = None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Every commit is fsynced: appended events survive a power loss
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS easyswitch_spool ("
+            "offset INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "received_at REAL NOT NULL, event BLOB NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS easyswitch_spool_offsets ("
+            "consumer TEXT PRIMARY KEY, offset INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS easyswitch_spool_dead ("
+            "consumer TEXT NOT NULL, offset INTEGER NOT NULL, "
+            "failed_at REAL NOT NULL, event BLOB NOT NULL, "
+            "PRIMARY KEY (consumer, offset))"
+        )
+        self._pending: List[Tuple[bytes, asyncio.Future]] = []
+        self._writer: Optional[asyncio.Task] = None
+        self._appended: Optional[asyncio.Event] = None
+
+    ####
+    ##      PRODUCER
+    #####
+    async def append(self, event: WebhookEvent) -> int:
+        """
+        Write an event to the spool.
+
+        Returns:
+            int: The offset of the event, once it is on disk
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(
+            (pickle.dumps(event, protocol = pickle.HIGHEST_PROTOCOL), future)
+        )
+        if self._writer is None or self._writer.done():
+            self._writer = loop.create_task(self._write_pending())
+        return await future
+
+    async def _write_pending(self) -> None:
+        """Commit the pending appends, batch after batch."""
+
+        while self._pending:
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            try:
+                offsets = await asyncio.to_thread(
+                    self._write, [blob for blob, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), offset in zip(batch, offsets):
+                if not future.done():
+                    future.set_result(offset)
+            self.stats.appended += len(batch)
+            self.stats.flushes += 1
+            self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+            self.changed.set()
+
+    def _write(self, blobs: List[bytes]) -> List[int]:
+        now = time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                offsets = [
+                    self._conn.execute(
+                        "INSERT INTO easyswitch_spool (received_at, event) "
+                        "VALUES (?, ?)", (now, blob)
+                    ).lastrowid
+                    for blob in blobs
+                ]
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return offsets
+
+    @property
+    def changed(self) -> asyncio.Event:
+        """Event set each time new events are committed."""
+
+        if self._appended is None:
+            self._appended = asyncio.Event()
+        return self._appended
+
+    ####
+    ##      CONSUMERS
+    #####
+    def register(self, consumer: str) -> None:
+        """
+        Declare a consumer, so that the events it has not read yet are kept
+        for it. A consumer registered anew starts from the oldest event.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO easyswitch_spool_offsets VALUES (?, 0)",
+                (consumer,)
+            )
+
+    def unregister(self, consumer: str) -> None:
+        """Forget a consumer that is gone, so it no longer holds events back."""
+
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM easyswitch_spool_offsets WHERE consumer = ?",
+                (consumer,)
+            )
+
+    def position(self, consumer: str) -> int:
+        """Return the offset of the last event the consumer processed."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT offset FROM easyswitch_spool_offsets WHERE consumer = ?",
+                (consumer,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def read(
+        self,
+        consumer: str,
+        limit: int = 100
+    ) -> List[Tuple[int, WebhookEvent]]:
+        """
+        Read the next events of a consumer (the offset is not moved).
+
+        Returns:
+            List[Tuple[int, WebhookEvent]]: Offsets and events, in order
+        """
+        position = self.position(consumer)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT offset, event FROM easyswitch_spool WHERE offset > ? "
+                "ORDER BY offset LIMIT ?", (position, limit)
+            ).fetchall()
+        return [(offset, pickle.loads(blob)) for offset, blob in rows]
+
+    def lag(self, consumer: str) -> int:
+        """Return the number of events the consumer has not processed yet."""
+
+        position = self.position(consumer)
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM easyswitch_spool WHERE offset > ?",
+                (position,)
+            ).fetchone()
+        return count
+
+    def commit(
+        self,
+        consumer: str,
+        offset: int,
+        failed: Sequence[Tuple[int, WebhookEvent]] = ()
+    ) -> None:
+        """
+        Record that the consumer is done with every event up to ``offset``.
+
+        Args:
+            consumer: The consumer moving its offset
+            offset: Last event the consumer is done with
+            failed: Offsets and events it could not process, kept in its
+                dead letters (in the same transaction)
+        """
+        now = time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO easyswitch_spool_dead VALUES (?, ?, ?, ?)",
+                    [
+                        (consumer, failed_offset, now,
+                         pickle.dumps(event, protocol = pickle.HIGHEST_PROTOCOL))
+                        for failed_offset, event in failed
+                    ]
+                )
+                self._conn.execute(
+                    "INSERT INTO easyswitch_spool_offsets VALUES (?, ?) "
+                    "ON CONFLICT (consumer) DO UPDATE SET offset = excluded.offset",
+                    (consumer, offset)
+                )
+                self._purge()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def dead_letters(self, consumer: str) -> List[Tuple[int, WebhookEvent]]:
+        """
+        Return the events the consumer could not process.
+
+        Returns:
+            List[Tuple[int, WebhookEvent]]: Offsets and events, in order
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT offset, event FROM easyswitch_spool_dead "
+                "WHERE consumer = ? ORDER BY offset", (consumer,)
+            ).fetchall()
+        return [(offset, pickle.loads(blob)) for offset, blob in rows]
+
+    def discard_dead_letter(self, consumer: str, offset: int) -> None:
+        """Remove a dead letter, e.g. once it was handled by hand."""
+
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM easyswitch_spool_dead WHERE consumer = ? AND offset = ?",
+                (consumer, offset)
+            )
+
+    def replay(self, consumer: str, from_offset: int = 0) -> None:
+        """
+        Make a consumer read the retained events again.
+        Only events still within ``retention`` can be replayed: with a
+        retention of 0, consumed events are already gone.
+
+        Args:
+            consumer: The consumer to rewind
+            from_offset: First offset to read again (oldest retained by default)
+        """
+        self.commit(consumer, max(0, from_offset - 1))
+
+    def _purge(self) -> None:
+        """Delete the events every known consumer is done with, once old enough."""
+
+        self._conn.execute(
+            "DELETE FROM easyswitch_spool WHERE offset <= "
+            "(SELECT MIN(offset) FROM easyswitch_spool_offsets) "
+            "AND received_at <= ?", (time() - self.retention,)
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
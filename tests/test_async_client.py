@@ -0,0 +1,118 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from easyswitch import AsyncEasySwitch, EasySwitch
+from easyswitch.types import (Currency, PaymentResponse, Provider,
+                              TransactionDetail, TransactionStatus,
+                              TransactionStatusResponse)
+
+
+@pytest.fixture
+def config_dict():
+    return {
+        "providers": {
+            "CINETPAY": {
+                "api_key": "test_api_key",
+                "extra": {
+                    "site_id": "test_site_id",
+                    "secret": "test_secret"
+                }
+            }
+        }
+    }
+
+@pytest.fixture
+def transaction():
+    return TransactionDetail(
+        transaction_id = "tx_1",
+        provider = Provider.CINETPAY,
+        amount = 1000,
+        currency = Currency.XOF,
+    )
+
+def _status(transaction_id):
+    return TransactionStatusResponse(
+        transaction_id = transaction_id,
+        provider = Provider.CINETPAY,
+        status = TransactionStatus.PENDING,
+        amount = 1000
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_send_payment(config_dict, transaction):
+    """The async client awaits the adapter on the running loop."""
+    client = AsyncEasySwitch.from_dict(config_dict)
+    adapter = client._get_integrator(Provider.CINETPAY)
+    adapter.send_payment = AsyncMock(
+        return_value = PaymentResponse(
+            transaction_id = "tx_1",
+            provider = Provider.CINETPAY,
+            status = TransactionStatus.PENDING,
+            amount = 1000,
+            currency = Currency.XOF
+        )
+    )
+
+    response = await client.send_payment(transaction)
+
+    assert response.transaction_id == "tx_1"
+    adapter.send_payment.assert_awaited_once_with(transaction = transaction)
+
+@pytest.mark.asyncio
+async def test_async_concurrent_status_checks(config_dict):
+    """Many calls can be in flight on one loop."""
+    client = AsyncEasySwitch.from_dict(config_dict)
+    adapter = client._get_integrator()
+    adapter.check_status = AsyncMock(side_effect = _status)
+
+    results = await asyncio.gather(*[
+        client.check_status(f"tx_{i}") for i in range(50)
+    ])
+
+    assert [r.transaction_id for r in results] == [f"tx_{i}" for i in range(50)]
+
+@pytest.mark.asyncio
+async def test_async_validate_webhook_accepts_sync_adapters(config_dict):
+    """Adapters with synchronous webhook methods are supported."""
+    client = AsyncEasySwitch.from_dict(config_dict)
+    adapter = client._get_integrator()
+    adapter.validate_webhook = MagicMock(return_value = True)
+
+    assert await client.validate_webhook({"a": 1}, {"x-token": "t"}) is True
+
+def test_sync_client_delegates_to_async_client(config_dict):
+    """The blocking facade shares its integrators with ``aio``."""
+    client = EasySwitch.from_dict(config_dict)
+    adapter = client._get_integrator()
+    adapter.check_status = AsyncMock(side_effect = _status)
+
+    assert client._integrators is client.aio._integrators
+    assert client.check_status("tx_1").transaction_id == "tx_1"
+
+def test_sync_client_background_loop(config_dict):
+    """With ``background_loop`` every call runs on the same loop thread."""
+    clients = [
+        EasySwitch.from_dict({**config_dict, "background_loop": True})
+        for _ in range(2)
+    ]
+    loops = []
+
+    async def check_status(transaction_id):
+        loops.append(asyncio.get_running_loop())
+        return _status(transaction_id)
+
+    for client in clients:
+        client._get_integrator().check_status = check_status
+
+    with clients[0] as first, clients[1] as second:
+        first.check_status("tx_1")
+        first.check_status("tx_2")
+        second.check_status("tx_3")
+
+        # One loop per process, shared by every sync client
+        assert loops[0] is loops[1] is loops[2]
+        assert first._loop is second._loop
+        assert first._loop.is_running
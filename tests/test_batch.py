@@ -0,0 +1,208 @@
+import asyncio
+
+import pytest
+
+from easyswitch import AsyncEasySwitch, EasySwitch
+from easyswitch.exceptions import PaymentError
+from easyswitch.types import (Currency, PaymentResponse, Provider,
+                              TransactionDetail, TransactionStatus,
+                              TransactionStatusResponse)
+from easyswitch.utils.batch import BatchResults
+
+
+@pytest.fixture
+def config_dict():
+    return {
+        "providers": {
+            "CINETPAY": {
+                "api_key": "test_api_key",
+                "extra": {"site_id": "test_site_id", "secret": "test_secret"}
+            }
+        }
+    }
+
+def _transactions(count):
+    for i in range(count):
+        yield TransactionDetail(
+            transaction_id = f"tx_{i}",
+            provider = Provider.CINETPAY,
+            amount = 1000,
+            currency = Currency.XOF,
+        )
+
+def _fake_send_payment(in_flight, peak, fail_every = 0):
+    async def send_payment(transaction):
+        in_flight.append(transaction)
+        peak[0] = max(peak[0], len(in_flight))
+        await asyncio.sleep(0.001)
+        in_flight.remove(transaction)
+        index = int(transaction.transaction_id.split("_")[1])
+        if fail_every and index % fail_every == 0:
+            raise PaymentError("declined")
+        return PaymentResponse(
+            transaction_id = transaction.transaction_id,
+            provider = Provider.CINETPAY,
+            status = TransactionStatus.PENDING,
+            amount = transaction.amount,
+            currency = transaction.currency
+        )
+    return send_payment
+
+
+@pytest.mark.asyncio
+async def test_send_payments_bounds_concurrency(config_dict):
+    """No more than ``concurrency`` payments are in flight at once."""
+    client = AsyncEasySwitch.from_dict(config_dict)
+    in_flight, peak = [], [0]
+    client._get_integrator().send_payment = _fake_send_payment(in_flight, peak)
+
+    batch = client.send_payments(_transactions(200), concurrency = 8)
+    results = [result async for result in batch]
+
+    assert len(results) == 200
+    assert peak[0] == 8
+    assert sorted(r.index for r in results) == list(range(200))
+    assert batch.summary.succeeded == 200
+
+@pytest.mark.asyncio
+async def test_send_payments_isolates_failures(config_dict):
+    """A failing payment is reported without aborting the batch."""
+    client = AsyncEasySwitch.from_dict(config_dict)
+    client._get_integrator().send_payment = _fake_send_payment([], [0], fail_every = 10)
+
+    batch = client.send_payments(_transactions(50), concurrency = 5)
+    results = await batch.collect()
+
+    failed = [r for r in results if not r.ok]
+    assert len(failed) == 5
+    assert all(isinstance(r.error, PaymentError) for r in failed)
+    assert batch.summary.failed == 5
+    assert batch.summary.succeeded == 45
+    assert batch.summary.errors == {"PaymentError": 5}
+
+@pytest.mark.asyncio
+async def test_batch_accepts_async_iterables():
+    """Items can come from an async generator."""
+
+    async def items():
+        for i in range(20):
+            yield i
+
+    async def double(item):
+        return item * 2
+
+    results = await BatchResults(items(), double, concurrency = 4).collect()
+
+    assert sorted(r.response for r in results) == [i * 2 for i in range(20)]
+
+@pytest.mark.asyncio
+async def test_batch_stops_early():
+    """Breaking out of the iteration cancels pending items."""
+    started = []
+
+    async def slow(item):
+        started.append(item)
+        await asyncio.sleep(0.01)
+        return item
+
+    batch = BatchResults(range(1000), slow, concurrency = 4)
+    async for _ in batch:
+        break
+    await batch.aclose()
+
+    assert len(started) < 20
+
+def test_sync_send_payments(config_dict):
+    """The sync client returns every result with the summary."""
+    client = EasySwitch.from_dict(config_dict)
+    client._get_integrator().send_payment = _fake_send_payment([], [0], fail_every = 4)
+
+    report = client.send_payments(_transactions(20), concurrency = 4)
+
+    assert len(report.results) == 20
+    assert report.summary.failed == 5
+
+@pytest.mark.asyncio
+async def test_check_statuses_respects_provider_caps():
+    """Each provider never sees more than its cap in flight."""
+    client = AsyncEasySwitch.from_dict({
+        "providers": {
+            "CINETPAY": {
+                "api_key": "test_api_key",
+                "max_concurrency": 2,
+                "extra": {"site_id": "test_site_id", "secret": "test_secret"}
+            },
+            "FEDAPAY": {"api_secret": "test_secret"}
+        }
+    })
+    in_flight = {Provider.CINETPAY: 0, Provider.FEDAPAY: 0}
+    peaks = dict(in_flight)
+
+    def fake_check_status(provider):
+        async def check_status(transaction_id):
+            in_flight[provider] += 1
+            peaks[provider] = max(peaks[provider], in_flight[provider])
+            await asyncio.sleep(0.001)
+            in_flight[provider] -= 1
+            return TransactionStatusResponse(
+                transaction_id = transaction_id,
+                provider = provider,
+                status = TransactionStatus.SUCCESSFUL,
+                amount = 100
+            )
+        return check_status
+
+    for provider in in_flight:
+        client._get_integrator(provider).check_status = fake_check_status(provider)
+
+    batch = client.check_statuses(
+        {
+            Provider.CINETPAY: (f"c_{i}" for i in range(30)),
+            Provider.FEDAPAY: [f"f_{i}" for i in range(30)],
+        },
+        concurrency = 10,
+        provider_concurrency = {Provider.FEDAPAY: 3}
+    )
+    results = await batch.collect()
+
+    assert batch.summary.succeeded == 60
+    assert peaks == {Provider.CINETPAY: 2, Provider.FEDAPAY: 3}
+    assert {r.provider for r in results} == {Provider.CINETPAY, Provider.FEDAPAY}
+    assert all(r.response.transaction_id == r.transaction_id for r in results)
+
+@pytest.mark.asyncio
+async def test_provider_at_its_cap_does_not_starve_the_others():
+    client = AsyncEasySwitch.from_dict({
+        "providers": {
+            "CINETPAY": {
+                "api_key": "test_api_key",
+                "max_concurrency": 1,
+                "extra": {"site_id": "test_site_id", "secret": "test_secret"}
+            },
+            "FEDAPAY": {"api_secret": "test_secret"}
+        }
+    })
+    release = asyncio.Event()
+    fedapay_done = []
+
+    async def stuck(transaction_id):
+        await release.wait()
+
+    async def check_status(transaction_id):
+        fedapay_done.append(transaction_id)
+        if len(fedapay_done) == 10:
+            release.set()
+
+    client._get_integrator(Provider.CINETPAY).check_status = stuck
+    client._get_integrator(Provider.FEDAPAY).check_status = check_status
+
+    batch = client.check_statuses(
+        {
+            Provider.CINETPAY: [f"c_{i}" for i in range(10)],
+            Provider.FEDAPAY: [f"f_{i}" for i in range(10)],
+        },
+        concurrency = 2
+    )
+    results = await asyncio.wait_for(batch.collect(), 1)
+
+    assert len(results) == 20 and batch.summary.failed == 0
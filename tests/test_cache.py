@@ -0,0 +1,90 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from easyswitch import AsyncEasySwitch
+from easyswitch.types import (Provider, TransactionStatus,
+                              TransactionStatusResponse)
+from easyswitch.utils.cache import LookupCache, MemoryCache, SQLiteCache
+
+
+def _status(status, transaction_id = "tx_1"):
+    return TransactionStatusResponse(
+        transaction_id = transaction_id,
+        provider = Provider.CINETPAY,
+        status = status,
+        amount = 1000
+    )
+
+
+@pytest.fixture(params = ["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        backend = MemoryCache(max_entries = 2)
+    else:
+        backend = SQLiteCache(tmp_path / "cache.db", max_entries = 2)
+    yield backend
+    backend.close()
+
+
+def test_backend_expiry(backend):
+    backend.set("a", _status(TransactionStatus.PENDING), ttl = 60)
+    backend.set("b", "expired", ttl = -1)
+
+    assert backend.get("a").status == TransactionStatus.PENDING
+    assert backend.get("b") is None
+    assert backend.get("missing") is None
+
+def test_backend_lru_eviction(backend):
+    backend.set("a", 1, ttl = 60)
+    backend.set("b", 2, ttl = 60)
+    assert backend.get("a") == 1        # "b" becomes least recently used
+    backend.set("c", 3, ttl = 60)
+
+    assert backend.get("b") is None
+    assert (backend.get("a"), backend.get("c")) == (1, 3)
+
+def test_ttl_by_status():
+    cache = LookupCache(ttls = {"pending": 2})
+
+    assert cache.ttl_for(_status(TransactionStatus.SUCCESSFUL)) == 86400
+    assert cache.ttl_for(_status(TransactionStatus.PENDING)) == 2
+    assert cache.ttl_for(_status(TransactionStatus.UNKNOWN)) == 0
+
+    cache.set("k", _status(TransactionStatus.ERROR))
+    assert cache.get("k") is None       # Not cached
+
+
+@pytest.mark.asyncio
+async def test_client_serves_terminal_statuses_from_cache(tmp_path):
+    client = AsyncEasySwitch.from_dict({
+        "providers": {
+            "CINETPAY": {
+                "api_key": "test_api_key",
+                "extra": {"site_id": "test_site_id", "secret": "test_secret"}
+            }
+        },
+        "cache": {"backend": "sqlite", "path": str(tmp_path / "lookups.db")}
+    })
+    adapter = client._get_integrator(Provider.CINETPAY)
+    adapter.check_status = AsyncMock(
+        side_effect = lambda tx: _status(
+            TransactionStatus.SUCCESSFUL if tx == "done" else TransactionStatus.ERROR, tx
+        )
+    )
+
+    for _ in range(3):
+        assert (await client.check_status("done")).status == TransactionStatus.SUCCESSFUL
+        await client.check_status("error")
+
+    assert [c.args[0] for c in adapter.check_status.await_args_list] == (
+        ["done"] + ["error"] * 3
+    )
+    assert client.lookup_cache.stats.hits == 2
+
+    # A refund changes the transaction state
+    adapter.refund = AsyncMock()
+    await client.refund("done")
+    await client.check_status("done")
+    assert adapter.check_status.await_count == 5
@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from easyswitch.client import EasySwitch
+from easyswitch.exceptions import CircuitOpenError
+from easyswitch.utils.circuit import (CircuitBreaker, CircuitBreakerRegistry,
+                                      CircuitState)
+from easyswitch.utils.http import HTTPClient
+from easyswitch.utils.retry import RetryPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(**options):
+    clock = FakeClock()
+    options = {
+        "window_size": 4, "minimum_calls": 4, "open_duration": 10,
+        "half_open_calls": 2, "clock": clock, **options
+    }
+    return CircuitBreaker("test", **options), clock
+
+
+def test_opens_on_failure_rate():
+    breaker, _ = make_breaker()
+
+    for success in (True, False, True):
+        breaker.record(success, 0.1)
+    assert breaker.state is CircuitState.CLOSED     # Not enough calls yet
+
+    breaker.record(False, 0.1)
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.acquire()
+    assert exc.value.retry_after == 10
+
+def test_opens_on_slow_calls():
+    breaker, _ = make_breaker(slow_call_duration = 1, slow_call_rate_threshold = 0.75)
+
+    for duration in (2, 2, 0.1, 2):
+        breaker.record(True, duration)
+    assert breaker.state is CircuitState.OPEN
+
+def test_half_open_trials():
+    breaker, clock = make_breaker()
+    for _ in range(4):
+        breaker.record(False, 0.1)
+
+    clock.now = 10
+    assert breaker.state is CircuitState.HALF_OPEN
+    breaker.acquire()
+    breaker.acquire()
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()               # All trial calls are in flight
+
+    breaker.record(True, 0.1)
+    breaker.record(True, 0.1)
+    assert breaker.state is CircuitState.CLOSED
+
+def test_failed_trial_reopens():
+    breaker, clock = make_breaker()
+    for _ in range(4):
+        breaker.record(False, 0.1)
+
+    clock.now = 10
+    breaker.acquire()
+    breaker.record(False, 0.1)
+    assert breaker.state is CircuitState.OPEN
+
+def test_registry_keys_by_endpoint_template():
+    registry = CircuitBreakerRegistry(
+        "BIZAO",
+        {"payment": "/v1", "status": "/v1/getStatus/{transaction_id}"}
+    )
+
+    assert registry.endpoint_key("/v1/getStatus/abc123") == "status"
+    assert registry.endpoint_key("v1") == "payment"
+    assert registry.endpoint_key("/v2/orders/ord_8f3k2j9?x=1") == "/v2/orders/:id"
+    assert registry.for_endpoint("/v1/getStatus/a") is registry.for_endpoint("/v1/getStatus/b")
+    assert registry.for_endpoint("/v1/getStatus/a").name == "BIZAO:status"
+
+
+@pytest_asyncio.fixture
+async def failing_server():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.path)
+        return web.json_response({}, status = 500)
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", calls
+    await runner.cleanup()
+
+@pytest.mark.asyncio
+async def test_http_client_fails_fast(failing_server):
+    url, calls = failing_server
+    client = HTTPClient(
+        url,
+        retry_policy = RetryPolicy(max_retries = 0),
+        circuit_breakers = CircuitBreakerRegistry(
+            "TEST", {"status": "/status/{id}"}, window_size = 3, minimum_calls = 3
+        )
+    )
+    try:
+        for i in range(3):
+            assert (await client.get(f"/status/{i}")).status == 500
+        with pytest.raises(CircuitOpenError):
+            await client.get("/status/4")
+        assert len(calls) == 3
+
+        # Other endpoints have their own circuit
+        assert (await client.get("/other")).status == 500
+    finally:
+        await client.close_session()
+
+
+def test_circuit_states_from_client():
+    client = EasySwitch.from_dict({
+        "providers": {
+            "CINETPAY": {
+                "api_key": "test_api_key",
+                "extra": {"site_id": "test_site_id", "secret": "test_secret"},
+                "circuit_breaker": {"minimum_calls": 1, "window_size": 1}
+            }
+        }
+    })
+    adapter = client._get_integrator("CINETPAY")
+    adapter.get_client().circuit_breakers.for_endpoint("/v2/payment").record(False, 0.1)
+
+    states = client.circuit_states()["CINETPAY"]
+    assert [s.state for s in states.values()] == [CircuitState.OPEN]
+
+def test_circuit_breakers_are_opt_in():
+    client = EasySwitch.from_dict({
+        "providers": {
+            "CINETPAY": {
+                "api_key": "test_api_key",
+                "extra": {"site_id": "test_site_id", "secret": "test_secret"}
+            }
+        }
+    })
+    adapter = client._get_integrator("CINETPAY")
+
+    assert adapter.get_client().circuit_breakers is None
+    assert client.circuit_states()["CINETPAY"] == {}
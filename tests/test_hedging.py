@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from easyswitch import AsyncEasySwitch
+from easyswitch.types import Provider
+from easyswitch.utils.hedging import Hedger, LatencyTracker
+from easyswitch.utils.retry import RetryBudget
+
+
+def _warm(hedger, latency = 0.01, count = 20):
+    for _ in range(count):
+        hedger.latencies.record(latency)
+
+
+def test_percentile():
+    tracker = LatencyTracker()
+    for i in range(1, 101):
+        tracker.record(i / 100)
+
+    assert tracker.percentile(0.95) == 0.96
+    assert LatencyTracker().percentile(0.95) is None
+
+def test_delay_needs_samples():
+    hedger = Hedger(RetryBudget(), min_delay = 0.02, min_samples = 5)
+    assert hedger.delay() is None
+
+    _warm(hedger, 0.001, 5)
+    assert hedger.delay() == 0.02       # Clamped to min_delay
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged():
+    hedger = Hedger(RetryBudget(ratio = 1, reserve = 1), min_delay = 0.01)
+    _warm(hedger)
+    delays = [1.0, 0.0]
+    cancelled = []
+
+    async def call():
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    assert await asyncio.wait_for(hedger.run(call), 0.5) == 0.0
+    assert hedger.stats.hedges == hedger.stats.hedge_wins == 1
+    await asyncio.sleep(0)
+    assert cancelled == [1.0]
+
+@pytest.mark.asyncio
+async def test_budget_caps_hedges():
+    hedger = Hedger(RetryBudget(ratio = 0, reserve = 0), min_delay = 0.01)
+    _warm(hedger)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    assert await hedger.run(call) == "ok"
+    assert len(calls) == 1 and hedger.stats.hedges == 0
+
+@pytest.mark.asyncio
+async def test_client_lookups_are_hedged():
+    client = AsyncEasySwitch.from_dict({
+        "providers": {
+            "CINETPAY": {
+                "api_key": "test_api_key",
+                "extra": {"site_id": "test_site_id", "secret": "test_secret"},
+                "hedging": {"min_samples": 1, "min_delay": 0.01}
+            }
+        },
+        "max_hedge_rate": 1
+    })
+    adapter = client._get_integrator(Provider.CINETPAY)
+    calls = []
+
+    async def check_status(transaction_id):
+        calls.append(transaction_id)
+        await asyncio.sleep(0.5 if len(calls) == 2 else 0)
+        return len(calls)
+
+    adapter.check_status = check_status
+
+    assert await client.check_status("tx_1") == 1     # Records a latency
+    assert await client.check_status("tx_2") == 3     # Slow, hedge wins
+    assert calls == ["tx_1", "tx_2", "tx_2"]
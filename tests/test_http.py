@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from easyswitch.integrators.cinetpay import CinetpayAdapter
+from easyswitch.conf import ProviderConfig
+from easyswitch.utils.http import (ConnectionPoolManager, HTTPClient,
+                                   _close_detached)
+
+
+@pytest.fixture
+def cinetpay_adapter():
+    return CinetpayAdapter(
+        ProviderConfig(
+            api_key = "test_api_key",
+            extra = {"site_id": "test_site_id", "secret": "test_secret"}
+        ),
+        context = {}
+    )
+
+
+def test_adapter_keeps_one_http_client(cinetpay_adapter):
+    """Adapters reuse the same HTTPClient for every request."""
+    assert cinetpay_adapter.get_client() is cinetpay_adapter.get_client()
+    assert cinetpay_adapter.get_client() is cinetpay_adapter.client
+
+def test_session_is_restarted_on_a_new_loop():
+    """A session bound to a closed loop is replaced instead of reused."""
+    client = HTTPClient("http://127.0.0.1")
+
+    async def start():
+        await client.start_session()
+        return client._session
+
+    first = asyncio.run(start())
+    second = asyncio.run(start())
+
+    assert first is not second
+    asyncio.run(client.close_session())
+
+@pytest.mark.asyncio
+async def test_session_survives_across_requests():
+    """On one loop, the session is started once and kept open."""
+    client = HTTPClient("http://127.0.0.1")
+    await client.start_session()
+    session = client._session
+    await client.start_session()
+
+    assert client._session is session
+    await client.close_session()
+    assert client.is_closed
+
+@pytest.mark.asyncio
+async def test_pool_manager_shares_connectors_per_endpoint():
+    """Clients for the same endpoint share one connector."""
+    manager = ConnectionPoolManager(limit = 10, limit_per_host = 2)
+    first = HTTPClient("https://api.example.com/v1", pool_manager = manager)
+    second = HTTPClient("https://api.example.com/v2", pool_manager = manager)
+    other = HTTPClient("https://other.example.com", pool_manager = manager)
+
+    for client in (first, second, other):
+        await client.start_session()
+
+    assert first.connector is second.connector
+    assert first.connector is not other.connector
+    assert first.connector.limit_per_host == 2
+
+    # Closing a session leaves the shared connector open
+    await first.close_session()
+    assert not second.connector.closed
+
+    await second.close_session()
+    await other.close_session()
+    await manager.close()
+
+def test_sync_client_closes_the_connectors_of_its_loops():
+    """Without a background loop, each call's connectors die with its loop."""
+    from easyswitch import EasySwitch
+    from easyswitch.types import Provider
+
+    manager = ConnectionPoolManager()
+    client = EasySwitch.from_dict({
+        "providers": {
+            "CINETPAY": {
+                "api_key": "test_api_key",
+                "extra": {"site_id": "test_site_id", "secret": "test_secret"}
+            }
+        }
+    })
+    http = client.aio._get_integrator(Provider.CINETPAY).get_client()
+    http.pool_manager = manager
+
+    async def call():
+        await http.start_session()
+        return http.connector
+
+    connectors = [client._run(call()) for _ in range(2)]
+
+    assert all(connector.closed for connector in connectors)
+    assert manager._connectors == {}
+
+def test_connectors_of_closed_loops_are_closed_when_purged():
+    manager = ConnectionPoolManager()
+
+    async def connect():
+        return manager.get_connector("http://127.0.0.1")
+
+    connector = asyncio.run(connect())
+    asyncio.run(connect())
+
+    assert connector.closed
+
+def test_synchronous_connector_close_is_supported():
+    """aiohttp < 3.12 closes connectors synchronously."""
+    closed = []
+
+    class Connector:
+        def close(self):
+            closed.append(True)
+            return object()     # Like aiohttp's _DeprecationWaiter
+
+    _close_detached(Connector())
+
+    assert closed == [True]
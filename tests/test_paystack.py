@@ -20,18 +20,6 @@ def adapter():
     )
 
 
-# small helper that acts as an async context manager returning the provided object
-class _AsyncCtx:
-    def __init__(self, obj):
-        self._obj = obj
-
-    async def __aenter__(self):
-        return self._obj
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
-
-
 @pytest.mark.asyncio
 async def test_validate_webhook_valid_signature(adapter):
     """Should return True for valid webhook signature."""
@@ -87,8 +75,8 @@ async def test_send_payment_success(adapter):
     }
     mock_client.post.return_value = mock_response
 
-    # make get_client() return an async context manager that yields mock_client
-    adapter.get_client = lambda: _AsyncCtx(mock_client)
+    # make get_client() return the mocked long-lived client
+    adapter.get_client = lambda: mock_client
 
     response = await adapter.send_payment(transaction)
 
@@ -109,7 +97,7 @@ async def test_check_status_success(adapter):
     }
     mock_client.get.return_value = mock_response
 
-    adapter.get_client = lambda: _AsyncCtx(mock_client)
+    adapter.get_client = lambda: mock_client
 
     result = await adapter.check_status("ref_123")
 
@@ -122,3 +110,15 @@ async def test_cancel_transaction_raises(adapter):
     """Paystack does not support cancel; should raise."""
     with pytest.raises(Exception):
         await adapter.cancel_transaction("tx_1")
+
+
+@pytest.mark.asyncio
+async def test_handle_webhook_verifies_raw_body(adapter):
+    """Should verify the signature over the bytes received, whatever their layout."""
+    raw_body = b'{"event": "charge.success", "data": {"reference": "ref_1", "amount": 5000}}'
+    sig = hmac.new(b"test_key", msg=raw_body, digestmod=hashlib.sha512).hexdigest()
+
+    event = await adapter.handle_webhook(raw_body, {"X-Paystack-Signature": sig})
+
+    assert event.transaction_id == "ref_1"
+    assert event.amount == 50
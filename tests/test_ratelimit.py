@@ -0,0 +1,59 @@
+import asyncio
+from time import monotonic
+
+import pytest
+
+from easyswitch.conf import ProviderConfig
+from easyswitch.integrators.cinetpay import CinetpayAdapter
+from easyswitch.utils.ratelimit import TokenBucket
+
+
+def test_burst_is_not_throttled():
+    """A full bucket lets `burst` requests through without waiting."""
+    bucket = TokenBucket(rate = 1, burst = 3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() > 0.9
+    assert bucket.stats.requests == 4
+    assert bucket.stats.throttled == 1
+
+@pytest.mark.asyncio
+async def test_requests_are_paced():
+    """Concurrent callers share the bucket and are spread over time."""
+    bucket = TokenBucket(rate = 50, burst = 1)
+
+    start = monotonic()
+    await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+    elapsed = monotonic() - start
+
+    assert elapsed >= 5 / 50 * 0.9
+    assert bucket.stats.throttled == 5
+    assert bucket.stats.total_wait > bucket.stats.max_wait > 0
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_gives_token_back():
+    bucket = TokenBucket(rate = 1, burst = 1)
+    await bucket.acquire()
+
+    task = asyncio.ensure_future(bucket.acquire())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # Only the cancelled reservation was returned, next one waits ~1s
+    assert 0.5 < bucket.reserve() <= 1.0
+
+def test_adapter_builds_limiter_from_config():
+    adapter = CinetpayAdapter(
+        ProviderConfig(
+            api_key = "test_api_key",
+            extra = {"site_id": "test_site_id", "secret": "test_secret"},
+            rate_limit = {"requests_per_second": 5, "burst": 2}
+        ),
+        context = {}
+    )
+    limiter = adapter.get_client().rate_limiter
+
+    assert limiter.rate == 5 and limiter.burst == 2
+    assert adapter.get_client().rate_limiter is limiter
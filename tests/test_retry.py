@@ -0,0 +1,167 @@
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from easyswitch.exceptions import NetworkError, RateLimitError
+from easyswitch.utils.http import HTTPClient
+from easyswitch.utils.retry import Jitter, RetryBudget, RetryPolicy
+
+
+def test_backoff_jitter_bounds():
+    full = RetryPolicy(base_delay = 1, max_delay = 5, jitter = Jitter.FULL)
+    decorrelated = RetryPolicy(base_delay = 1, max_delay = 5, jitter = "decorrelated")
+    none = RetryPolicy(base_delay = 1, max_delay = 5, jitter = Jitter.NONE)
+
+    for attempt in range(6):
+        assert 0 <= full.backoff(attempt) <= min(5, 2 ** attempt)
+        assert 1 <= decorrelated.backoff(attempt, previous = 1.5) <= 4.5
+    assert [none.backoff(a) for a in range(4)] == [1, 2, 4, 5]
+
+def test_parse_retry_after():
+    later = datetime.now(timezone.utc) + timedelta(seconds = 30)
+
+    assert RetryPolicy.parse_retry_after("12") == 12.0
+    assert 25 < RetryPolicy.parse_retry_after(format_datetime(later, usegmt = True)) <= 30
+    assert RetryPolicy.parse_retry_after("soon") is None
+    assert RetryPolicy.parse_retry_after(None) is None
+
+def test_non_idempotent_requests_only_retry_throttling():
+    policy = RetryPolicy()
+
+    assert policy.should_retry_status("GET", 503)
+    assert not policy.should_retry_status("POST", 503)
+    assert policy.should_retry_status("POST", 429)
+    assert not policy.should_retry_status("GET", 400)
+
+def test_budget_caps_retries():
+    budget = RetryBudget(ratio = 0.5, reserve = 1)
+    policy = RetryPolicy(max_retries = 5, base_delay = 0, budget = budget)
+
+    assert policy.next_delay(0) is not None       # reserve
+    assert policy.next_delay(1) is None           # budget spent
+    policy.on_request()
+    policy.on_request()                           # 2 * 0.5 = one more retry
+    assert policy.next_delay(0) is not None
+    assert budget.stats.retries == 2 and budget.stats.rejected == 1
+
+def test_retry_after_above_limit_is_not_waited():
+    policy = RetryPolicy(max_retry_after = 10)
+
+    assert policy.next_delay(0, retry_after = 60) is None
+    assert policy.next_delay(0, retry_after = 2) >= 2
+
+
+@pytest_asyncio.fixture
+async def flaky_server():
+    """Local server answering with queued statuses, then 200."""
+    state = {"responses": [], "calls": 0, "disconnects": 0}
+
+    async def handler(request):
+        state["calls"] += 1
+        await request.read()
+        if state["disconnects"]:
+            # Drop the connection once the request has been received
+            state["disconnects"] -= 1
+            request.transport.close()
+            return web.Response()
+        if state["responses"]:
+            status, headers = state["responses"].pop(0)
+            return web.json_response({}, status = status, headers = headers)
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_route("*", "/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    client = HTTPClient(
+        f"http://127.0.0.1:{port}",
+        retry_policy = RetryPolicy(max_retries = 3, base_delay = 0)
+    )
+    yield client, state
+
+    await client.close_session()
+    await runner.cleanup()
+
+@pytest.mark.asyncio
+async def test_transient_statuses_are_retried(flaky_server):
+    client, state = flaky_server
+    state["responses"] = [(503, {}), (502, {})]
+
+    response = await client.get("/")
+
+    assert response.status == 200
+    assert state["calls"] == 3
+
+@pytest.mark.asyncio
+async def test_post_is_retried_on_429_only(flaky_server):
+    client, state = flaky_server
+    state["responses"] = [(429, {"Retry-After": "0"})]
+    assert (await client.post("/", json_data = {})).status == 200
+
+    state["responses"] = [(503, {})]
+    assert (await client.post("/", json_data = {})).status == 503
+    assert state["calls"] == 3
+
+@pytest.mark.asyncio
+async def test_persistent_throttling_raises(flaky_server):
+    client, state = flaky_server
+    state["responses"] = [(429, {})] * 4
+
+    with pytest.raises(RateLimitError):
+        await client.get("/")
+    assert state["calls"] == 4
+
+@pytest.mark.asyncio
+async def test_disconnected_post_is_not_sent_twice(flaky_server):
+    client, state = flaky_server
+    state["disconnects"] = 1
+
+    with pytest.raises(NetworkError):
+        await client.post("/", json_data = {"amount": 100})
+    assert state["calls"] == 1
+
+    state["disconnects"] = 1
+    assert (await client.get("/")).status == 200
+    assert state["calls"] == 3
+
+@pytest.mark.asyncio
+async def test_unreachable_endpoint_is_retried_whatever_the_method():
+    policy = RetryPolicy(max_retries = 2, base_delay = 0)
+    assert policy.should_retry_error("POST", connected = False)
+    assert not policy.should_retry_error("POST", connected = True)
+    assert policy.should_retry_error("GET", connected = True)
+
+    # Nothing listens on port 9 of the loopback
+    client = HTTPClient("http://127.0.0.1:9", retry_policy = policy)
+    with pytest.raises(NetworkError) as error:
+        await client.post("/", json_data = {})
+    assert error.value.details["attempts"] == 3
+    await client.close_session()
+
+def test_retry_policy_is_opt_in():
+    from easyswitch import AsyncEasySwitch
+    from easyswitch.types import Provider
+
+    def policy(**settings):
+        client = AsyncEasySwitch.from_dict({
+            "providers": {
+                "FEDAPAY": {"api_secret": "test_secret", **settings}
+            }
+        })
+        return client._get_integrator(Provider.FEDAPAY).get_client().retry_policy
+
+    default = policy()
+    assert not default.should_retry_status("GET", 503)
+    assert default.budget is None
+    assert [default.backoff(a) for a in range(3)] == [1, 2, 4]
+
+    configured = policy(retry = {})
+    assert configured.should_retry_status("GET", 503)
+    assert configured.budget is not None
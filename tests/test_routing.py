@@ -0,0 +1,128 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from easyswitch import AsyncEasySwitch
+from easyswitch.exceptions import (CircuitOpenError, ConfigurationError,
+                                   PaymentError)
+from easyswitch.routing import Router
+from easyswitch.types import (Currency, CustomerInfo, PaymentResponse,
+                              Provider, TransactionDetail, TransactionStatus)
+
+
+@pytest.fixture
+def client():
+    return AsyncEasySwitch.from_dict({
+        "routing": True,
+        "providers": {
+            "CINETPAY": {
+                "api_key": "test_api_key",
+                "extra": {"site_id": "test_site_id", "secret": "test_secret"},
+                "weight": 3,
+                "circuit_breaker": {}
+            },
+            "FEDAPAY": {"api_secret": "test_secret"}
+        }
+    })
+
+def _transaction(amount = 1000, currency = Currency.XOF, phone = ""):
+    return TransactionDetail(
+        transaction_id = "tx_1",
+        provider = Provider.CINETPAY,
+        amount = amount,
+        currency = currency,
+        customer = CustomerInfo(phone_number = phone)
+    )
+
+def _response(provider):
+    return PaymentResponse(
+        transaction_id = "tx_1",
+        provider = provider,
+        status = TransactionStatus.PENDING,
+        amount = 1000,
+        currency = Currency.XOF
+    )
+
+
+def test_eligibility_uses_currency_and_amount(client):
+    assert client.route(_transaction(currency = Currency.XAF)) == [Provider.CINETPAY]
+    assert client.route(_transaction(amount = 50)) == [Provider.FEDAPAY]
+    assert set(client.route(_transaction())) == {Provider.CINETPAY, Provider.FEDAPAY}
+
+def test_eligibility_uses_phone_country(client):
+    client._get_integrator(Provider.FEDAPAY).SUPPORTED_COUNTRIES = ["BJ"]
+
+    assert client.route(_transaction(phone = "+22507070707")) == [Provider.CINETPAY]
+    assert Router.transaction_country(_transaction(phone = "+22997000000")) == "BJ"
+
+def test_weights_and_health_order_providers(client):
+    first = [client.route(_transaction())[0] for _ in range(400)]
+    assert 0.65 < first.count(Provider.CINETPAY) / 400 < 0.85     # 3 to 1
+
+    for _ in range(20):
+        client.router.record(Provider.CINETPAY, False, 2.0)
+    assert client.router.score(Provider.CINETPAY) < client.router.score(Provider.FEDAPAY)
+
+def test_tripped_provider_comes_last(client):
+    adapter = client._get_integrator(Provider.CINETPAY)
+    breaker = adapter.get_client().circuit_breakers.for_endpoint("/v2/payment")
+    for _ in range(breaker.minimum_calls):
+        breaker.record(False, 0.1)
+
+    assert [client.route(_transaction())[0] for _ in range(20)] == [Provider.FEDAPAY] * 20
+
+@pytest.mark.asyncio
+async def test_fails_over_when_provider_is_tripped(client):
+    cinetpay = client._get_integrator(Provider.CINETPAY)
+    fedapay = client._get_integrator(Provider.FEDAPAY)
+    cinetpay.send_payment = AsyncMock(side_effect = CircuitOpenError("open"))
+    fedapay.send_payment = AsyncMock(return_value = _response(Provider.FEDAPAY))
+    client.router.weights = {Provider.CINETPAY: 1000, Provider.FEDAPAY: 0.001}
+
+    response = await client.send_payment(_transaction(), provider = "auto")
+
+    assert response.provider == Provider.FEDAPAY
+    sent = fedapay.send_payment.await_args.kwargs["transaction"]
+    assert sent.provider == Provider.FEDAPAY
+
+@pytest.mark.asyncio
+async def test_ambiguous_errors_do_not_fail_over(client):
+    cinetpay = client._get_integrator(Provider.CINETPAY)
+    fedapay = client._get_integrator(Provider.FEDAPAY)
+    cinetpay.send_payment = AsyncMock(side_effect = PaymentError("declined"))
+    fedapay.send_payment = AsyncMock(return_value = _response(Provider.FEDAPAY))
+    client.router.weights = {Provider.CINETPAY: 1000, Provider.FEDAPAY: 0.001}
+
+    with pytest.raises(PaymentError):
+        await client.send_payment(_transaction(), provider = "auto")
+    fedapay.send_payment.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_explicit_provider_is_not_routed(client):
+    fedapay = client._get_integrator(Provider.FEDAPAY)
+    fedapay.send_payment = AsyncMock(return_value = _response(Provider.FEDAPAY))
+
+    await client.send_payment(_transaction(), provider = Provider.FEDAPAY)
+    fedapay.send_payment.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_transaction_provider_is_not_routed(client):
+    cinetpay = client._get_integrator(Provider.CINETPAY)
+    fedapay = client._get_integrator(Provider.FEDAPAY)
+    cinetpay.send_payment = AsyncMock(return_value = _response(Provider.CINETPAY))
+    fedapay.send_payment = AsyncMock(return_value = _response(Provider.FEDAPAY))
+    client.router.weights = {Provider.CINETPAY: 0.001, Provider.FEDAPAY: 1000}
+
+    for _ in range(5):
+        response = await client.send_payment(_transaction())
+        assert response.provider == Provider.CINETPAY
+    fedapay.send_payment.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_auto_requires_routing():
+    client = AsyncEasySwitch.from_dict({
+        "providers": {"FEDAPAY": {"api_secret": "test_secret"}}
+    })
+
+    with pytest.raises(ConfigurationError):
+        await client.send_payment(_transaction(), provider = "auto")
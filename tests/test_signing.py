@@ -0,0 +1,178 @@
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+
+from easyswitch import AsyncEasySwitch
+from easyswitch.exceptions import WebhookValidationError
+from easyswitch.types import Provider
+from easyswitch.utils.signing import ReplayGuard, SignatureVerifier
+
+
+def _hmac(secret, message, digestmod = hashlib.sha256):
+    return hmac.new(secret.encode(), message, digestmod).hexdigest()
+
+
+def test_verifier_matches_hmac():
+    verifier = SignatureVerifier(["secret"])
+
+    assert verifier.sign("12.", b"body") == _hmac("secret", b"12.body")
+    assert verifier.verify(_hmac("secret", b"12.body"), "12.", b"body")
+    assert not verifier.verify(_hmac("secret", b"12.other"), "12.", b"body")
+    # The keyed state is copied, never consumed
+    assert verifier.verify(_hmac("secret", b"12.body"), b"12.body")
+
+def test_verifier_accepts_every_active_secret():
+    verifier = SignatureVerifier(["new", "old", "", None, "new"], hashlib.sha512)
+
+    assert len(verifier) == 2
+    assert verifier.verify(_hmac("new", b"body", hashlib.sha512), b"body")
+    assert verifier.verify(_hmac("old", b"body", hashlib.sha512), b"body")
+    assert not verifier.verify(_hmac("other", b"body", hashlib.sha512), b"body")
+    assert verifier.sign(b"body") == _hmac("new", b"body", hashlib.sha512)
+
+def test_verifier_without_secret_rejects_everything():
+    verifier = SignatureVerifier([None, ""])
+
+    assert verifier.sign(b"body") is None
+    assert not verifier.verify(_hmac("", b"body"), b"body")
+    assert not verifier.verify(None, b"body")
+
+@pytest.mark.asyncio
+async def test_previous_secrets_are_accepted_while_rotating():
+    client = AsyncEasySwitch.from_dict({
+        "providers": {
+            "FEDAPAY": {
+                "api_secret": "test_secret",
+                "previous_webhook_secrets": ["whsec_old"],
+                "extra": {"webhook_secret": "whsec_new"}
+            }
+        }
+    })
+
+    def headers(secret):
+        return {"x-fedapay-signature": f"t=1,s={_hmac(secret, b'1.{}')}"}
+
+    assert await client.validate_webhooks(
+        [(b"{}", headers("whsec_new")), (b"{}", headers("whsec_old")),
+         (b"{}", headers("whsec_other"))],
+        Provider.FEDAPAY
+    ) == [True, True, False]
+
+def _signature(index):
+    return hashlib.sha256(str(index).encode()).hexdigest()
+
+def test_replay_guard_refuses_stale_timestamps():
+    guard = ReplayGuard(tolerance = 300, clock = lambda: 10_000)
+
+    guard.check_timestamp(10_000 - 300)
+    guard.check_timestamp(10_000 + 300)
+    for timestamp in (10_000 - 301, 10_000 + 301):
+        with pytest.raises(WebhookValidationError) as error:
+            guard.check_timestamp(timestamp)
+        assert error.value.code == "stale_webhook"
+    assert guard.stats.stale == 2
+
+def test_replay_guard_refuses_seen_signatures():
+    guard = ReplayGuard(tolerance = 300, clock = lambda: 10_000)
+
+    guard.record(10_000, _signature(1))
+    guard.record(10_000, _signature(2))
+    with pytest.raises(WebhookValidationError) as error:
+        guard.record(10_000, _signature(1))
+    assert error.value.code == "replayed_webhook"
+    assert (guard.stats.accepted, guard.stats.replayed) == (2, 1)
+
+def test_replay_guard_memory_is_bounded_by_the_window():
+    now = [0]
+    guard = ReplayGuard(tolerance = 120, bucket = 60, clock = lambda: now[0])
+
+    for second in range(3600):
+        now[0] = second
+        guard.check_timestamp(second)
+        guard.record(second, _signature(second))
+
+    # Only the buckets of the window are kept
+    assert len(guard) <= 60 * len(guard._ring)
+    with pytest.raises(WebhookValidationError):
+        guard.record(3599, _signature(3599))
+    with pytest.raises(WebhookValidationError) as error:
+        guard.record(0, _signature(0))
+    assert error.value.code == "stale_webhook"
+
+@pytest.mark.asyncio
+async def test_fedapay_webhooks_are_replay_protected():
+    client = AsyncEasySwitch.from_dict({
+        "providers": {
+            "FEDAPAY": {
+                "api_secret": "test_secret",
+                "webhook_tolerance": 300,
+                "extra": {"webhook_secret": "whsec"}
+            }
+        }
+    })
+    body = (
+        b'{"name": "transaction.approved", "entity": {"id": 1, "amount": 100,'
+        b' "status": "approved", "currency_id": 1, "created_at": "2024-05-01T10:00:00Z"}}'
+    )
+
+    def headers(timestamp):
+        message = f"{timestamp}.".encode() + body
+        return {"x-fedapay-signature": f"t={timestamp},s={_hmac('whsec', message)}"}
+
+    now = int(time.time())
+    fresh = headers(now)
+    event = await client.handle_webhook(body, fresh, Provider.FEDAPAY)
+    assert event.transaction_id == "1"
+
+    for replayed, code in ((fresh, "replayed_webhook"), (headers(now - 3600), "stale_webhook")):
+        with pytest.raises(WebhookValidationError) as error:
+            await client.handle_webhook(body, replayed, Provider.FEDAPAY)
+        assert error.value.code == code
+
+@pytest.mark.asyncio
+async def test_validating_a_webhook_does_not_consume_it():
+    client = AsyncEasySwitch.from_dict({
+        "providers": {
+            "FEDAPAY": {
+                "api_secret": "test_secret",
+                "webhook_tolerance": 300,
+                "extra": {"webhook_secret": "whsec"}
+            }
+        }
+    })
+    payload = {
+        "name": "transaction.approved",
+        "entity": {
+            "id": 1, "amount": 100, "status": "approved",
+            "currency_id": 1, "created_at": "2024-05-01T10:00:00Z"
+        }
+    }
+    body = json.dumps(payload, separators = (',', ':'), ensure_ascii = False).encode()
+    now = int(time.time())
+    headers = {
+        "X-Fedapay-Signature": f"t={now},s={_hmac('whsec', f'{now}.'.encode() + body)}"
+    }
+
+    # Checking then parsing
+    assert await client.validate_webhook(payload, headers, Provider.FEDAPAY)
+    assert await client.validate_webhook(payload, headers, Provider.FEDAPAY)
+    event = await client.parse_webhook(payload, headers, Provider.FEDAPAY)
+    assert event.transaction_id == "1"
+    with pytest.raises(WebhookValidationError) as error:
+        await client.parse_webhook(payload, headers, Provider.FEDAPAY)
+    assert error.value.code == "replayed_webhook"
+
+    # Checking a batch then handling each webhook
+    later = now + 1
+    headers = {
+        "X-Fedapay-Signature": f"t={later},s={_hmac('whsec', f'{later}.'.encode() + body)}"
+    }
+    assert await client.validate_webhooks([(body, headers)], Provider.FEDAPAY) == [True]
+    event = await client.handle_webhook(body, headers, Provider.FEDAPAY)
+    assert event.transaction_id == "1"
+    with pytest.raises(WebhookValidationError) as error:
+        await client.handle_webhook(body, headers, Provider.FEDAPAY)
+    assert error.value.code == "replayed_webhook"
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from easyswitch import AsyncEasySwitch
+from easyswitch.types import Provider
+from easyswitch.utils.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_request():
+    group = SingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    results = await asyncio.gather(*(group.do("tx_1", call) for _ in range(10)))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert group.stats.shared == 9
+    assert len(group) == 0          # Nothing kept once landed
+
+@pytest.mark.asyncio
+async def test_errors_are_shared():
+    group = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        group.do("tx_1", call), group.do("tx_1", call), return_exceptions = True
+    )
+    assert [type(r) for r in results] == [ValueError, ValueError]
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    group = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    first = asyncio.ensure_future(group.do("tx_1", call))
+    second = asyncio.ensure_future(group.do("tx_1", call))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "ok"
+
+@pytest.mark.asyncio
+async def test_client_status_checks_are_coalesced():
+    client = AsyncEasySwitch.from_dict({
+        "providers": {
+            "CINETPAY": {
+                "api_key": "test_api_key",
+                "extra": {"site_id": "test_site_id", "secret": "test_secret"}
+            }
+        }
+    })
+    adapter = client._get_integrator(Provider.CINETPAY)
+    calls = []
+
+    async def check_status(transaction_id):
+        calls.append(transaction_id)
+        await asyncio.sleep(0.01)
+        return transaction_id
+
+    adapter.check_status = check_status
+
+    await asyncio.gather(
+        *(client.check_status(tx) for tx in ["tx_1"] * 5 + ["tx_2"] * 5)
+    )
+    assert sorted(calls) == ["tx_1", "tx_2"]
@@ -0,0 +1,215 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from easyswitch.conf import ProviderConfig
+from easyswitch.integrators.bizao import BizaoAdapter
+from easyswitch.utils.tokens import (AccessToken, JSONFileTokenStore,
+                                     SQLiteTokenStore, TokenManager)
+
+
+def counting_fetch(lifetime = 3600, delay = 0):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return AccessToken.from_lifetime(f"token-{len(calls)}", lifetime)
+
+    return fetch, calls
+
+
+@pytest.mark.asyncio
+async def test_token_is_cached():
+    fetch, calls = counting_fetch()
+    manager = TokenManager(fetch)
+
+    assert await manager.get_token() == "token-1"
+    assert await manager.get_token() == "token-1"
+    assert len(calls) == 1
+    manager.close()
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_are_coalesced():
+    fetch, calls = counting_fetch(delay = 0.01)
+    manager = TokenManager(fetch)
+
+    tokens = await asyncio.gather(*(manager.get_token() for _ in range(10)))
+
+    assert set(tokens) == {"token-1"}
+    assert len(calls) == 1
+    manager.close()
+
+@pytest.mark.asyncio
+async def test_expiring_token_is_refreshed_in_background():
+    fetch, calls = counting_fetch(delay = 0.01)
+    manager = TokenManager(fetch, refresh_margin = 60)
+    manager.token = AccessToken.from_lifetime("old", 30)     # In the refresh window
+
+    assert await manager.get_token() == "old"       # Not waiting for the refresh
+    await asyncio.sleep(0.05)
+    assert manager.token.value == "token-1"
+    manager.close()
+
+@pytest.mark.asyncio
+async def test_refresh_is_scheduled_before_expiry():
+    fetch, calls = counting_fetch(lifetime = 0.15)
+    manager = TokenManager(fetch, refresh_margin = 0.05)
+    manager.MIN_REFRESH_DELAY = 0.01
+
+    await manager.get_token()
+    await asyncio.sleep(0.15)
+
+    assert len(calls) >= 2
+    manager.close()
+
+@pytest.mark.asyncio
+async def test_short_lived_tokens_are_not_refreshed_in_a_loop():
+    # Airtel-like: tokens living less than the refresh margin
+    fetch, calls = counting_fetch(lifetime = 180)
+    manager = TokenManager(fetch, refresh_margin = 300)
+
+    for _ in range(100):
+        assert await manager.get_token() == "token-1"
+    await asyncio.sleep(0.2)
+
+    assert len(calls) == 1
+    assert manager.margin == pytest.approx(90, abs = 1)
+    manager.close()
+
+@pytest.mark.asyncio
+async def test_refreshes_are_spaced_by_the_minimum_delay():
+    fetch, calls = counting_fetch(lifetime = 0.001)
+    manager = TokenManager(fetch, refresh_margin = 300)
+
+    await manager.get_token()
+    manager.refresh_in_background()
+    await asyncio.sleep(0.2)
+
+    # Nothing but the first fetch within MIN_REFRESH_DELAY
+    assert len(calls) == 1
+    manager.close()
+
+@pytest.mark.asyncio
+async def test_call_retries_once_on_401():
+    fetch, calls = counting_fetch()
+    manager = TokenManager(fetch)
+    seen = []
+
+    async def request(token):
+        seen.append(token)
+        return SimpleNamespace(status = 401 if token == "token-1" else 200)
+
+    response = await manager.call(request)
+
+    assert response.status == 200
+    assert seen == ["token-1", "token-2"]
+    manager.close()
+
+
+@pytest.fixture
+def bizao_adapter():
+    extra = {
+        key: "value" for key in (
+            "dev_client_id", "dev_client_secret", "dev_token_url",
+            "prod_client_id", "prod_client_secret", "prod_token_url",
+            "country-code", "mno-name", "channel", "lang", "cancel_url"
+        )
+    }
+    return BizaoAdapter(
+        ProviderConfig(api_key = "test_api_key", extra = extra),
+        context = {}
+    )
+
+@pytest.mark.asyncio
+async def test_bizao_uses_token_manager(bizao_adapter):
+    bizao_adapter.fetch_token = AsyncMock(
+        return_value = AccessToken.from_lifetime("access", 3600)
+    )
+    client = MagicMock()
+    client.get = AsyncMock(
+        return_value = SimpleNamespace(status = 200, data = {"status": "SUCCESSFUL"})
+    )
+    bizao_adapter.client = client
+
+    await bizao_adapter.check_status("tx_1")
+    await bizao_adapter.check_status("tx_2")
+
+    bizao_adapter.fetch_token.assert_awaited_once()
+    headers = client.get.await_args.kwargs["headers"]
+    assert headers["Authorization"] == "Bearer access"
+
+
+@pytest.fixture(params = ["json", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "json":
+        return JSONFileTokenStore(tmp_path / "tokens.json")
+    return SQLiteTokenStore(tmp_path / "tokens.db")
+
+def test_store_roundtrip(store):
+    token = AccessToken.from_lifetime("abc", 3600)
+
+    assert store.load("key") is None
+    store.save("key", token)
+    assert store.load("key") == token
+    store.delete("key")
+    assert store.load("key") is None
+
+@pytest.mark.asyncio
+async def test_managers_share_stored_token(store):
+    fetch, calls = counting_fetch(delay = 0.01)
+    first = TokenManager(fetch, store = store, key = "creds")
+    second = TokenManager(fetch, store = store, key = "creds")
+
+    assert await first.get_token() == await second.get_token() == "token-1"
+    assert len(calls) == 1
+    first.close()
+    second.close()
+
+@pytest.mark.asyncio
+async def test_rejected_token_is_not_reloaded(store):
+    fetch, calls = counting_fetch()
+    store.save("creds", AccessToken.from_lifetime("revoked", 3600))
+    manager = TokenManager(fetch, store = store, key = "creds")
+
+    async def request(token):
+        return SimpleNamespace(status = 401 if token == "revoked" else 200)
+
+    assert (await manager.call(request)).status == 200
+    assert store.load("creds").value == "token-1"
+    manager.close()
+
+
+def _worker(path, counter):
+    async def fetch():
+        with open(counter, "a") as f:
+            f.write("x")
+        await asyncio.sleep(0.2)
+        return AccessToken.from_lifetime("shared", 3600)
+
+    async def main():
+        manager = TokenManager(fetch, store = JSONFileTokenStore(path), key = "creds")
+        token = await manager.get_token()
+        manager.close()
+        return token
+
+    assert asyncio.run(main()) == "shared"
+
+def test_processes_fetch_one_token(tmp_path):
+    multiprocessing = pytest.importorskip("multiprocessing")
+    pytest.importorskip("fcntl")
+    ctx = multiprocessing.get_context("spawn")
+    counter = tmp_path / "fetches"
+    workers = [
+        ctx.Process(target = _worker, args = (tmp_path / "tokens.json", counter))
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(10)
+
+    assert [w.exitcode for w in workers] == [0] * 4
+    assert counter.read_text() == "x"
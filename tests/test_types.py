@@ -0,0 +1,61 @@
+import pickle
+import sys
+from dataclasses import asdict, replace
+
+import pytest
+
+from easyswitch.types import (Currency, CustomerInfo, PaymentResponse,
+                              Provider, TransactionStatus, WebhookEvent)
+
+
+slots = pytest.mark.skipif(sys.version_info < (3, 10), reason = "slots need 3.10+")
+
+
+def _response(**kwargs):
+    return PaymentResponse(
+        transaction_id = "tx_1", provider = Provider.FEDAPAY,
+        status = TransactionStatus.PENDING, amount = 1000.0,
+        currency = Currency.XOF, **kwargs
+    )
+
+
+@slots
+def test_models_have_no_instance_dict():
+    response = _response()
+
+    assert not hasattr(response, "__dict__")
+    with pytest.raises(AttributeError):
+        response.unknown = 1
+
+def test_dict_fields_are_independent():
+    first, second = _response(), _response()
+
+    first.metadata["key"] = "value"
+    first.raw_response.update(id = 1)
+
+    assert second.metadata == {} and second.raw_response == {}
+    assert first.metadata == {"key": "value"}
+    assert first != second
+
+def test_models_behave_as_dataclasses():
+    customer = CustomerInfo(phone_number = "+22890000000", metadata = {"a": 1})
+    response = _response(customer = customer)
+
+    assert asdict(response)["metadata"] == {}
+    assert asdict(response)["customer"]["metadata"] == {"a": 1}
+    assert replace(response, amount = 5.0).amount == 5.0
+    assert response == _response(customer = customer)
+    assert "metadata={}" in repr(response)
+
+def test_models_survive_pickling():
+    event = WebhookEvent(
+        event_type = "transaction.approved", provider = Provider.FEDAPAY,
+        transaction_id = "tx_1", status = TransactionStatus.SUCCESSFUL,
+        amount = 1000.0, currency = Currency.XOF, raw_data = {"id": 1}
+    )
+
+    copy = pickle.loads(pickle.dumps(event))
+
+    assert copy == event
+    copy.context["attempt"] = 2
+    assert event.context == {}
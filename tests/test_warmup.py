@@ -0,0 +1,154 @@
+import asyncio
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from easyswitch import AsyncEasySwitch, EasySwitch
+from easyswitch.exceptions import InvalidProviderError
+from easyswitch.types import Provider
+from easyswitch.utils.http import ConnectionPoolManager, HTTPClient
+from easyswitch.utils.ratelimit import TokenBucket
+from easyswitch.utils.tokens import AccessToken
+
+
+CONFIG = {
+    "providers": {
+        "CINETPAY": {
+            "api_key": "test_api_key",
+            "extra": {"site_id": "test_site_id", "secret": "test_secret"}
+        },
+        "FEDAPAY": {"api_secret": "test_secret"}
+    }
+}
+
+
+def test_construction_builds_no_adapter():
+    client = AsyncEasySwitch.from_dict(CONFIG)
+    assert client._integrators == {}
+    assert client.circuit_states() == {Provider.CINETPAY: {}, Provider.FEDAPAY: {}}
+
+def test_adapter_built_once_on_first_use():
+    client = AsyncEasySwitch.from_dict(CONFIG)
+    adapter = client._get_integrator(Provider.FEDAPAY)
+    assert list(client._integrators) == [Provider.FEDAPAY]
+    assert client._get_integrator("FEDAPAY") is adapter
+
+def test_unknown_provider_is_rejected_without_building():
+    client = AsyncEasySwitch.from_dict(CONFIG)
+    with pytest.raises(InvalidProviderError):
+        client._get_integrator(Provider.SEMOA)
+    assert client._integrators == {}
+
+def test_warmup_builds_adapters(monkeypatch):
+    async def no_dns(self):
+        return []
+    monkeypatch.setattr("easyswitch.utils.http.HTTPClient.resolve", no_dns)
+    client = EasySwitch.from_dict(CONFIG)
+    reports = client.warmup([Provider.CINETPAY])
+    assert list(reports) == [Provider.CINETPAY]
+    assert reports[Provider.CINETPAY].connections == 0
+    assert list(client._integrators) == [Provider.CINETPAY]
+    client.warmup()
+    assert set(client._integrators) == {Provider.CINETPAY, Provider.FEDAPAY}
+    client.close()
+
+
+@pytest_asyncio.fixture
+async def server():
+    """Local server recording the connections it receives."""
+    peers = set()
+
+    async def handler(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        await asyncio.sleep(0.05)
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", peers
+    await runner.cleanup()
+
+def _point_to(adapter, url, pool_manager):
+    adapter.client.base_url = url
+    adapter.client.pool_manager = pool_manager
+
+@pytest.mark.asyncio
+async def test_warmup_opens_keepalive_connections(server):
+    url, peers = server
+    pool_manager = ConnectionPoolManager()
+    client = AsyncEasySwitch.from_dict(CONFIG)
+    _point_to(client._get_integrator(Provider.CINETPAY), url, pool_manager)
+
+    reports = await client.warmup([Provider.CINETPAY], connections = 3)
+    report = reports[Provider.CINETPAY]
+
+    assert report.ok and report.connections == 3 and len(peers) == 3
+    assert report.dns > 0 and report.connect > 0 and report.token is None
+    await client.aclose()
+    await pool_manager.close()
+
+@pytest.mark.asyncio
+async def test_warmup_fetches_tokens_and_reports_failures(server):
+    url, _ = server
+    pool_manager = ConnectionPoolManager()
+    client = AsyncEasySwitch.from_dict(CONFIG)
+    cinetpay = client._get_integrator(Provider.CINETPAY)
+    fetches = []
+
+    async def fetch_token(self):
+        fetches.append(1)
+        return AccessToken.from_lifetime("token", 3600)
+
+    token_adapter = type("TokenAdapter", (type(cinetpay),), {"fetch_token": fetch_token})
+    client._integrators[Provider.CINETPAY] = token_adapter(cinetpay.config)
+    _point_to(client._get_integrator(Provider.CINETPAY), url, pool_manager)
+    _point_to(client._get_integrator(Provider.FEDAPAY), "http://127.0.0.1:1", pool_manager)
+
+    reports = await client.warmup(connections = 1)
+
+    assert reports[Provider.CINETPAY].ok and reports[Provider.CINETPAY].token is not None
+    assert fetches == [1]
+    assert await client._get_integrator(Provider.CINETPAY).get_token_manager().get_token() == "token"
+    assert "connect" in reports[Provider.FEDAPAY].errors
+    assert reports[Provider.FEDAPAY].connections == 0
+    await client.aclose()
+    await pool_manager.close()
+
+@pytest.mark.asyncio
+async def test_resolution_fills_the_connector_dns_cache():
+    client = HTTPClient("http://localhost:8080", pool_manager = ConnectionPoolManager())
+
+    addresses = await client.resolve()
+
+    assert addresses
+    assert ("localhost", 8080) in client.connector._cached_hosts
+    await client.close_session()
+    await client.pool_manager.close()
+
+@pytest.mark.asyncio
+async def test_resolution_is_skipped_without_the_connector_resolver(monkeypatch, caplog):
+    monkeypatch.delattr(aiohttp.TCPConnector, "_resolve_host")
+    client = HTTPClient("http://localhost:8080", pool_manager = ConnectionPoolManager())
+
+    assert await client.resolve() == []
+    assert "skipping DNS warmup" in caplog.text
+    await client.close_session()
+    await client.pool_manager.close()
+
+@pytest.mark.asyncio
+async def test_opened_connections_are_rate_limited(server):
+    url, peers = server
+    bucket = TokenBucket(rate = 1000, burst = 1)
+    client = HTTPClient(url, pool_manager = ConnectionPoolManager(), rate_limiter = bucket)
+
+    assert await client.open_connections(3) == 3
+    assert bucket.stats.requests == 3 and bucket.stats.throttled == 2
+    await client.close_session()
+    await client.pool_manager.close()
@@ -0,0 +1,255 @@
+import asyncio
+import hashlib
+import hmac
+import json
+
+import pytest
+
+from easyswitch import AsyncEasySwitch
+from easyswitch.webhooks import WebhookApp, WebhookSpool
+
+
+SECRET = "whsec_test"
+
+
+@pytest.fixture
+def client():
+    return AsyncEasySwitch.from_dict({
+        "providers": {
+            "FEDAPAY": {
+                "api_secret": "test_secret",
+                "extra": {"webhook_secret": SECRET}
+            }
+        }
+    })
+
+def _webhook(transaction_id = 1, secret = SECRET):
+    body = json.dumps({
+        "name": "transaction.approved",
+        "entity": {
+            "id": transaction_id, "amount": 100, "status": "approved",
+            "currency_id": 1, "created_at": "2024-05-01T10:00:00Z"
+        }
+    }).encode()
+    signature = hmac.new(
+        secret.encode(), b"1700000000." + body, hashlib.sha256
+    ).hexdigest()
+    return body, [(b"x-fedapay-signature", f"t=1700000000,s={signature}".encode())]
+
+async def _call(app, path, body = b"", headers = (), method = "POST"):
+    """Run one request through the ASGI app."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app({
+        "type": "http", "method": method, "path": path, "headers": list(headers)
+    }, receive, send)
+    return sent[0]["status"], dict(sent[0]["headers"])
+
+
+@pytest.mark.asyncio
+async def test_events_are_acknowledged_then_dispatched(client):
+    events = []
+    app = WebhookApp(client, callbacks = [events.append])
+
+    status, _ = await _call(app, "/webhooks/fedapay", *_webhook(7))
+    await app.stop()
+
+    assert status == 200
+    assert [event.transaction_id for event in events] == ["7"]
+    assert app.stats.accepted == app.stats.processed == 1
+
+@pytest.mark.asyncio
+async def test_invalid_requests_are_rejected(client):
+    app = WebhookApp(client)
+    body, headers = _webhook()
+
+    assert (await _call(app, "/webhooks/fedapay", *_webhook(secret = "other")))[0] == 401
+    assert (await _call(app, "/webhooks/cinetpay", body, headers))[0] == 404
+    assert (await _call(app, "/other/fedapay", body, headers))[0] == 404
+    assert (await _call(app, "/webhooks/fedapay", method = "GET"))[0] == 405
+    small = WebhookApp(client, max_body_size = 10)
+    assert (await _call(small, "/webhooks/fedapay", body, headers))[0] == 413
+    await app.stop()
+    await small.stop()
+
+@pytest.mark.asyncio
+async def test_full_queue_pushes_back(client):
+    release = asyncio.Event()
+
+    async def slow(event):
+        await release.wait()
+
+    app = WebhookApp(
+        client, callbacks = [slow], queue_size = 1, workers = 1,
+        enqueue_timeout = 0.01, retry_after = 7
+    )
+    statuses = [
+        (await _call(app, "/webhooks/fedapay", *_webhook(i)))
+        for i in range(3)
+    ]
+
+    # One event in the worker, one in the queue, the third is refused
+    assert [status for status, _ in statuses] == [200, 200, 503]
+    assert statuses[2][1][b"retry-after"] == b"7"
+    release.set()
+    await app.stop()
+    assert app.stats.processed == 2 and app.stats.throttled == 1
+
+@pytest.mark.asyncio
+async def test_lifespan_starts_and_drains(client):
+    events = []
+    app = WebhookApp(client, callbacks = [events.append])
+    messages = asyncio.Queue()
+    for message in ("lifespan.startup", "lifespan.shutdown"):
+        messages.put_nowait({"type": message})
+    sent = []
+
+    async def send(message):
+        sent.append(message["type"])
+        if message["type"] == "lifespan.startup.complete":
+            await _call(app, "/webhooks/fedapay", *_webhook())
+
+    await app({"type": "lifespan"}, messages.get, send)
+
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert len(events) == 1
+
+
+@pytest.mark.asyncio
+async def test_spooled_events_survive_a_restart(client, tmp_path):
+    spool = WebhookSpool(tmp_path / "spool.sqlite3")
+    release = asyncio.Event()
+    seen = []
+
+    async def stuck(event):
+        seen.append(event.transaction_id)
+        await release.wait()
+
+    app = WebhookApp(client, callbacks = [stuck], spool = spool, workers = 1)
+    for i in range(3):
+        assert (await _call(app, "/webhooks/fedapay", *_webhook(i)))[0] == 200
+    await asyncio.sleep(0.05)
+    # The process "crashes" while the first event is being processed
+    for task in app._tasks:
+        task.cancel()
+    assert spool.lag("webhook-app") == 3
+
+    events = []
+    restarted = WebhookApp(client, callbacks = [events.append], spool = spool)
+    await restarted.start()
+    await restarted.stop()
+    assert sorted(e.transaction_id for e in events) == ["0", "1", "2"]
+    assert spool.lag("webhook-app") == 0
+
+@pytest.mark.asyncio
+async def test_failed_spooled_events_are_retried_then_dead_lettered(client, tmp_path):
+    spool = WebhookSpool(tmp_path / "spool.sqlite3")
+    attempts = {}
+
+    def flaky(event):
+        attempts[event.transaction_id] = attempts.get(event.transaction_id, 0) + 1
+        # "1" succeeds on its second delivery, "2" never does
+        if event.transaction_id == "2" or (
+            event.transaction_id == "1" and attempts["1"] == 1
+        ):
+            raise RuntimeError("handler down")
+
+    app = WebhookApp(
+        client, callbacks = [flaky], spool = spool, retry_delay = 0.01
+    )
+    for i in range(3):
+        assert (await _call(app, "/webhooks/fedapay", *_webhook(i)))[0] == 200
+    await app.stop()
+
+    assert attempts == {"0": 1, "1": 2, "2": 3}
+    assert app.stats.dead_lettered == 1
+    assert [e.transaction_id for _, e in spool.dead_letters("webhook-app")] == ["2"]
+    assert spool.lag("webhook-app") == 0
+
+    offset, _ = spool.dead_letters("webhook-app")[0]
+    spool.discard_dead_letter("webhook-app", offset)
+    assert spool.dead_letters("webhook-app") == []
+
+@pytest.mark.asyncio
+async def test_concurrent_starts_keep_the_spool_backlog(client, tmp_path):
+    spool = WebhookSpool(tmp_path / "spool.sqlite3")
+    events = []
+    app = WebhookApp(client, callbacks = [events.append], spool = spool)
+
+    statuses = await asyncio.gather(*(
+        _call(app, "/webhooks/fedapay", *_webhook(i)) for i in range(5)
+    ))
+    await app.stop()
+
+    assert [status for status, _ in statuses] == [200] * 5
+    assert len(app._tasks) == 0 and len(events) == 5
+    assert app._backlog == 0
+
+def test_spool_offsets_and_replay(tmp_path):
+    spool = WebhookSpool(tmp_path / "spool.sqlite3", retention = 3600)
+
+    async def append():
+        return await asyncio.gather(*(spool.append(i) for i in range(5)))
+
+    assert asyncio.run(append()) == [1, 2, 3, 4, 5]
+    assert spool.stats.flushes == 1       # Group-committed
+    assert [event for _, event in spool.read("a", 2)] == [0, 1]
+    spool.commit("a", 2)
+    assert [offset for offset, _ in spool.read("a")] == [3, 4, 5]
+    spool.replay("a", 1)
+    assert spool.lag("a") == 5
+    spool.close()
+
+@pytest.mark.asyncio
+async def test_paystack_webhooks_are_served():
+    client = AsyncEasySwitch.from_dict({
+        "providers": {"PAYSTACK": {"api_key": "sk_test"}}
+    })
+    events = []
+    app = WebhookApp(client, callbacks = [events.append])
+    body = json.dumps({
+        "event": "charge.success",
+        "data": {"reference": "ref_1", "status": "success", "amount": 50000}
+    }).encode()
+    signature = hmac.new(b"sk_test", body, hashlib.sha512).hexdigest()
+
+    status, _ = await _call(
+        app, "/webhooks/paystack", body, [(b"x-paystack-signature", signature.encode())]
+    )
+    await app.stop()
+
+    assert status == 200
+    assert [event.transaction_id for event in events] == ["ref_1"]
+
+def test_spool_keeps_events_for_registered_consumers(tmp_path):
+    spool = WebhookSpool(tmp_path / "spool.sqlite3", retention = 0)
+    spool.register("late")
+
+    async def append():
+        return await asyncio.gather(*(spool.append(i) for i in range(3)))
+
+    asyncio.run(append())
+    spool.commit("a", 3)
+
+    # "a" is done, but "late" has not read anything yet
+    assert [event for _, event in spool.read("late")] == [0, 1, 2]
+    spool.unregister("late")
+    spool.commit("a", 3)
+    assert spool.read("late") == []
+    spool.close()
+
+def test_spool_retains_consumed_events_by_default(tmp_path):
+    spool = WebhookSpool(tmp_path / "spool.sqlite3")
+
+    asyncio.run(spool.append("event"))
+    spool.commit("a", 1)
+    spool.replay("a")
+
+    assert [event for _, event in spool.read("a")] == ["event"]
+    spool.close()
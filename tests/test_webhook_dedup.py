@@ -0,0 +1,119 @@
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+
+from easyswitch import AsyncEasySwitch
+from easyswitch.exceptions import DuplicateWebhookError
+from easyswitch.types import Currency, Provider, TransactionStatus, WebhookEvent
+from easyswitch.utils.cache import MemoryCache, SQLiteCache
+from easyswitch.webhooks import WebhookApp, WebhookDeduplicator
+
+
+SECRET = "whsec_test"
+
+
+def _event(status = TransactionStatus.SUCCESSFUL):
+    return WebhookEvent(
+        event_type = "transaction.updated",
+        provider = Provider.FEDAPAY,
+        transaction_id = "42",
+        status = status,
+        amount = 100,
+        currency = Currency.XOF
+    )
+
+def _webhook(status = "approved"):
+    body = json.dumps({
+        "name": "transaction.updated",
+        "entity": {
+            "id": 42, "amount": 100, "status": status,
+            "currency_id": 1, "created_at": "2024-05-01T10:00:00Z"
+        }
+    }).encode()
+    signature = hmac.new(
+        SECRET.encode(), b"1700000000." + body, hashlib.sha256
+    ).hexdigest()
+    return body, {"X-Fedapay-Signature": f"t=1700000000,s={signature}"}
+
+@pytest.fixture
+def client():
+    return AsyncEasySwitch.from_dict({
+        "webhook_dedup": {"max_entries": 100},
+        "providers": {
+            "FEDAPAY": {
+                "api_secret": "test_secret",
+                "extra": {"webhook_secret": SECRET}
+            }
+        }
+    })
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_backend_add_is_set_if_absent(backend, tmp_path):
+    store = (
+        MemoryCache() if backend == "memory" else
+        SQLiteCache(tmp_path / "dedup.sqlite3")
+    )
+
+    assert store.add("k", True, 60)
+    assert not store.add("k", True, 60)
+    assert store.add("expiring", True, 0.01)
+    time.sleep(0.02)
+    assert store.add("expiring", True, 60)
+    store.close()
+
+def test_sqlite_backend_is_shared(tmp_path):
+    path = tmp_path / "dedup.sqlite3"
+    first = WebhookDeduplicator(SQLiteCache(path))
+    second = WebhookDeduplicator(SQLiteCache(path))
+
+    assert not first.seen(_event())
+    assert second.seen(_event())
+
+def test_status_change_is_not_a_duplicate():
+    dedup = WebhookDeduplicator()
+
+    assert not dedup.seen(_event(TransactionStatus.PENDING))
+    assert not dedup.seen(_event(TransactionStatus.SUCCESSFUL))
+    assert dedup.seen(_event(TransactionStatus.SUCCESSFUL))
+    dedup.forget(_event(TransactionStatus.SUCCESSFUL))
+    assert not dedup.seen(_event(TransactionStatus.SUCCESSFUL))
+    assert dedup.stats.unique == 3 and dedup.stats.duplicates == 1
+
+@pytest.mark.asyncio
+async def test_client_drops_redelivered_webhooks(client):
+    await client.handle_webhook(*_webhook(), Provider.FEDAPAY)
+
+    with pytest.raises(DuplicateWebhookError) as error:
+        await client.handle_webhook(*_webhook(), Provider.FEDAPAY)
+    assert error.value.event.transaction_id == "42"
+    # A new status of the same transaction goes through
+    await client.handle_webhook(*_webhook("canceled"), Provider.FEDAPAY)
+
+@pytest.mark.asyncio
+async def test_app_acknowledges_duplicates_without_dispatching(client):
+    events = []
+    app = WebhookApp(client, callbacks = [events.append])
+    body, headers = _webhook()
+    statuses = []
+
+    async def receive():
+        return {"type": "http.request", "body": body}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    scope = {
+        "type": "http", "method": "POST", "path": "/webhooks/fedapay",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]
+    }
+    for _ in range(3):
+        await app(scope, receive, send)
+    await app.stop()
+
+    assert statuses == [200, 200, 200]
+    assert len(events) == 1 and app.stats.duplicates == 2
@@ -0,0 +1,124 @@
+import hashlib
+import hmac
+import json
+import threading
+
+import pytest
+
+from easyswitch import AsyncEasySwitch
+from easyswitch.exceptions import WebhookValidationError
+from easyswitch.types import Currency, Provider, TransactionStatus
+
+
+SECRET = "whsec_test"
+
+# Deliberately not in json.dumps' compact form, as providers may send it
+RAW_BODY = (
+    b'{"name": "transaction.approved",\n'
+    b' "entity": {"id": 42, "amount": 1500, "status": "approved",'
+    b' "currency_id": 1, "created_at": "2024-05-01T10:00:00Z", "note": "\\u00e9t\\u00e9"}}'
+)
+
+
+@pytest.fixture
+def client():
+    return AsyncEasySwitch.from_dict({
+        "providers": {
+            "FEDAPAY": {
+                "api_secret": "test_secret",
+                "extra": {"webhook_secret": SECRET}
+            }
+        }
+    })
+
+def _sign(raw_body, timestamp = 1700000000, secret = SECRET):
+    signature = hmac.new(
+        secret.encode(), f"{timestamp}.".encode() + raw_body, hashlib.sha256
+    ).hexdigest()
+    return {"x-fedapay-signature": f"t={timestamp},s={signature}"}
+
+
+@pytest.mark.asyncio
+async def test_signature_is_checked_over_raw_bytes(client):
+    event = await client.handle_webhook(RAW_BODY, _sign(RAW_BODY), Provider.FEDAPAY)
+
+    assert event.transaction_id == "42"
+    assert event.status == TransactionStatus.SUCCESSFUL
+    assert event.currency == Currency.XOF
+    assert event.amount == 1500.0
+
+@pytest.mark.asyncio
+async def test_reserialized_payload_does_not_verify(client):
+    # What validate_webhook signs: the parsed payload dumped back
+    canonical = json.dumps(
+        json.loads(RAW_BODY), separators = (',', ':'), ensure_ascii = False
+    ).encode()
+
+    with pytest.raises(WebhookValidationError):
+        await client.handle_webhook(RAW_BODY, _sign(canonical), Provider.FEDAPAY)
+
+@pytest.mark.asyncio
+async def test_forged_body_is_never_parsed(client, monkeypatch):
+    integrator = client._get_integrator(Provider.FEDAPAY)
+    monkeypatch.setattr(
+        integrator, "decode_webhook",
+        lambda *args: pytest.fail("decoded before verification")
+    )
+
+    with pytest.raises(WebhookValidationError) as error:
+        await client.handle_webhook(
+            RAW_BODY, _sign(RAW_BODY, secret = "other"), Provider.FEDAPAY
+        )
+    assert error.value.code == "invalid_signature"
+
+@pytest.mark.asyncio
+async def test_malformed_body_is_rejected(client):
+    raw_body = b'{"name": '
+
+    with pytest.raises(WebhookValidationError) as error:
+        await client.handle_webhook(raw_body, _sign(raw_body), Provider.FEDAPAY)
+    assert error.value.code == "malformed_body"
+
+@pytest.mark.asyncio
+async def test_batch_validation_keeps_order(client):
+    webhooks = [
+        (RAW_BODY, _sign(RAW_BODY)),
+        (RAW_BODY, _sign(RAW_BODY, secret = "other")),
+        (RAW_BODY, {}),
+        (b'{"name": ', _sign(b'{"name": ')),
+        (RAW_BODY, _sign(RAW_BODY, timestamp = 1700000001))
+    ] * 3
+
+    results = await client.validate_webhooks(webhooks, Provider.FEDAPAY, chunk_size = 2)
+
+    assert results == [True, False, False, True, True] * 3
+
+@pytest.mark.asyncio
+async def test_batch_validation_of_nothing(client):
+    assert await client.validate_webhooks([], Provider.FEDAPAY) == []
+
+@pytest.mark.asyncio
+async def test_missing_signature_header_is_a_validation_error(client):
+    with pytest.raises(WebhookValidationError) as error:
+        await client.handle_webhook(RAW_BODY, {}, Provider.FEDAPAY)
+    assert error.value.code == "invalid_signature"
+
+@pytest.mark.asyncio
+async def test_async_verifiers_run_off_the_event_loop(client, monkeypatch):
+    integrator = client._get_integrator(Provider.FEDAPAY)
+    threads = []
+
+    async def verify_webhook(raw_body, headers):
+        threads.append(threading.get_ident())
+        if raw_body == b"boom":
+            raise ValueError("boom")
+        return raw_body == b"ok"
+
+    monkeypatch.setattr(integrator, "verify_webhook", verify_webhook)
+
+    results = await client.validate_webhooks(
+        [(b"ok", {}), (b"ko", {}), (b"boom", {})], Provider.FEDAPAY
+    )
+
+    assert results == [True, False, False]
+    assert threading.get_ident() not in threads